@@ -0,0 +1,903 @@
+# admin_page.py
+"""Admin page: user management, system metrics and maintenance."""
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from metrics import get_dashboard_metrics, get_user_metrics
+from page_helpers import hash_password, init_db, query_db
+from task_operations import delete_project
+from user_directory import get_user_directory
+
+
+def show_admin_page():
+    """Render the Admin page"""
+    st.markdown("---")
+
+
+    # Header Section with Gradient
+    st.markdown("""
+        <div class="doc-header">
+            <h1 style="color: white; margin-bottom: 0.5rem;">👤 Admin Dashboard</h1>
+            <p style="font-size: 1.1rem; opacity: 0.9;"></p>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+    # Initialize the database to ensure schema is up-to-date
+    init_db()
+
+    # ======= Quick Overview Section =======
+    st.markdown("---")
+    st.subheader("📊 User Overview")
+
+
+    # Calculate metrics
+    total_users, active_users, admins = get_user_metrics()
+    inactive_users = total_users - active_users
+
+    # Create metric cards with the same style as Dashboard
+    metric_cards = [
+        {"title": "Total Users", "value": total_users, "color": "#4E8BF5", "icon": "👥"},
+        {"title": "Active Users", "value": active_users, "color": "#6BB9F0", "icon": "👥"},
+        {"title": "Inactive Users", "value": inactive_users, "color": "#32CD32", "icon": "👥"},
+        {"title": "Admins", "value": admins, "color": "#FF4500", "icon": "👥"}
+    ]
+
+
+    # Display metrics in columns with consistent styling 
+    cols = st.columns(4)
+    for i, card in enumerate(metric_cards):
+        with cols[i]:
+            st.markdown(f"""
+                <div style='
+                    background-color: #FFFFFF;
+                    border-radius: 10px;
+                    padding: 1.2rem;
+                    border-left: 4px solid {card['color']};
+                    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+                    height: 100%;
+                '>
+                    <div style='display: flex; align-items: center; margin-bottom: 8px;'>
+                        <span style='font-size: 1.5rem; margin-right: 8px;'>{card['icon']}</span>
+                        <span style='font-size: 0.9rem; color: #666;'>{card['title']}</span>
+                    </div>
+                    <p style='font-size: 1.8rem; font-weight: 700; color: #2c3e50; margin: 0;'>{card['value']}</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+
+    # ======= User Activity Functions =======
+    def get_activity_status(last_login):
+        if not last_login or last_login == 'Never':
+            return "Inactive"
+        try:
+            last_login_dt = datetime.strptime(last_login, "%Y-%m-%d %H:%M:%S")
+            delta = datetime.now() - last_login_dt
+            if delta.days == 0:
+                if delta.seconds < 300:  # 5 minutes
+                    return "Active now"
+                return "Active today"
+            elif delta.days == 1:
+                return "Yesterday"
+            elif delta.days < 7:
+                return "This week"
+            else:
+                return "Inactive"
+        except:
+            return "Inactive"
+
+    # ======= Fetch User Data =======
+    try:
+        users = query_db("""
+                SELECT id, username, role, email, phone, first_name, last_name, 
+                    company, job_title, department, 
+                    CASE WHEN last_login IS NULL THEN 'Never' ELSE last_login END as last_login, 
+                    COALESCE(login_count, 0) as login_count, 
+                    COALESCE(is_active, 1) as is_active
+                FROM users
+                ORDER BY username
+            """)
+    except sqlite3.OperationalError as e:
+        st.error("Database schema needs update. Attempting to fix...")
+        init_db()
+        users = query_db("""
+                SELECT id, username, role, email, phone, first_name, last_name, 
+                    company, job_title, department, 
+                    CASE WHEN last_login IS NULL THEN 'Never' ELSE last_login END as last_login, 
+                    COALESCE(login_count, 0) as login_count, 
+                    COALESCE(is_active, 1) as is_active
+                FROM users
+                ORDER BY username
+            """)
+
+    if users:
+        # Convert to DataFrame
+        users_df = pd.DataFrame(users, columns=[
+            "ID", "Username", "Role", "Email", "Phone", "First Name", "Last Name",
+            "Company", "Job Title", "Department", "Last Login", "Login Count", "Is Active"
+        ])
+
+        # Add activity status column
+        users_df["Activity"] = users_df["Last Login"].apply(get_activity_status)
+
+
+        # Display user table
+        st.markdown("---")
+        st.subheader("👥 User Activity")
+
+        # Add filters
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            role_filter = st.multiselect(
+                "Filter by Role",
+                options=users_df["Role"].unique(),
+                default=users_df["Role"].unique()
+            )
+        with col2:
+            activity_filter = st.multiselect(
+                "Filter by Activity",
+                options=["Active now", "Active today", "Yesterday", "This week", "Inactive"],
+                default=["Active now", "Active today", "Yesterday", "This week", "Inactive"]
+            )
+        with col3:
+            status_filter = st.multiselect(
+                "Filter by Status",
+                options=["Active", "Inactive"],
+                default=["Active", "Inactive"]
+            )
+
+        # Apply filters
+        filtered_users = users_df[
+            (users_df["Role"].isin(role_filter)) &
+            (users_df["Activity"].isin(activity_filter)) &
+            (users_df["Is Active"].isin([1 if s == "Active" else 0 for s in status_filter]))
+        ]
+
+
+        # When displaying the user table:
+        st.dataframe(
+            users_df,
+            column_config={
+                "Last Login": st.column_config.DatetimeColumn(
+                    "Last Active",
+                    format="YYYY-MM-DD HH:mm",
+                )
+            }
+        )
+
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 20px;'></div>", unsafe_allow_html=True)
+
+
+    # ======= User Management Section ======= 
+    st.subheader("👥 User Management")
+    # st.markdown("---")
+
+    # Add New User Form
+    st.markdown("---")
+    st.subheader("➕ Add New User")
+
+    with st.expander("➕ Add New User", expanded=False):
+        with st.form("add_user_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                new_username = st.text_input("Username*")
+                new_first_name = st.text_input("First Name")
+                new_last_name = st.text_input("Last Name")
+                new_company = st.text_input("Company")
+            with col2:
+                new_role = st.selectbox("Role*", ["User", "Admin"])
+                new_job_title = st.text_input("Job Title")
+                new_department = st.text_input("Department")
+                new_email = st.text_input("Email")
+                new_phone = st.text_input("Phone")
+
+            new_password = st.text_input("Password*", type="password")
+
+            if st.form_submit_button("Add User"):
+                if not new_username or not new_password:
+                    st.error("Username and password are required fields")
+                elif query_db("SELECT * FROM users WHERE username=?", (new_username,), one=True):
+                    st.error("Username already exists.")
+                else:
+                    query_db("""
+                            INSERT INTO users (username, password, role, email, phone, 
+                                            first_name, last_name, company, job_title, department)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """, (
+                        new_username,
+                        hash_password(new_password),
+                        new_role,
+                        new_email,
+                        new_phone,
+                        new_first_name,
+                        new_last_name,
+                        new_company,
+                        new_job_title,
+                        new_department
+                    ))
+                    st.success("User added successfully!")
+                    st.rerun()
+
+
+    # Divider with spacing
+    # st.markdown("---")
+    st.markdown("<div style='margin-bottom: 20px;'></div>", unsafe_allow_html=True)  
+
+
+    # ======= Filtered User Table =======
+    st.markdown("---")
+    st.subheader("👥Edit User")
+
+    # Fetch all users
+    users = query_db("SELECT id, username, role, email, phone, first_name, last_name, company, job_title, department FROM users")
+
+    if not users:
+        st.info("No users found in the database.")
+    else:
+        # Convert to DataFrame
+        users_df = pd.DataFrame(users, columns=["ID", "Username", "Role", "Email", "Phone", "First Name", "Last Name", "Company", "Job Title", "Department"])
+
+        # Create filter widgets - matching project analytics style
+        with st.expander("🔍 Filter Users", expanded=False):
+            col1, col2, col3, col4 = st.columns(4)
+
+            with col1:
+                username_options = ['All Usernames'] + sorted(users_df['Username'].unique().tolist())
+                selected_username = st.selectbox(
+                    "Filter by Username", 
+                    username_options,
+                    key="user_username_filter"
+                )
+
+            with col2:
+                role_options = ['All Roles'] + sorted(users_df['Role'].unique().tolist())
+                selected_role = st.selectbox(
+                    "Filter by Role",
+                    role_options,
+                    key="user_role_filter"
+                )
+
+            with col3:
+                first_name_options = ['All First Names'] + sorted(users_df['First Name'].dropna().unique().tolist())
+                selected_first_name = st.selectbox(
+                    "Filter by First Name",
+                    first_name_options,
+                    key="user_first_name_filter"
+                )
+
+            with col4:
+                last_name_options = ['All Last Names'] + sorted(users_df['Last Name'].dropna().unique().tolist())
+                selected_last_name = st.selectbox(
+                    "Filter by Last Name",
+                    last_name_options,
+                    key="user_last_name_filter"
+                )
+
+        # Apply filters
+        filtered_df = users_df.copy()
+
+        if selected_username != 'All Usernames':
+            filtered_df = filtered_df[filtered_df['Username'] == selected_username]
+
+        if selected_role != 'All Roles':
+            filtered_df = filtered_df[filtered_df['Role'] == selected_role]
+
+        if selected_first_name != 'All First Names':
+            filtered_df = filtered_df[filtered_df['First Name'] == selected_first_name]
+
+        if selected_last_name != 'All Last Names':
+            filtered_df = filtered_df[filtered_df['Last Name'] == selected_last_name]
+
+        # Add selection column to filtered DataFrame
+        filtered_df.insert(0, "Select", False)
+
+        # Display editable dataframe with checkboxes
+        edited_df = st.data_editor(
+            filtered_df,
+            column_config={
+                "Select": st.column_config.CheckboxColumn("Select"),
+                "ID": None,  # Hide ID column
+                "Role": st.column_config.SelectboxColumn(
+                    "Role",
+                    options=["Admin", "User"],
+                    required=True
+                )
+            },
+            hide_index=True,
+            use_container_width=True,
+            key="user_editor"
+        )
+
+        # Get selected rows from the filtered DataFrame
+        selected_users = edited_df[edited_df["Select"]]
+
+        # Action buttons for selected users
+        if not selected_users.empty:
+            st.markdown("---")
+            st.subheader("Selected User Actions")
+
+            col1, col2, col3 = st.columns([1,1,3])
+
+            with col1:
+                if st.button("✏️ Edit Selected", key="edit_selected"):
+                    st.session_state.editing_users = selected_users["ID"].tolist()
+                    st.rerun()
+
+            with col2:
+                if st.button("🗑️ Delete Selected", type="primary", key="delete_selected"):
+                    st.session_state.deleting_users = selected_users["ID"].tolist()
+                    st.rerun()
+
+        # Delete confirmation
+        if 'deleting_users' in st.session_state and st.session_state.deleting_users:
+            st.markdown("---")
+            st.subheader("Confirm Deletion")
+
+            users_to_delete = []
+            usernames = get_user_directory()
+            for user_id in st.session_state.deleting_users:
+                if user_id in usernames:
+                    users_to_delete.append(usernames[user_id][0])
+
+            st.warning(f"⚠️ You are about to delete {len(users_to_delete)} user(s):")
+            st.write(", ".join(users_to_delete))
+            st.error("This action cannot be undone! All associated data will be permanently deleted.")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("✅ Confirm Deletion", type="primary"):
+                    for user_id in st.session_state.deleting_users:
+                        try:
+                            query_db("DELETE FROM users WHERE id=?", (user_id,))
+                        except Exception as e:
+                            st.error(f"Error deleting user ID {user_id}: {str(e)}")
+                    st.success(f"Successfully deleted {len(users_to_delete)} user(s)")
+                    del st.session_state.deleting_users
+                    st.rerun()
+
+            with col2:
+                if st.button("❌ Cancel"):
+                    del st.session_state.deleting_users
+                    st.rerun()
+
+
+        # Add this section to handle editing selected users
+        if 'editing_users' in st.session_state and st.session_state.editing_users:
+            st.markdown("---")
+            st.subheader("✏️ Edit Selected Users")
+
+            # Get the selected users' data
+            selected_users_data = []
+            for user_id in st.session_state.editing_users:
+                user = query_db(
+                    "SELECT id, username, role, email, phone, first_name, last_name, company, job_title, department FROM users WHERE id=?",
+                    (user_id,), one=True
+                )
+                if user:
+                    selected_users_data.append(user)
+
+            if selected_users_data:
+                # Create a form for editing
+                with st.form("edit_users_form"):
+                    edited_users = []
+
+                    for user in selected_users_data:
+                        user_id, username, role, email, phone, first_name, last_name, company, job_title, department = user
+
+                        st.markdown(f"### Editing User: {username}")
+
+                        cols = st.columns(2)
+                        with cols[0]:
+                            new_first_name = st.text_input("First Name", value=first_name, key=f"first_name_{user_id}")
+                            new_last_name = st.text_input("Last Name", value=last_name, key=f"last_name_{user_id}")
+                            new_company = st.text_input("Company", value=company, key=f"company_{user_id}")
+                        with cols[1]:
+                            new_role = st.selectbox(
+                                "Role", 
+                                ["User", "Admin"],
+                                index=0 if role == "User" else 1,
+                                key=f"role_{user_id}"
+                            )
+                            new_job_title = st.text_input("Job Title", value=job_title, key=f"job_title_{user_id}")
+                            new_department = st.text_input("Department", value=department, key=f"department_{user_id}")
+
+                        new_email = st.text_input("Email", value=email, key=f"email_{user_id}")
+                        new_phone = st.text_input("Phone", value=phone, key=f"phone_{user_id}")
+
+                        edited_users.append({
+                            "id": user_id,
+                            "first_name": new_first_name,
+                            "last_name": new_last_name,
+                            "company": new_company,
+                            "role": new_role,
+                            "job_title": new_job_title,
+                            "department": new_department,
+                            "email": new_email,
+                            "phone": new_phone
+                        })
+
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.form_submit_button("💾 Save Changes"):
+                            try:
+                                for user in edited_users:
+                                    query_db("""
+                                            UPDATE users SET
+                                                first_name=?, last_name=?, company=?,
+                                                role=?, job_title=?, department=?,
+                                                email=?, phone=?
+                                            WHERE id=?
+                                        """, (
+                                        user["first_name"], user["last_name"], user["company"],
+                                        user["role"], user["job_title"], user["department"],
+                                        user["email"], user["phone"],
+                                        user["id"]
+                                    ))
+                                st.success("User updates saved successfully!")
+                                del st.session_state.editing_users
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"Error updating users: {str(e)}")
+
+                    with col2:
+                        if st.form_submit_button("❌ Cancel"):
+                            del st.session_state.editing_users
+                            st.rerun()
+
+
+    # Add export functionality for the user data:
+    with st.expander("📤 Export User Data"):
+        csv = users_df.to_csv(index=False)
+        st.download_button(
+        label="Download CSV",
+        data=csv,
+        file_name="user_data.csv",
+        mime="text/csv"
+    )
+
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 20px;'></div>", unsafe_allow_html=True)
+
+    # ======= Project Management Section =======
+    st.subheader("📂 Project Management")
+
+    # ======= Summary Statistics ======= 
+    st.markdown("---")
+    st.subheader("📊 Project Overview")
+
+
+    # Calculate metrics
+    metrics = get_dashboard_metrics(st.session_state.reminder_period)
+    total_users = metrics['total_users']
+    total_projects = metrics['total_projects']
+    active_projects = metrics['active_projects']
+    overdue_projects = metrics['overdue_projects']
+    completed_projects = metrics['completed_projects']
+
+    # Create metric cards with the same style as Dashboard
+    metric_cards = [
+        {"title": "Completed Projects", "value": completed_projects, "color": "#07f7f7", "icon": "✅"},
+        {"title": "Total Projects", "value": total_projects, "color": "#6BB9F0", "icon": "📂"},
+        {"title": "Active Projects", "value": active_projects, "color": "#32CD32", "icon": "🟢"},
+        {"title": "Overdue Projects", "value": overdue_projects, "color": "#FF4500", "icon": "⚠️"}
+    ]
+
+    # Display metrics in columns with consistent styling
+    cols = st.columns(4)
+    for i, card in enumerate(metric_cards):
+        with cols[i]:
+            st.markdown(f"""
+                <div style='
+                    background-color: #FFFFFF;
+                    border-radius: 10px;
+                    padding: 1.2rem;
+                    border-left: 4px solid {card['color']};
+                    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+                    height: 100%;
+                '>
+                    <div style='display: flex; align-items: center; margin-bottom: 8px;'>
+                        <span style='font-size: 1.5rem; margin-right: 8px;'>{card['icon']}</span>
+                        <span style='font-size: 0.9rem; color: #666;'>{card['title']}</span>
+                    </div>
+                    <p style='font-size: 1.8rem; font-weight: 700; color: #2c3e50; margin: 0;'>{card['value']}</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+
+    # Divider with spacing
+    # st.markdown("---")
+    st.markdown("<div style='margin-bottom: 20px;'></div>", unsafe_allow_html=True)
+
+
+    # ======= Summary Statistics ======= 
+    st.markdown("---")
+    st.subheader("🔍 Filter Projects")
+
+    # First, fetch all project data with proper status calculations
+    projects_data = query_db("""
+            SELECT 
+                p.id, 
+                p.user_id as owner_id, 
+                p.name, 
+                p.description, 
+                p.start_date as planned_start_date,
+                p.end_date as planned_deadline,
+                p.budget,
+                ROUND(COALESCE(SUM(t.actual_cost), 0)) as actual_cost,
+                ROUND(p.budget - COALESCE(SUM(t.actual_cost), 0)) as budget_variance,
+                COUNT(t.id) as task_count,
+                SUM(CASE WHEN t.status = 'Completed' THEN 1 ELSE 0 END) as completed_tasks,
+                u.username as owner_name,
+                (ROUND(SUM(CASE WHEN t.status = 'Completed' THEN 1 ELSE 0 END) * 100.0 / 
+                NULLIF(COUNT(t.id), 0), 2)) as completion_pct,
+                julianday(p.end_date) - julianday(p.start_date) as planned_duration,
+                CASE
+                    WHEN MIN(t.actual_start_date) IS NULL OR MAX(t.actual_deadline) IS NULL THEN NULL
+                    ELSE julianday(MAX(t.actual_deadline)) - julianday(MIN(t.actual_start_date))
+                END as actual_duration,
+                MIN(t.actual_start_date) as actual_start_date,  
+                MAX(t.actual_deadline) as actual_deadline,      
+                CASE 
+                    WHEN COUNT(t.id) = 0 THEN 0
+                    WHEN SUM(CASE WHEN t.status = 'Completed' THEN 1 ELSE 0 END) = COUNT(t.id) THEN 1
+                    ELSE 0
+                END as is_completed
+            FROM projects p
+            LEFT JOIN tasks t ON p.id = t.project_id
+            LEFT JOIN users u ON p.user_id = u.id
+            GROUP BY p.id
+        """)
+
+    # Convert to DataFrame
+    project_df = pd.DataFrame(projects_data, columns=[
+        "ID", "Owner ID", "Project", "Description", "Planned Start Date", "Planned Deadline",
+        "Budget", "Actual Cost", "Budget Variance", "Total Tasks",
+        "Completed Tasks", "Owner", "Completion %",
+        "Planned Duration (days)", "Actual Duration (days)",
+        "Actual Start Date", "Actual Deadline", "is_completed"
+    ])
+
+    # Ensure date columns are proper datetime objects
+    date_cols = ["Planned Start Date", "Planned Deadline", "Actual Start Date", "Actual Deadline"]
+    for col in date_cols:
+        project_df[col] = pd.to_datetime(project_df[col])
+
+    # Create filter widgets in an expandable section
+    with st.expander("🔍 Filter Projects", expanded=True):
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            # Project name filter (multi-select)
+            project_names = ["All Projects"] + sorted(project_df["Project"].unique().tolist())
+            selected_projects = st.multiselect(
+                "Filter by Project",
+                options=project_names,
+                default=["All Projects"],
+                key="project_filter"
+            )
+
+        with col2:
+            # Owner filter
+            owner_options = ["All Owners"] + sorted(project_df["Owner"].dropna().unique().tolist())
+            selected_owner = st.selectbox(
+                "Filter by Owner",
+                options=owner_options,
+                key="owner_filter"
+            )
+
+        with col3:
+            # Status filter (based on completion)
+            status_options = ["All", "Completed", "In Progress", "Not Started"]
+            selected_status = st.selectbox(
+                "Filter by Status",
+                options=status_options,
+                key="status_filter"
+            )
+
+        col4, col5 = st.columns(2)
+        with col4:
+            # Date range filter
+            min_date = project_df["Planned Start Date"].min().date()
+            max_date = project_df["Planned Deadline"].max().date()
+            date_range = st.date_input(
+                "Date Range",
+                value=[min_date, max_date],
+                min_value=min_date,
+                max_value=max_date,
+                key="date_filter"
+            )
+
+        with col5:
+            # Budget variance filter
+            budget_filter = st.slider(
+                "Minimum Budget Variance ($)",
+                min_value=int(project_df["Budget Variance"].min()),
+                max_value=int(project_df["Budget Variance"].max()),
+                value=int(project_df["Budget Variance"].min()),
+                key="budget_filter"
+            )
+
+    # Apply filters
+    filtered_df = project_df.copy()
+
+    # Project name filter
+    if "All Projects" not in selected_projects and selected_projects:
+        filtered_df = filtered_df[filtered_df["Project"].isin(selected_projects)]
+
+    # Owner filter
+    if selected_owner != "All Owners":
+        filtered_df = filtered_df[filtered_df["Owner"] == selected_owner]
+
+    # Status filter
+    if selected_status == "Completed":
+        filtered_df = filtered_df[filtered_df["is_completed"] == 1]
+    elif selected_status == "In Progress":
+        filtered_df = filtered_df[(filtered_df["is_completed"] == 0) & (filtered_df["Total Tasks"] > 0)]
+    elif selected_status == "Not Started":
+        filtered_df = filtered_df[filtered_df["Total Tasks"] == 0]
+
+    # Date range filter
+    if len(date_range) == 2:
+        start_date, end_date = date_range
+        filtered_df = filtered_df[
+            (filtered_df["Planned Start Date"].dt.date >= start_date) &
+            (filtered_df["Planned Deadline"].dt.date <= end_date)
+        ]
+
+    # Budget variance filter
+    filtered_df = filtered_df[filtered_df["Budget Variance"] >= budget_filter]
+
+    # Display the filtered table
+    st.subheader("📊 Project Analytics")
+
+    # Format the display DataFrame (without affecting filtering)
+    display_df = filtered_df.copy()
+    display_df["Planned Start Date"] = display_df["Planned Start Date"].dt.strftime('%Y-%m-%d')
+    display_df["Planned Deadline"] = display_df["Planned Deadline"].dt.strftime('%Y-%m-%d')
+    display_df["Actual Start Date"] = display_df["Actual Start Date"].dt.strftime('%Y-%m-%d')
+    display_df["Actual Deadline"] = display_df["Actual Deadline"].dt.strftime('%Y-%m-%d')
+
+    # Show metrics summary
+    st.metric("Projects Shown", len(filtered_df), delta=f"{len(filtered_df)}/{len(project_df)}")
+
+    # Display the table
+    st.dataframe(
+        display_df[[
+            "Project", "Owner", "Planned Start Date", "Planned Deadline",
+            "Actual Start Date", "Actual Deadline", "Total Tasks",
+            "Completed Tasks", "Completion %", "Budget", "Actual Cost",
+            "Budget Variance"
+        ]],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Completion %": st.column_config.ProgressColumn(
+                "Completion %",
+                help="Project completion percentage",
+                format="%.1f%%",
+                min_value=0,
+                max_value=100,
+            ),
+            "Budget": st.column_config.NumberColumn(
+                "Budget ($)",
+                format="$%.2f",
+            ),
+            "Actual Cost": st.column_config.NumberColumn(
+                "Actual Cost ($)",
+                format="$%.2f",
+            ),
+            "Budget Variance": st.column_config.NumberColumn(
+                "Budget Variance ($)",
+                format="$%.2f",
+            )
+        }
+    )
+
+
+    # Add export functionality for project analytics data:
+    with st.expander("📤 Export Project Analytics Data"):
+        csv = project_df.to_csv(index=False)
+        st.download_button(
+        label="Download CSV",
+        data=csv,
+        file_name="project_analytics_data.csv",
+        mime="text/csv"
+    )
+
+    # Divider with spacing
+    # st.markdown("---")
+    # st.markdown("<div style='margin-bottom: 30px;'></div>", unsafe_allow_html=True)
+
+
+    # Edit and Delete Projects
+    st.markdown("---")
+    st.subheader("📂 Edit or Delete Projects")
+
+
+    # Create dropdown for project selection
+    project_options = ["Select a project..."] + [f"{project[2]} (ID: {project[0]})" for project in projects_data]
+    selected_project = st.selectbox("Select Project to Edit/Delete", project_options, key="project_select")
+
+    if selected_project != "Select a project...":
+        selected_project_id = int(selected_project.split("ID: ")[1].rstrip(")"))
+        project_to_edit = next((project for project in projects_data if project[0] == selected_project_id), None)
+
+        if project_to_edit:
+            # Initialize session state variables
+            if 'confirm_delete_project' not in st.session_state:
+                st.session_state.confirm_delete_project = False
+            if 'editing_project' not in st.session_state:
+                st.session_state.editing_project = True
+
+            # Display edit form unless in delete confirmation or edit mode is False
+            if not st.session_state.confirm_delete_project and st.session_state.editing_project:
+                st.write(f"### Editing: {project_to_edit[2]}")
+
+                with st.form(f"edit_project_{project_to_edit[0]}"):
+                    # Define all form variables at the start
+                    new_name = st.text_input("Project Name*", 
+                                        value=project_to_edit[2],
+                                        help="Project name must be unique (case-insensitive)")
+
+                    new_description = st.text_area("Description", 
+                                                value=project_to_edit[3] if len(project_to_edit) > 3 else "")
+
+                    # Get user options as a dictionary {id: username}
+                    users = query_db("SELECT id, username FROM users")
+                    user_options = {user[0]: user[1] for user in users}
+
+                    # Project Owner Dropdown (only for admins)
+                    if st.session_state.user_role == "Admin":
+                        current_owner_result = query_db(
+                            "SELECT username FROM users WHERE id=?", 
+                            (project_to_edit[1],), 
+                            one=True
+                        )
+                        current_owner = current_owner_result[0] if current_owner_result else "Unknown"
+
+                        # Create list of usernames for the selectbox
+                        usernames = list(user_options.values())
+                        new_owner = st.selectbox(
+                            "Project Owner*",
+                            options=usernames,
+                            index=usernames.index(current_owner) if current_owner in usernames else 0
+                        )
+                        new_owner_id = [uid for uid, uname in user_options.items() if uname == new_owner][0]
+                    else:
+                        new_owner_id = project_to_edit[1]
+                        owner_name_result = query_db(
+                            "SELECT username FROM users WHERE id=?", 
+                            (project_to_edit[1],), 
+                            one=True
+                        )
+                        owner_name = owner_name_result[0] if owner_name_result else "Unknown"
+                        st.write(f"**Project Owner:** {owner_name}")
+
+                    # Project Dates
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        new_start_date = st.date_input(
+                            "Start Date*",
+                            value=datetime.strptime(project_to_edit[4], "%Y-%m-%d").date() if len(project_to_edit) > 4 else datetime.now().date()
+                        )
+                    with col2:
+                        new_end_date = st.date_input(
+                            "Due Date*",
+                            value=datetime.strptime(project_to_edit[5], "%Y-%m-%d").date() if len(project_to_edit) > 5 else datetime.now().date()
+                        )
+
+                    # Project Budget
+                    budget_value = float(project_to_edit[6]) if len(project_to_edit) > 6 and project_to_edit[6] is not None else 0.0
+                    new_budget = st.number_input(
+                        "Project Budget", 
+                        min_value=0.0, 
+                        value=budget_value
+                    )
+
+                    # Form buttons column layout
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        submit_button = st.form_submit_button("💾 Save Changes")
+                    with col2:
+                        cancel_button = st.form_submit_button("❌ Cancel")
+
+                    # Handle form submission
+                    if submit_button:
+                        # Validate inputs
+                        if not new_name.strip():
+                            st.error("Project name is required")
+                        elif new_end_date < new_start_date:
+                            st.error("Due date must be on or after the start date")
+                        else:
+                            # Check for duplicate name (excluding current project)
+                            existing_project = query_db(
+                                "SELECT 1 FROM projects WHERE LOWER(name) = LOWER(?) AND id != ?", 
+                                (new_name.strip(), project_to_edit[0]), 
+                                one=True
+                            )
+
+                            if existing_project:
+                                st.error(f"A project with name '{new_name.strip()}' already exists")
+                            else:
+                                query_db("""
+                                        UPDATE projects 
+                                        SET name=?, description=?, user_id=?, 
+                                            start_date=?, end_date=?, budget=?
+                                        WHERE id=?
+                                    """, (
+                                    new_name.strip(), 
+                                    new_description, 
+                                    new_owner_id,
+                                    new_start_date, 
+                                    new_end_date, 
+                                    new_budget, 
+                                    project_to_edit[0]
+                                ))
+                                st.toast("✅ Changes updated successfully!", icon="✅")
+                                st.session_state.editing_project = False
+                                st.rerun()
+
+                    if cancel_button:
+                        st.session_state.editing_project = False
+                        st.rerun()
+
+            # Delete confirmation section (outside the form)
+            if st.session_state.confirm_delete_project:
+                st.warning(f"⚠️ Are you sure you want to delete project '{project_to_edit[2]}'?")
+                st.error("This will delete ALL associated tasks and cannot be undone!")
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button("✅ Confirm Delete", key=f"confirm_del_proj_{project_to_edit[0]}"):
+                        delete_project(project_to_edit[0])
+                        st.toast("🗑️ Project deleted successfully!", icon="🗑️")
+                        st.session_state.confirm_delete_project = False
+                        st.session_state.editing_project = False
+                        st.rerun()
+                with col2:
+                    if st.button("❌ Cancel", key=f"cancel_del_proj_{project_to_edit[0]}"):
+                        st.session_state.confirm_delete_project = False
+                        st.rerun()
+            else:
+                # Show edit button if not currently editing
+                if not st.session_state.editing_project:
+                    if st.button("✏️ Edit Project", key=f"edit_{project_to_edit[0]}"):
+                        st.session_state.editing_project = True
+                        st.rerun()
+
+                # Delete button (only show when not editing)
+                if not st.session_state.editing_project:
+                    if st.button("🗑️ Delete Project", key=f"init_del_proj_{project_to_edit[0]}", type="primary"):
+                        st.session_state.confirm_delete_project = True
+                        st.rerun()
+
+    # # Divider with spacing
+    # st.markdown("---")
+    # st.markdown("<div style='margin-bottom: 40px;'></div>", unsafe_allow_html=True)
+
+
+    # ======= System Settings Section =======
+    st.markdown("---")
+    st.subheader("⚙️ System Settings")
+
+    with st.expander("Customize System Settings", expanded=False):
+        with st.form("system_settings_form"):
+            default_reminder_period = st.number_input("Default Reminder Period (days)", min_value=1, value=7)
+            enable_email_notifications = st.checkbox("Enable Email Notifications", value=True)
+
+            submitted = st.form_submit_button("Save Settings")
+            if submitted:
+                st.session_state.reminder_period = default_reminder_period
+                st.success("System settings updated successfully!")
+                st.rerun()
+
+    # Add another divider at the bottom for clean separation
+    st.markdown("---")
@@ -0,0 +1,206 @@
+# attachments.py
+"""On-demand attachment access.
+
+File lists only need names and sizes. The bytes are read when the user actually asks
+for a download, in fixed-size chunks, so nothing is read for files nobody opens.
+
+New uploads go to the content-addressed blob store and the attachments row keeps only
+metadata (name, size, content_hash). Rows written before that still hold their bytes
+in file_data and are read with SQLite's incremental BLOB I/O until
+`python attachments.py migrate-blobs` moves them out.
+
+Blob files are shared by every row with the same content. Deleting a blob checks for
+references inside transaction(), under SQLite's write lock. Uploads write the file
+before taking that lock, so a large upload does not block other writers, and then
+check that the file is still there in the transaction that records the row. A delete
+that slipped in between is caught there and the file is written again.
+"""
+import argparse
+import logging
+import sqlite3
+
+from blob_store import get_blob_store
+from database import after_commit, get_pool, run_query, transaction
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+# `gc` leaves blobs younger than this alone: they may belong to an upload in flight
+ORPHAN_GRACE_SECONDS = 3600
+
+logger = logging.getLogger(__name__)
+
+
+def get_attachment_meta(file_id):
+    """(file_name, size in bytes) without touching file_data's content"""
+    # length() on a BLOB is answered from the record header, not the overflow pages
+    return run_query("""
+        SELECT file_name, COALESCE(file_size, length(file_data))
+        FROM attachments WHERE id=?
+    """, (file_id,), one=True)
+
+
+def add_attachment(file_name, data, task_id, project_id, uploaded_by):
+    """Store the file body in the blob store and record its metadata; returns the content hash"""
+    store = get_blob_store()
+    content_hash, size = store.put(data)
+    with transaction():
+        if not store.exists(content_hash):
+            store.put(data)     # removed by release_blob() since put()
+        run_query("""
+            INSERT INTO attachments (
+                file_name, file_data, task_id, project_id,
+                uploaded_by, uploaded_at, file_size, content_hash
+            ) VALUES (?, X'', ?, ?, ?, datetime('now'), ?, ?)
+        """, (file_name, task_id, project_id, uploaded_by, size, content_hash))
+    return content_hash
+
+
+def delete_attachment(file_id):
+    """Delete the row, and the stored blob once no other attachment shares it"""
+    with transaction():
+        row = run_query("SELECT content_hash FROM attachments WHERE id=?", (file_id,), one=True,
+                        use_cache=False)
+        run_query("DELETE FROM attachments WHERE id=?", (file_id,))
+        if row and row[0]:
+            after_commit(lambda: release_blob(row[0]))
+
+
+def _is_referenced(content_hash):
+    return run_query("SELECT 1 FROM attachments WHERE content_hash=? LIMIT 1",
+                     (content_hash,), one=True, use_cache=False) is not None
+
+
+def release_blob(content_hash, min_age=0):
+    """Delete a stored blob if no attachment references it; True if it was deleted.
+
+    Blobs written less than min_age seconds ago are kept (see FilesystemBlobStore.delete).
+    """
+    with transaction():
+        if _is_referenced(content_hash):
+            return False
+        deleted = get_blob_store().delete(content_hash, min_age=min_age)
+        # Holding the write lock, nothing can have added a reference. If a row shows up
+        # anyway, a writer bypassed transaction() and the file needs restoring.
+        if deleted and _is_referenced(content_hash):
+            logger.error("Blob %s was deleted while an attachment referenced it", content_hash)
+    return deleted
+
+
+def iter_attachment_chunks(file_id, chunk_size=CHUNK_SIZE):
+    """Yield the attachment's bytes chunk by chunk, from the blob store or the legacy BLOB"""
+    row = run_query("SELECT content_hash FROM attachments WHERE id=?", (file_id,), one=True)
+    if not row:
+        return
+    if row[0]:
+        yield from get_blob_store().iter_chunks(row[0], chunk_size)
+    else:
+        yield from _iter_db_chunks(file_id, chunk_size)
+
+
+def _iter_db_chunks(file_id, chunk_size):
+    with get_pool().connection() as conn:
+        if hasattr(conn, 'blobopen'):
+            try:
+                blob = conn.blobopen('attachments', 'file_data', file_id, readonly=True)
+            except sqlite3.OperationalError:
+                return  # no such row
+            with blob:
+                while True:
+                    chunk = blob.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+        else:
+            # Python < 3.11: page through the value with substr(), which also avoids a full copy
+            offset = 1
+            while True:
+                row = conn.execute(
+                    "SELECT substr(file_data, ?, ?) FROM attachments WHERE id=?",
+                    (offset, chunk_size, file_id)
+                ).fetchone()
+                if not row or not row[0]:
+                    break
+                yield bytes(row[0])
+                offset += chunk_size
+
+
+def read_attachment(file_id, chunk_size=CHUNK_SIZE):
+    """Whole attachment as bytes (b'' if it no longer exists)"""
+    data = bytearray()
+    for chunk in iter_attachment_chunks(file_id, chunk_size):
+        data += chunk
+    return bytes(data)
+
+
+def format_file_size(size):
+    if size is None:
+        return ""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+# --- Maintenance ---
+def move_attachments_to_blob_store(batch_size=50, log=print):
+    """Copy legacy file_data BLOBs into the blob store and clear them from the database.
+
+    Works in batches so it can be interrupted and resumed; rows that already have a
+    content_hash are skipped. Run VACUUM afterwards to give the space back.
+    """
+    store = get_blob_store()
+    moved = 0
+    while True:
+        rows = run_query("""
+            SELECT id FROM attachments
+            WHERE content_hash IS NULL AND length(file_data) > 0
+            LIMIT ?
+        """, (batch_size,), use_cache=False)
+        if not rows:
+            break
+        for (file_id,) in rows:
+            content_hash, size = store.put_chunks(_iter_db_chunks(file_id, CHUNK_SIZE))
+            with transaction():
+                if not store.exists(content_hash):
+                    store.put_chunks(_iter_db_chunks(file_id, CHUNK_SIZE))
+                run_query("""
+                    UPDATE attachments SET content_hash=?, file_size=?, file_data=X''
+                    WHERE id=? AND content_hash IS NULL
+                """, (content_hash, size, file_id))
+            moved += 1
+        log(f"Moved {moved} attachment(s) so far")
+    return moved
+
+
+def collect_orphan_blobs(grace_seconds=ORPHAN_GRACE_SECONDS, log=print):
+    """Delete stored blobs that no attachment row references any more.
+
+    Each candidate is re-checked under the write lock before it is deleted, and blobs
+    written in the last grace_seconds are kept.
+    """
+    referenced = {row[0] for row in run_query(
+        "SELECT DISTINCT content_hash FROM attachments WHERE content_hash IS NOT NULL", use_cache=False)}
+    removed = 0
+    for content_hash in list(get_blob_store().iter_hashes()):
+        if content_hash not in referenced and release_blob(content_hash, min_age=grace_seconds):
+            removed += 1
+    log(f"Removed {removed} orphaned blob(s)")
+    return removed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Attachment storage maintenance")
+    parser.add_argument("command", choices=["migrate-blobs", "gc"])
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM the database after migrating")
+    parser.add_argument("--grace-minutes", type=float, default=ORPHAN_GRACE_SECONDS / 60,
+                        help="gc keeps blobs written more recently than this")
+    options = parser.parse_args()
+
+    if options.command == "migrate-blobs":
+        move_attachments_to_blob_store(options.batch_size)
+        if options.vacuum:
+            with get_pool().connection() as conn:
+                conn.execute("VACUUM")
+    else:
+        collect_orphan_blobs(options.grace_minutes * 60)
@@ -0,0 +1,136 @@
+# blob_store.py
+"""Content-addressed storage for file bodies kept outside the SQLite database.
+
+Blobs are named by the SHA-256 of their content, so uploading the same file twice
+stores it once. Backends are pluggable through BLOB_STORES; the filesystem store is
+the default and fans files out as <root>/ab/cd/<hash> to keep directories small.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+DEFAULT_ROOT = os.environ.get('PM_BLOB_STORE_ROOT', 'blob_store')
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+class FilesystemBlobStore:
+    """Blobs as immutable files under a root directory"""
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+
+    def path_for(self, content_hash):
+        if len(content_hash) != 64 or any(ch not in '0123456789abcdef' for ch in content_hash):
+            raise ValueError(f"Not a SHA-256 hex digest: {content_hash!r}")
+        return os.path.join(self.root, content_hash[:2], content_hash[2:4], content_hash)
+
+    def put(self, data):
+        """Store bytes; returns (content_hash, size)"""
+        return self.put_chunks([data])
+
+    def put_chunks(self, chunks):
+        """Store an iterable of byte chunks without holding the whole file in memory.
+
+        The content is written to a temporary file while it is hashed, then moved into
+        place. If a blob with the same hash already exists the temporary file is dropped
+        and the existing blob's mtime is refreshed, which restarts its grace period
+        (see delete()).
+        """
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            content_hash = digest.hexdigest()
+            path = self.path_for(content_hash)
+            try:
+                os.utime(path)      # already stored
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return content_hash, size
+
+    def exists(self, content_hash):
+        return os.path.exists(self.path_for(content_hash))
+
+    def size(self, content_hash):
+        return os.path.getsize(self.path_for(content_hash))
+
+    def iter_chunks(self, content_hash, chunk_size=CHUNK_SIZE):
+        with open(self.path_for(content_hash), 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def get(self, content_hash):
+        with open(self.path_for(content_hash), 'rb') as f:
+            return f.read()
+
+    def delete(self, content_hash, min_age=0):
+        """Remove a blob unless it was written less than min_age seconds ago.
+
+        Returns True if the blob is gone. A recent blob may belong to an upload whose
+        attachments row is not committed yet, so it is kept.
+        """
+        path = self.path_for(content_hash)
+        try:
+            if min_age and time.time() - os.path.getmtime(path) < min_age:
+                return False
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return True
+
+    def iter_hashes(self):
+        """Every stored content hash"""
+        if not os.path.isdir(self.root):
+            return
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if len(name) == 64 and not name.startswith('.'):
+                    yield name
+
+
+# Available backends - register new ones here and select them with [blob_store] backend=...
+BLOB_STORES = {
+    'filesystem': FilesystemBlobStore,
+}
+
+_store = None
+_store_settings = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store():
+    if _store is None:
+        configure_blob_store()
+    return _store
+
+
+def configure_blob_store(backend='filesystem', **options):
+    """Select the blob store backend; an unchanged configuration keeps the current store"""
+    global _store, _store_settings
+    if backend not in BLOB_STORES:
+        raise ValueError(f"Unknown blob store backend: {backend}")
+    settings = (backend, tuple(sorted(options.items())))
+    with _store_lock:
+        if _store is None or settings != _store_settings:
+            _store = BLOB_STORES[backend](**options)
+            _store_settings = settings
+    return _store
@@ -1,58 +1,96 @@
 # calendar_page.py
 import streamlit as st
-import sqlite3
 import json 
-from datetime import datetime
-import pandas as pd
+from datetime import date, timedelta
 import streamlit.components.v1 as components
+from database import get_pool
+from query_cache import get_cache
+from task_status import OVERDUE, status_sql
+
+# Events just outside the visible range are sent too, so edge days of the grid are filled
+CALENDAR_MARGIN_DAYS = 7
+
+STATUS_COLORS = {
+    'pending': '#FFA500',
+    'in_progress': '#1E90FF',
+    'completed': '#32CD32',
+    'overdue': '#FF4500'
+}
+
+
+def visible_range(view, anchor):
+    """[start, end) dates FullCalendar shows for a view around the anchor date"""
+    if view == "dayGridMonth":
+        first = anchor.replace(day=1)
+        next_month = (first + timedelta(days=32)).replace(day=1)
+        # The month grid starts on the Sunday on or before the 1st and is at most six weeks long
+        start = first - timedelta(days=(first.weekday() + 1) % 7)
+        return start, max(next_month, start + timedelta(days=42))
+    if view == "timeGridDay":
+        return anchor, anchor + timedelta(days=1)
+    start = anchor - timedelta(days=(anchor.weekday() + 1) % 7)
+    return start, start + timedelta(days=7)
+
+
+def shift_anchor(view, anchor, step):
+    """Move the anchor one view-sized step forwards (1) or backwards (-1)"""
+    if view == "dayGridMonth":
+        month = anchor.month - 1 + step
+        return anchor.replace(year=anchor.year + month // 12, month=month % 12 + 1, day=1)
+    return anchor + timedelta(days=step * (1 if view == "timeGridDay" else 7))
+
+
+def fetch_calendar_events(range_start, range_end):
+    """Events overlapping [range_start, range_end), cached per user, range and data version.
+
+    The result sits in the shared query cache tagged with the tables it was built from,
+    so any task, project or team change rebuilds it on the next render.
+    """
+    user_id = st.session_state.user_id
+    is_admin = st.session_state.user_role == "Admin"
+    today = date.today().isoformat()
+    key = ('calendar_events', is_admin, user_id, range_start.isoformat(), range_end.isoformat(), today)
+    return get_cache().get_or_load(
+        key, ('tasks', 'projects', 'project_team'),
+        lambda: _load_calendar_events(user_id, is_admin, range_start.isoformat(), range_end.isoformat(), today)
+    )
+
+
+def _load_calendar_events(user_id, is_admin, range_start, range_end, today):
+    # Date filtering and the overdue check happen in SQL; only the window's rows come back
+    query = f"""
+        SELECT t.id, t.title, t.start_date, COALESCE(t.deadline, t.start_date), t.status,
+               p.name as project_name, {status_sql('t')}
+        FROM tasks t
+        LEFT JOIN projects p ON t.project_id = p.id
+        WHERE t.start_date < ?3 AND COALESCE(t.deadline, t.start_date) >= ?4
+    """
+    # ?2 (the end of the upcoming window) only matters for the status CASE; today is enough here
+    args = [today, today, range_end, range_start]
+    if not is_admin:
+        query += """
+            AND (t.assigned_to = ?5 OR p.user_id = ?5 OR p.id IN (
+                SELECT project_id FROM project_team WHERE user_id = ?5
+            ))
+        """
+        args.append(user_id)
+
+    with get_pool().connection() as conn:
+        tasks = conn.execute(query, args).fetchall()
 
-def fetch_calendar_events():
-    """Fetch tasks and prepare them for the calendar visualization"""
-    conn = sqlite3.connect('project_management.db')
-    cursor = conn.cursor()
-    
-    if st.session_state.user_role == "Admin":
-        cursor.execute("""
-            SELECT t.id, t.title, t.start_date, t.deadline, t.status, p.name as project_name 
-            FROM tasks t
-            LEFT JOIN projects p ON t.project_id = p.id
-        """)
-    else:
-        cursor.execute("""
-            SELECT t.id, t.title, t.start_date, t.deadline, t.status, p.name as project_name 
-            FROM tasks t
-            LEFT JOIN projects p ON t.project_id = p.id
-            WHERE t.assigned_to = ? OR p.user_id = ? OR p.id IN (
-                SELECT project_id FROM project_team WHERE user_id = ?
-            )
-        """, (st.session_state.user_id, st.session_state.user_id, st.session_state.user_id))
-    
-    tasks = cursor.fetchall()
-    conn.close()
-    
     events = []
-    today = datetime.today().date()
-    
-    for task in tasks:
-        deadline = datetime.strptime(task[3], "%Y-%m-%d").date() if task[3] else today
-        status = task[4]
-        is_overdue = deadline < today and status != "Completed"
+    for task_id, title, start, end, status, project, status_class in tasks:
+        is_overdue = status_class == OVERDUE
         final_status = "overdue" if is_overdue else status.lower().replace(" ", "_")
-        
         events.append({
-            'id': str(task[0]),
-            'title': f"{task[1]} ({task[5]})",
-            'start': task[2],
-            'end': task[3] if task[3] else task[2],
-            'color': {
-                'pending': '#FFA500',
-                'in_progress': '#1E90FF',
-                'completed': '#32CD32',
-                'overdue': '#FF4500'
-            }.get(final_status, '#777777'),
+            'id': str(task_id),
+            'title': f"{title} ({project})",
+            'start': start,
+            'end': end,
+            'color': STATUS_COLORS.get(final_status, '#777777'),
             'extendedProps': {
-                'task_id': task[0],
-                'project': task[5],
+                'task_id': task_id,
+                'project': project,
                 'status': status,
                 'is_overdue': is_overdue
             }
@@ -61,10 +99,18 @@ def fetch_calendar_events():
 
 
 def show_calendar_page():
-    # st.title("📅 Project Calendar")
-    # st.markdown("---")
-    # st.markdown("<div style='margin-bottom: 20px;'></div>", unsafe_allow_html=True)
-    
+    st.markdown("---")
+
+    # Header Section with Gradient
+    st.markdown("""
+    <div class="doc-header">
+        <h1 style="color: white; margin-bottom: 0.5rem;">📅 Project Calendar</h1>
+        <p style="font-size: 1.1rem; opacity: 0.9;"></p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
     # Calendar view selector
     view_options = {
         "Month": "dayGridMonth",
@@ -78,6 +124,23 @@ def show_calendar_page():
         horizontal=True,
         label_visibility="collapsed"
     )
+    view = view_options[selected_view]
+    
+    # Navigation happens here rather than inside the iframe, so every step re-queries
+    # just the newly visible window instead of shipping every task up front
+    anchor = st.session_state.setdefault('calendar_anchor', date.today())
+    nav_prev, nav_today, nav_next = st.columns([1, 1, 1])
+    if nav_prev.button("◀ Previous", key="calendar_prev", use_container_width=True):
+        anchor = shift_anchor(view, anchor, -1)
+    if nav_today.button("Today", key="calendar_today", use_container_width=True):
+        anchor = date.today()
+    if nav_next.button("Next ▶", key="calendar_next", use_container_width=True):
+        anchor = shift_anchor(view, anchor, 1)
+    st.session_state.calendar_anchor = anchor
+    
+    range_start, range_end = visible_range(view, anchor)
+    events = fetch_calendar_events(range_start - timedelta(days=CALENDAR_MARGIN_DAYS),
+                                   range_end + timedelta(days=CALENDAR_MARGIN_DAYS))
     
     # Calendar HTML/JavaScript with Roboto font
     calendar_html = f"""
@@ -120,14 +183,15 @@ def show_calendar_page():
             document.addEventListener('DOMContentLoaded', function() {{
                 const calendarEl = document.getElementById('calendar');
                 const calendar = new FullCalendar.Calendar(calendarEl, {{
-                    initialView: '{view_options[selected_view]}',
+                    initialView: '{view}',
+                    initialDate: '{anchor.isoformat()}',
                     headerToolbar: {{
-                        left: 'prev,next today',
+                        left: '',
                         center: 'title',
-                        right: 'dayGridMonth,timeGridWeek,timeGridDay,listWeek'
+                        right: ''
                     }},
                     eventDisplay: 'block',
-                    events: {json.dumps(fetch_calendar_events())},
+                    events: {json.dumps(events)},
                     eventDidMount: function(info) {{
                         tippy(info.el, {{
                             content: `
@@ -168,17 +232,16 @@ def show_calendar_page():
     # Task details modal
     if hasattr(st.session_state, '_component_value') and 'taskId' in st.session_state._component_value:
         task_id = st.session_state._component_value['taskId']
-        conn = sqlite3.connect('project_management.db')
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT t.*, p.name as project_name, u.username as assignee_name
-            FROM tasks t
-            JOIN projects p ON t.project_id = p.id
-            LEFT JOIN users u ON t.assigned_to = u.id
-            WHERE t.id=?
-        """, (task_id,))
-        task = cursor.fetchone()
-        conn.close()
+        with get_pool().connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT t.*, p.name as project_name, u.username as assignee_name
+                FROM tasks t
+                JOIN projects p ON t.project_id = p.id
+                LEFT JOIN users u ON t.assigned_to = u.id
+                WHERE t.id=?
+            """, (task_id,))
+            task = cursor.fetchone()
         
         if task:
             with st.expander(f"📝 Task Details: {task[2]}", expanded=True):
@@ -0,0 +1,99 @@
+# chart_export.py
+"""On-demand PNG export for Plotly figures.
+
+Kaleido takes hundreds of milliseconds per chart, so pages no longer render PNGs up
+front for their download buttons. A PNG is rendered only when someone asks for it, on
+a small shared worker pool, and kept in a process-wide LRU keyed by a hash of the
+figure JSON and export size - the same chart is never rendered twice.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+EXPORT_WORKERS = int(os.environ.get('PM_CHART_EXPORT_WORKERS', 2))
+CACHE_BYTES = int(os.environ.get('PM_CHART_CACHE_MB', 64)) * 1024 * 1024
+RENDER_TIMEOUT = float(os.environ.get('PM_CHART_RENDER_TIMEOUT', 60))
+
+_lock = threading.Lock()
+_cache = OrderedDict()      # key -> png bytes, least recently used first
+_cache_bytes = 0
+_pending = {}               # key -> Future for renders in flight
+_executor = None
+
+
+def figure_key(fig, width=None, height=None, scale=None):
+    """Stable hash of what the PNG would contain"""
+    digest = hashlib.sha256(fig.to_json().encode('utf-8'))
+    digest.update(repr((width, height, scale)).encode('ascii'))
+    return digest.hexdigest()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix='chart-export')
+        return _executor
+
+
+def _store(key, png):
+    global _cache_bytes
+    with _lock:
+        _pending.pop(key, None)
+        if len(png) > CACHE_BYTES:
+            return
+        if key in _cache:
+            _cache_bytes -= len(_cache.pop(key))
+        _cache[key] = png
+        _cache_bytes += len(png)
+        while _cache_bytes > CACHE_BYTES:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= len(evicted)
+
+
+def _render(key, fig, width, height, scale):
+    try:
+        png = fig.to_image(format="png", width=width, height=height, scale=scale)
+    except BaseException:
+        with _lock:
+            _pending.pop(key, None)
+        raise
+    _store(key, png)
+    return png
+
+
+def cached_png(key):
+    """PNG bytes if this figure has already been rendered, else None"""
+    with _lock:
+        png = _cache.get(key)
+        if png is not None:
+            _cache.move_to_end(key)
+        return png
+
+
+def request_png(fig, width=None, height=None, scale=None, key=None):
+    """Start rendering in the background (unless cached or already running); returns a Future"""
+    key = key or figure_key(fig, width, height, scale)
+    png = cached_png(key)
+    if png is not None:
+        future = Future()
+        future.set_result(png)
+        return future
+    executor = _get_executor()
+    with _lock:
+        if key not in _pending:
+            # Render from a snapshot so later edits to the caller's figure don't leak in
+            _pending[key] = executor.submit(_render, key, fig.__class__(fig), width, height, scale)
+        return _pending[key]
+
+
+def get_png(fig, width=None, height=None, scale=None, timeout=RENDER_TIMEOUT):
+    """Rendered PNG bytes, waiting for the worker pool if necessary"""
+    return request_png(fig, width, height, scale).result(timeout)
+
+
+def stats():
+    with _lock:
+        return {'entries': len(_cache), 'bytes': _cache_bytes, 'rendering': len(_pending)}
@@ -0,0 +1,396 @@
+# database.py
+import logging
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from instrumentation import active_trace
+from query_cache import get_cache, is_cacheable, is_read, table_written, tables_read
+
+DB_PATH = 'project_management.db'
+
+# Defaults - override with environment variables or configure_pool()
+POOL_SIZE = int(os.environ.get('PM_DB_POOL_SIZE', 8))
+POOL_TIMEOUT = float(os.environ.get('PM_DB_POOL_TIMEOUT', 30))
+HEALTH_CHECK_INTERVAL = float(os.environ.get('PM_DB_HEALTH_CHECK_INTERVAL', 30))
+BUSY_TIMEOUT_MS = int(os.environ.get('PM_DB_BUSY_TIMEOUT_MS', 5000))
+
+# Retries for "database is locked" / "database is busy" after the busy timeout gave up
+LOCK_RETRIES = int(os.environ.get('PM_DB_LOCK_RETRIES', 5))
+LOCK_RETRY_DELAY = float(os.environ.get('PM_DB_LOCK_RETRY_DELAY', 0.05))
+
+# Per-connection PRAGMAs applied to every pooled connection. journal_mode is persistent
+# in the database file and is set once by bootstrap_db().
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,       # negative = KiB, so ~16 MB of page cache per connection
+    'mmap_size': 268435456,     # 256 MB memory-mapped I/O
+    'temp_store': 'MEMORY',
+}
+
+# PRAGMAs that may be set through configuration - anything else is rejected
+ALLOWED_PRAGMAS = {
+    'journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store',
+    'wal_autocheckpoint', 'journal_size_limit', 'foreign_keys',
+}
+CONNECTION_PRAGMAS = ALLOWED_PRAGMAS - {'journal_mode'}
+
+logger = logging.getLogger(__name__)
+
+
+def _pragma_sql(name, value):
+    if name not in ALLOWED_PRAGMAS:
+        raise ValueError(f"Unsupported PRAGMA: {name}")
+    if isinstance(value, bool):
+        value = int(value)
+    if not isinstance(value, int) and not str(value).isalnum():
+        raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+    return f"PRAGMA {name}={value}"
+
+
+def is_locked_error(error):
+    """True for the transient errors SQLite raises when another writer holds the lock"""
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and (
+        'database is locked' in message or 'database is busy' in message
+    )
+
+
+def retry_on_locked(func, *args, retries=None, delay=None, **kwargs):
+    """Call func, retrying with exponential backoff and jitter while the database is locked"""
+    retries = LOCK_RETRIES if retries is None else retries
+    delay = LOCK_RETRY_DELAY if delay is None else delay
+    for attempt in range(retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except sqlite3.OperationalError as e:
+            if not is_locked_error(e) or attempt == retries:
+                raise
+            wait = delay * (2 ** attempt) * (1 + random.random())
+            logger.warning("Database locked, retrying in %.3fs (attempt %d/%d)", wait, attempt + 1, retries)
+            time.sleep(wait)
+
+
+class ConnectionPool:
+    """Bounded pool of reusable SQLite connections shared by every Streamlit session.
+
+    Connections outlive a single script run, so reruns and page switches reuse an
+    open handle instead of paying for connect/close on every statement. A connection
+    that sat idle longer than `health_check_interval` seconds is pinged before reuse
+    and replaced if it no longer answers.
+    """
+
+    def __init__(self, db_path=DB_PATH, pool_size=POOL_SIZE, timeout=POOL_TIMEOUT,
+                 health_check_interval=HEALTH_CHECK_INTERVAL, busy_timeout_ms=BUSY_TIMEOUT_MS,
+                 pragmas=None):
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.busy_timeout_ms = busy_timeout_ms
+        self.pragmas = dict(PRAGMAS, **(pragmas or {}))
+        for name, value in self.pragmas.items():
+            _pragma_sql(name, value)  # validate up front rather than on first connect
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = set()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            if name in CONNECTION_PRAGMAS:
+                conn.execute(_pragma_sql(name, value))
+        with self._lock:
+            self._connections.add(conn)
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            self._connections.discard(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def is_healthy(conn):
+        """Return True if the connection can still run a trivial statement"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self):
+        """Check a connection out of the pool, opening a new one if none are idle"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No database connection became available within {self.timeout}s")
+        try:
+            conn = None
+            while conn is None:
+                try:
+                    conn, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    conn = self._connect()
+                    break
+                if time.monotonic() - last_used > self.health_check_interval and not self.is_healthy(conn):
+                    self._discard(conn)
+                    conn = None
+            return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        """Return a connection to the pool, rolling back anything left uncommitted"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put((conn, time.monotonic()))
+        except sqlite3.Error:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a `with` block.
+
+        Nested blocks on the same thread share the outer connection, so helpers that
+        call query_db from inside another database block do not take a second slot.
+        """
+        held = getattr(self._local, 'conn', None)
+        if held is not None:
+            yield held
+            return
+
+        conn = self.acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self.release(conn)
+
+    def current_connection(self):
+        """The connection this thread already holds inside a `with connection()` block, if any"""
+        return getattr(self._local, 'conn', None)
+
+    def close_all(self):
+        """Close every connection opened by this pool"""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+        with self._lock:
+            remaining = list(self._connections)
+        for conn in remaining:
+            self._discard(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def configure_pool(db_path=None, pool_size=None, timeout=None, health_check_interval=None,
+                   busy_timeout_ms=None, pragmas=None):
+    """Replace the shared pool if any setting differs from the current one.
+
+    Safe to call on every rerun - an unchanged configuration keeps the existing pool.
+    """
+    global _pool
+    current = get_pool()
+    settings = {
+        'db_path': db_path if db_path is not None else current.db_path,
+        'pool_size': int(pool_size) if pool_size is not None else current.pool_size,
+        'timeout': float(timeout) if timeout is not None else current.timeout,
+        'health_check_interval': (float(health_check_interval) if health_check_interval is not None
+                                  else current.health_check_interval),
+        'busy_timeout_ms': int(busy_timeout_ms) if busy_timeout_ms is not None else current.busy_timeout_ms,
+        'pragmas': dict(PRAGMAS, **dict(pragmas)) if pragmas is not None else current.pragmas,
+    }
+    if all(getattr(current, key) == value for key, value in settings.items()):
+        return current
+
+    with _pool_lock:
+        old, _pool = _pool, ConnectionPool(**settings)
+    old.close_all()
+    return _pool
+
+
+_bootstrapped = set()
+
+
+def bootstrap_db(pool=None):
+    """Switch the database file to the configured journal mode (WAL by default).
+
+    WAL lets readers keep going while a writer commits, which is what many concurrent
+    Streamlit sessions need. The mode is stored in the file, so this only does work
+    once per database path per process.
+    """
+    pool = pool or get_pool()
+    if pool.db_path in _bootstrapped:
+        return
+    journal_mode = pool.pragmas.get('journal_mode')
+    if journal_mode:
+        def set_journal_mode():
+            with pool.connection() as conn:
+                return conn.execute(_pragma_sql('journal_mode', journal_mode)).fetchone()[0]
+        mode = retry_on_locked(set_journal_mode)
+        if mode.lower() != str(journal_mode).lower():
+            logger.warning("Requested journal_mode=%s but database reports %s", journal_mode, mode)
+    _bootstrapped.add(pool.db_path)
+
+
+# --- Unit of work ---
+_tx = threading.local()
+
+
+class _UnitOfWork:
+    def __init__(self, conn):
+        self.conn = conn
+        self.tables = set()         # tables written, invalidated in the cache on commit
+        self.clear_cache = False
+        self.after_commit = []      # callbacks for side effects outside the database
+
+
+def current_unit_of_work():
+    """The transaction() this thread is inside, if any"""
+    return getattr(_tx, 'unit', None)
+
+
+@contextmanager
+def transaction(*tables):
+    """Run every write in the block as one transaction with a single commit.
+
+    run_query/run_many calls inside the block join the transaction instead of
+    committing one by one. Pass the names of tables written through the yielded
+    connection directly, so their cached reads are invalidated on commit. Nested
+    transaction() blocks join the outermost one; on an exception everything is
+    rolled back.
+    """
+    unit = current_unit_of_work()
+    if unit is not None:
+        unit.tables.update(t.lower() for t in tables)
+        yield unit.conn
+        return
+
+    with get_pool().connection() as conn:
+        if conn.in_transaction:
+            conn.commit()   # work a surrounding legacy block left pending
+        retry_on_locked(conn.execute, "BEGIN IMMEDIATE")
+        unit = _UnitOfWork(conn)
+        unit.tables.update(t.lower() for t in tables)
+        _tx.unit = unit
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            _tx.unit = None
+
+    cache = get_cache()
+    if unit.clear_cache:
+        cache.clear()
+    elif unit.tables:
+        cache.invalidate_tables(*unit.tables)
+    for callback in unit.after_commit:
+        callback()
+
+
+def after_commit(callback):
+    """Call `callback` once the current transaction commits, or now if there is none"""
+    unit = current_unit_of_work()
+    if unit is None:
+        callback()
+    else:
+        unit.after_commit.append(callback)
+
+
+def _execute(query, args, row_factory, many=False):
+    with get_pool().connection() as conn:
+        cur = conn.cursor()
+        if row_factory is not None:
+            cur.row_factory = row_factory
+        if many:
+            cur.executemany(query, args)
+        else:
+            cur.execute(query, args)
+        rv = cur.fetchall()
+        if current_unit_of_work() is None:
+            conn.commit()
+    return rv
+
+
+def _invalidate_after_write(query):
+    written = table_written(query)
+    unit = current_unit_of_work()
+    if unit is not None:
+        if written:
+            unit.tables.add(written)
+        else:
+            unit.clear_cache = True
+    elif written:
+        get_cache().invalidate_tables(written)
+    else:
+        get_cache().clear()
+
+
+def run_query(query, args=(), one=False, row_factory=None, use_cache=True):
+    """Execute a statement on a pooled connection, commit, and return the fetched rows.
+
+    Reads are served from the shared query cache when possible; writes evict the cached
+    results of the table they modify. Anything that is neither a plain read nor a
+    single-table write (DDL, PRAGMA, ...) clears the cache.
+    """
+    cache = get_cache()
+    trace = active_trace()
+    started = time.perf_counter()
+    cached = False
+    held = get_pool().current_connection()
+    # Inside an open transaction a read may see uncommitted rows - never cache those
+    if use_cache and is_cacheable(query) and not (held is not None and held.in_transaction):
+        key = (query, tuple(args), row_factory)
+        misses = trace.cache_misses if trace is not None else 0
+        rv = cache.get_or_load(key, tables_read(query),
+                               lambda: retry_on_locked(_execute, query, args, row_factory))
+        cached = trace is not None and trace.cache_misses == misses and cache.enabled
+    else:
+        rv = retry_on_locked(_execute, query, args, row_factory)
+        if not is_read(query):
+            _invalidate_after_write(query)
+    if trace is not None:
+        trace.query(query, started, time.perf_counter() - started, len(rv), cached)
+    return (rv[0] if rv else None) if one else rv
+
+
+def run_many(query, seq_of_args):
+    """executemany() a write statement - one statement preparation, one commit"""
+    started = time.perf_counter()
+    seq_of_args = list(seq_of_args)
+    retry_on_locked(_execute, query, seq_of_args, None, many=True)
+    _invalidate_after_write(query)
+    trace = active_trace()
+    if trace is not None:
+        trace.query(query, started, time.perf_counter() - started, len(seq_of_args), False)
@@ -0,0 +1,62 @@
+# debug_panel.py
+"""Admin-only debug panel for the instrumentation traces (see instrumentation.py).
+
+Shows where the current rerun spent its time: sections, queries, cache hits and
+misses, chart build and serialize times. Downloads this rerun or the recent reruns of
+every session as JSON or as a Chrome trace.
+"""
+import json
+
+import streamlit as st
+
+from instrumentation import chrome_trace, last_trace, recent_traces
+
+SLOWEST_QUERIES = 25
+
+
+def _download(label, document, file_name, key):
+    st.download_button(label, data=json.dumps(document, indent=1), file_name=file_name,
+                       mime="application/json", key=key)
+
+
+def show_debug_panel():
+    """Render the panel for the rerun that just finished; nothing when instrumentation is off"""
+    trace = last_trace()
+    if trace is None:
+        return
+    summary = trace.summary()
+    queries = summary["queries"]
+    cache = summary["cache"]
+
+    with st.expander(f"🛠️ Debug: rerun took {summary['total_ms']:.0f} ms"):
+        cols = st.columns(4)
+        cols[0].metric("Rerun", f"{summary['total_ms']:.0f} ms")
+        cols[1].metric("Queries", queries["count"], f"{queries['total_ms']:.0f} ms", delta_color="off")
+        cols[2].metric("Cache hits / misses", f"{cache['hits']} / {cache['misses']}")
+        cols[3].metric("Charts", len(summary["charts"]))
+        if summary["dropped_events"]:
+            st.warning(f"{summary['dropped_events']} events were not recorded (max_events reached)")
+
+        st.markdown("**Sections**")
+        st.dataframe(summary["sections"], use_container_width=True, hide_index=True)
+
+        st.markdown(f"**Slowest queries** (of {queries['count']})")
+        slowest = sorted(queries["items"], key=lambda query: query["duration_ms"], reverse=True)
+        st.dataframe(slowest[:SLOWEST_QUERIES], use_container_width=True, hide_index=True)
+
+        if summary["charts"]:
+            st.markdown("**Charts**")
+            st.dataframe(summary["charts"], use_container_width=True, hide_index=True)
+
+        stamp = trace.started_at.strftime("%Y%m%d-%H%M%S")
+        recent = recent_traces()
+        cols = st.columns(3)
+        with cols[0]:
+            _download("⬇️ This rerun (JSON)", summary, f"rerun-{stamp}.json", "debug_json")
+        with cols[1]:
+            _download("⬇️ This rerun (Chrome trace)", chrome_trace([trace]), f"rerun-{stamp}.trace.json",
+                      "debug_trace")
+        with cols[2]:
+            _download(f"⬇️ Last {len(recent)} reruns (Chrome trace)", chrome_trace(recent),
+                      f"reruns-{stamp}.trace.json", "debug_recent_trace")
+        st.caption("Open Chrome traces in chrome://tracing or ui.perfetto.dev")
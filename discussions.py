@@ -0,0 +1,132 @@
+# discussions.py
+"""Discussion threads read a page at a time.
+
+Each topic carries message_count and last_activity_at, kept current by triggers on
+discussion_messages, so listing a project's topics no longer counts every thread.
+Threads are read newest first in pages of DISCUSSION_PAGE_SIZE with a keyset cursor
+on (created_at, id). "Load older" therefore costs one index range scan however long
+the thread is. Rendered message blocks are memoized by message id and edit version,
+which the triggers bump whenever a message's text changes.
+"""
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from database import run_query
+from query_cache import get_cache
+
+DISCUSSION_PAGE_SIZE = 20
+RENDER_CACHE_SIZE = 4096
+
+# Counts are (re)derived from the messages on every change, through the topic_id index
+_REFRESH_TOPIC = """
+    UPDATE discussion_topics SET
+        message_count = (SELECT COUNT(*) FROM discussion_messages WHERE topic_id = {row}.topic_id),
+        last_activity_at = COALESCE(
+            (SELECT MAX(created_at) FROM discussion_messages WHERE topic_id = {row}.topic_id), created_at)
+    WHERE id = {row}.topic_id;
+"""
+
+DISCUSSION_TRIGGERS = {
+    'discussion_messages_insert': (
+        "AFTER INSERT ON discussion_messages BEGIN "
+        "UPDATE discussion_topics SET message_count = COALESCE(message_count, 0) + 1, "
+        "last_activity_at = MAX(COALESCE(last_activity_at, ''), NEW.created_at) "
+        "WHERE id = NEW.topic_id; END"),
+    'discussion_messages_delete': (
+        f"AFTER DELETE ON discussion_messages BEGIN {_REFRESH_TOPIC.format(row='OLD')} END"),
+    'discussion_messages_move': (
+        f"AFTER UPDATE OF topic_id ON discussion_messages BEGIN "
+        f"{_REFRESH_TOPIC.format(row='OLD')} {_REFRESH_TOPIC.format(row='NEW')} END"),
+    'discussion_messages_edit': (
+        "AFTER UPDATE OF message ON discussion_messages BEGIN "
+        "UPDATE discussion_messages SET version = COALESCE(version, 0) + 1 WHERE id = NEW.id; END"),
+}
+
+_BACKFILL = """
+    UPDATE discussion_topics SET
+        message_count = (SELECT COUNT(*) FROM discussion_messages m WHERE m.topic_id = discussion_topics.id),
+        last_activity_at = COALESCE(
+            (SELECT MAX(created_at) FROM discussion_messages m WHERE m.topic_id = discussion_topics.id),
+            created_at)
+"""
+
+# The triggers above write discussion_topics whenever messages change
+get_cache().add_dependency('discussion_messages', 'discussion_topics')
+
+
+def install_discussion_counters(c):
+    """Create the triggers and fill the counts from the current messages"""
+    for name, body in DISCUSSION_TRIGGERS.items():
+        c.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    c.execute(_BACKFILL)
+
+
+# --- Queries ---
+def fetch_topics(project_id):
+    """(id, topic, creator, created_at, is_archived, message_count, last_activity_at) rows,
+    active topics first, most recently active first"""
+    return run_query("""
+        SELECT t.id, t.topic, u.username, t.created_at, t.is_archived,
+               COALESCE(t.message_count, 0), COALESCE(t.last_activity_at, t.created_at)
+        FROM discussion_topics t
+        JOIN users u ON t.user_id = u.id
+        WHERE t.project_id = ?
+        ORDER BY t.is_archived ASC, COALESCE(t.last_activity_at, t.created_at) DESC
+    """, (project_id,))
+
+
+def fetch_messages(topic_id, before=None, limit=DISCUSSION_PAGE_SIZE):
+    """The `limit` newest messages older than the `before` cursor, oldest first.
+
+    Rows are (id, message, author, created_at, version). Returns (rows, cursor of the
+    next older page or None when this page reaches the start of the thread).
+    """
+    query = """
+        SELECT m.id, m.message, u.username, m.created_at, COALESCE(m.version, 0)
+        FROM discussion_messages m
+        JOIN users u ON m.user_id = u.id
+        WHERE m.topic_id = ?
+    """
+    args = [topic_id]
+    if before is not None:
+        query += " AND (m.created_at, m.id) < (?, ?)"
+        args += list(before)
+    query += " ORDER BY m.created_at DESC, m.id DESC LIMIT ?"
+    rows = run_query(query, args + [limit + 1])
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = (rows[-1][3], rows[-1][0])
+    return rows[::-1], next_cursor
+
+
+# --- Rendering ---
+def format_message_time(created_at):
+    try:
+        return datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S").strftime("%b %d, %Y at %I:%M %p")
+    except (TypeError, ValueError):
+        return created_at
+
+
+_rendered = OrderedDict()
+_rendered_lock = threading.Lock()
+
+
+def rendered_message(key, render):
+    """HTML for a message block, built once per key and reused.
+
+    Keys start with (message id, version); add anything else the markup depends on.
+    """
+    with _rendered_lock:
+        html = _rendered.get(key)
+        if html is not None:
+            _rendered.move_to_end(key)
+            return html
+    html = render()
+    with _rendered_lock:
+        _rendered[key] = html
+        while len(_rendered) > RENDER_CACHE_SIZE:
+            _rendered.popitem(last=False)
+    return html
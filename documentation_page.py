@@ -0,0 +1,310 @@
+# documentation_page.py
+"""Documentation page: the in-app user guide."""
+import streamlit as st
+
+
+def show_documentation_page():
+    """Render the Documentation page"""
+    st.markdown("---")
+
+
+    # Header Section with Gradient
+    st.markdown("""
+        <div class="doc-header">
+            <h1 style="color: white; margin-bottom: 0.5rem;">📚 Knowledge Center</h1>
+            <p style="font-size: 1.1rem; opacity: 0.9;">Comprehensive guides and resources for all app features</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # Introduction
+    st.markdown("""
+        <div style="background-color: #f9f7ff; padding: 1.5rem; border-radius: 10px; margin-bottom: 2rem;">
+            <h3 style="color: #6e48aa; margin-top: 0;">Welcome To The Project Management App Documentation</h3>
+            <p>This documentation provides detailed information about all features and functionality. 
+            Expand the sections below to access guides tailored to your needs.</p>
+        </div>
+        """, unsafe_allow_html=True)         
+
+    st.markdown("---")
+    # st.markdown("<div style='margin-top: 10px;'></div>", unsafe_allow_html=True)
+    st.markdown("<div style='margin-bottom: 30px;'></div>", unsafe_allow_html=True)
+
+
+    # Collapsible Sections
+    with st.expander("🚀 Getting Started", expanded=True):
+        st.markdown("""
+            ### 1. **Account Creation**
+            - **New Users**: Register via the login page with your email and password
+            - **First-Time Setup**: Complete your profile after registration
+            
+            ### 2. **Initial Navigation**
+            - **Dashboard**: Your central hub for project overviews
+            - **Projects**: Create and manage your projects
+            - **Tasks**: View and update individual tasks
+            
+            ### 3. **Quick Tips**
+            - Use the sidebar to navigate between features
+            - Hover over buttons for tooltips
+            - Click on any card to see detailed information
+            """)
+
+        st.image("https://via.placeholder.com/800x300?text=Getting+Started+Screenshot", 
+                caption="Getting Started Overview", use_container_width=True)
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 30px;'></div>", unsafe_allow_html=True)
+
+    with st.expander("📂 Projects Guide"):
+        st.markdown("""
+            ### Project Management
+            
+            #### Creating Projects
+            1. Navigate to the Projects page
+            2. Click "Add New Project"
+            3. Fill in project details:
+            - Name (required)
+            - Description
+            - Start/End Dates
+            - Budget (optional)
+            
+            #### Managing Projects
+            - **View Projects**: See all projects in card view or list format
+            - **Edit Projects**: Click the edit button on any project card
+            - **Delete Projects**: Remove projects (admin-only feature)
+            
+            #### Best Practices
+            - Set clear project names and descriptions
+            - Establish realistic timelines
+            - Assign team members early
+            """)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.image("https://via.placeholder.com/400x250?text=Project+Creation", 
+                    caption="Creating a New Project", use_container_width=True)
+        with col2:
+            st.image("https://via.placeholder.com/400x250?text=Project+View", 
+                    caption="Project Management View", use_container_width=True)
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 30px;'></div>", unsafe_allow_html=True)
+
+    with st.expander("✅ Tasks Guide"):
+        st.markdown("""
+            ### Task Management
+            
+            #### Creating Tasks
+            1. Select a project from the dropdown
+            2. Click "Add New Task"
+            3. Provide task details:
+            - Title (required)
+            - Detailed description
+            - Priority level
+            - Deadline
+            - Assignee
+            
+            #### Task Features
+            - **Status Tracking**: Update task progress (Pending/In Progress/Completed)
+            - **Priority Levels**: Visual indicators for task urgency
+            - **Overdue Alerts**: Automatic highlighting of late tasks
+            
+            #### Productivity Tips
+            - Break large tasks into subtasks
+            - Use priorities effectively
+            - Regularly update task statuses
+            """)
+
+
+        st.markdown("""
+            ### Subtask Management
+            
+            #### Creating Subtasks
+            1. Select a task from the task list
+            2. Click "Add Subtask"
+            3. Provide subtask details:
+            - Title (required)
+            - Detailed description (optional)
+            - Deadline (optional, inherited from parent task if not set)
+            - Assignee
+            
+            #### Subtask Features
+            - **Hierarchical View**: Subtasks appear nested under their parent task
+            - **Status Tracking**: Track subtask progress independently
+            - **Progress Roll-up**:  Parent task progress reflects subtask completion
+            
+            #### Productivity Tips
+            - Use subtasks to break complex tasks into smaller, manageable steps
+            - Assign subtasks to different team members for parallel progress
+            - Keep subtask deadlines aligned with the parent task timeline
+            """)
+
+
+        st.image("https://via.placeholder.com/800x300?text=Task+Management+Screenshot", 
+                caption="Task Management Interface", use_container_width=True)
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 30px;'></div>", unsafe_allow_html=True)
+
+
+    # Workspace Guide
+    with st.expander("🖥️ Workspace Guide"):
+        st.markdown("""
+            ### Workspace Overview
+            
+            #### Key Features
+            - **Task Management**: Manage tasks in List, Kanban, or Gantt views
+            - **Task Progress**: Monitor completion rates with metrics and pie charts
+            - **Team Management**: TView and manage project members
+            
+            #### Sections Explained
+            1. **Select Workspace**
+            - Choose a project from the dropdown to access its workspace
+            - The list includes all projects you have access to, with project owners highlighted
+            - Only admins and owners can modify project settings           
+            
+            2. **Tabs Overview**
+                        
+            a. 📋 Tasks
+            - Manage tasks in List, Kanban, or Gantt views
+            - Create, edit, and track progress with deadlines, priorities, and assignments
+            - Owners and assignees can update task statuses
+
+            b. 📋 Subtasks
+            - Break tasks into smaller actionable items
+            - Set individual deadlines and assignees for each subtask
+            - Track subtask status independently from the main task
+            - View subtasks nested under their parent task for clarity                                                
+         
+            c. 📂 Files
+            - Upload, share, and organize project files (PDF, DOCX, etc.)
+            - Files can be linked to specific tasks or the overall project
+            - Download or delete files with appropriate permissions
+                        
+            d. 💬 Discussions
+            - Start topic-based conversations with threaded replies
+            - Archive resolved discussions to keep the workspace clutter-free
+            - Search by keywords to find past messages
+
+            e. 📅 Timeline
+            - Visualize task deadlines and dependencies in an interactive Gantt chart
+            - The "Today" marker helps track progress against schedules
+
+            f. 📊 Progress
+            - Monitor completion rates with metrics and pie charts
+            - Automatically updates based on task status (e.g., "Completed" vs. "Pending")
+                              
+            g. 👥 Team
+            - View and manage project members
+            - Owners/admins can add or remove users                           
+            - Roles and contact details are displayed for coordination
+                        
+            #### Export Options
+            - Download any chart as PNG
+            - Export all data as CSV
+            - Print reports directly from the dashboard
+            """)
+
+        st.image("https://via.placeholder.com/800x400?text=Dashboard+Screenshot", 
+                caption="Dashboard Overview", use_container_width=True)
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 30px;'></div>", unsafe_allow_html=True)
+
+    with st.expander("🔔 Notifications Guide"):
+        st.markdown("""
+            ### Notification System
+            
+            #### Alert Types
+            - **Overdue Tasks**: Highlighted in red with warning icons
+            - **Upcoming Deadlines**: Shown with amber indicators
+            - **Status Changes**: Notifications when tasks are updated
+            
+            #### Management Features
+            - **Custom Reminders**: Set notification preferences
+            - **Filter Options**: View by project or priority
+            - **Quick Actions**: Mark as complete directly from alerts
+            
+            #### Best Practices
+            - Review notifications daily
+            - Set up email reminders for critical tasks
+            - Use the snooze feature for temporary delays
+            """)
+
+        st.image("https://via.placeholder.com/600x300?text=Notifications+Screenshot", 
+                caption="Notifications Interface", use_container_width=True)
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 30px;'></div>", unsafe_allow_html=True)
+
+    with st.expander("👤 Profile Guide"):
+        st.markdown("""
+            ### Profile Management
+            
+            #### Personal Information
+            - Update your contact details
+            - Upload a profile picture
+            - Change password
+            
+            #### Preferences
+            - Set notification preferences
+            - Choose default views
+            - Configure display settings
+            
+            #### Security
+            - Two-factor authentication
+            - Login history
+            - Connected devices
+            """)
+
+        st.image("https://via.placeholder.com/600x300?text=Profile+Settings+Screenshot", 
+                caption="Profile Management", use_container_width=True)
+
+    # Divider with extra spacing before admin section
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 40px;'></div>", unsafe_allow_html=True)
+
+    if st.session_state.user_role == "Admin":
+        with st.expander("👑 Admin Guide", expanded=False):
+            st.markdown("""
+                ### Administrator Tools
+                
+                #### User Management
+                - Create/edit user accounts
+                - Assign roles and permissions
+                - Reset passwords
+                
+                #### System Configuration
+                - Configure application settings
+                - Set up organization defaults
+                - Manage integrations
+                
+                #### Data Administration
+                - Backup and restore data
+                - Audit logs
+                - System health monitoring
+                """)
+
+            st.image("https://via.placeholder.com/600x300?text=Admin+Panel+Screenshot", 
+                    caption="Admin Dashboard", use_container_width=True)
+
+        # Divider with spacing
+        st.markdown("---")
+        st.markdown("<div style='margin-bottom: 30px;'></div>", unsafe_allow_html=True)
+
+    # Footer with contact information
+    st.markdown("""
+        <div style="text-align:center;color:#666;font-size:14px;margin-top:50px;">
+            <p>Need additional help? Contact our support team at support@projectapp.com</p>
+            <p>© 2023 Project Management App. All rights reserved.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Final divider
+    st.markdown("---")
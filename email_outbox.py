@@ -0,0 +1,252 @@
+# email_outbox.py
+"""Persistent outbox for notification emails.
+
+Pages call enqueue_email(), which is a single INSERT, and return straight away. A
+background worker thread claims due messages, folds several pending notifications for
+the same recipient into one digest, and sends the batch over a single SMTP connection.
+Failed sends are retried with exponential backoff until MAX_ATTEMPTS.
+
+The worker only needs `host`/`port` for a plain SMTP server, so it can be pointed at
+a local stand-in (e.g. `python -m aiosmtpd -n -l localhost:8025`) with
+`starttls = false` and no credentials.
+"""
+import logging
+import smtplib
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from html import escape
+
+from database import after_commit, get_pool, retry_on_locked, run_query
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 6
+RETRY_BASE_DELAY = 30       # seconds; doubles with each failed attempt
+DIGEST_DELAY = 15           # seconds a message waits so others for the same recipient can join it
+POLL_INTERVAL = 5           # seconds between outbox checks when idle
+BATCH_SIZE = 50
+STALE_CLAIM_AFTER = 600     # seconds before a 'sending' row from a dead worker is retried
+
+
+def enqueue_email(recipient, subject, html_body, cc=None, digest=True, delay=None):
+    """Queue a message for the background worker; returns immediately.
+
+    With digest=True the message is held for DIGEST_DELAY seconds and may be merged
+    with other queued notifications for the same recipient.
+    """
+    if not recipient or "@" not in recipient:
+        logger.warning("Not queueing email with invalid recipient %r", recipient)
+        return False
+    wait = (DIGEST_DELAY if digest else 0) if delay is None else delay
+    run_query("""
+        INSERT INTO email_outbox (recipient, cc, subject, html_body, digest, status, attempts,
+                                  next_attempt_at, created_at)
+        VALUES (?, ?, ?, ?, ?, 'pending', 0, ?, datetime('now'))
+    """, (recipient, cc, subject, html_body, int(bool(digest)), time.time() + wait))
+    # Inside a transaction the row only becomes visible to the worker on commit
+    after_commit(_wake.set)
+    return True
+
+
+def _claim_due_messages(limit):
+    """Atomically mark due messages as 'sending' and return them"""
+    def claim():
+        with get_pool().connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                # Due messages, plus not-yet-due digest messages for the same recipients
+                rows = conn.execute("""
+                    SELECT id, recipient, cc, subject, html_body, digest, attempts
+                    FROM email_outbox
+                    WHERE status = 'pending' AND (
+                        next_attempt_at <= ?
+                        OR (digest = 1 AND attempts = 0 AND recipient IN (
+                            SELECT recipient FROM email_outbox
+                            WHERE status = 'pending' AND digest = 1 AND next_attempt_at <= ?
+                        ))
+                    )
+                    ORDER BY id
+                    LIMIT ?
+                """, (now, now, limit)).fetchall()
+                if rows:
+                    conn.executemany("UPDATE email_outbox SET status='sending', claimed_at=? WHERE id=?",
+                                     [(now, row[0]) for row in rows])
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            return rows
+    return retry_on_locked(claim)
+
+
+def _group_messages(rows):
+    """One outgoing email per recipient/cc pair for digestible messages, one per message otherwise"""
+    groups = {}
+    outgoing = []
+    for row in rows:
+        if row[5]:
+            groups.setdefault((row[1], row[2]), []).append(row)
+        else:
+            outgoing.append([row])
+    outgoing.extend(groups.values())
+    return outgoing
+
+
+def _build_message(sender, group):
+    _, recipient, cc, subject, html_body, _, _ = group[0]
+    msg = MIMEMultipart()
+    msg['From'] = sender
+    msg['To'] = recipient
+    if cc:
+        msg['Cc'] = cc
+    if len(group) == 1:
+        msg['Subject'] = subject
+        msg.attach(MIMEText(html_body, 'html'))
+        return msg
+
+    msg['Subject'] = f"{len(group)} new notifications"
+    sections = "".join(
+        f"<h3>{escape(row[3])}</h3>{row[4]}<hr>" for row in group
+    )
+    msg.attach(MIMEText(f"<html><body><h2>You have {len(group)} new notifications</h2>{sections}</body></html>", 'html'))
+    return msg
+
+
+def _mark_sent(ids):
+    run_query(f"""
+        UPDATE email_outbox SET status='sent', sent_at=datetime('now'), last_error=NULL
+        WHERE id IN ({','.join('?' * len(ids))})
+    """, tuple(ids))
+
+
+def _mark_failed(group, error):
+    for row in group:
+        attempts = row[6] + 1
+        if attempts >= MAX_ATTEMPTS:
+            run_query("UPDATE email_outbox SET status='failed', attempts=?, last_error=? WHERE id=?",
+                      (attempts, str(error), row[0]))
+        else:
+            next_attempt = time.time() + RETRY_BASE_DELAY * (2 ** (attempts - 1))
+            run_query("""
+                UPDATE email_outbox SET status='pending', attempts=?, last_error=?, next_attempt_at=?
+                WHERE id=?
+            """, (attempts, str(error), next_attempt, row[0]))
+
+
+def _release_claims(ids):
+    """Put claimed messages that were neither sent nor failed back in the queue"""
+    run_query(f"""
+        UPDATE email_outbox SET status='pending'
+        WHERE status='sending' AND id IN ({','.join('?' * len(ids))})
+    """, tuple(ids))
+
+
+class OutboxWorker(threading.Thread):
+    """Daemon thread that drains the outbox over one reusable SMTP connection"""
+
+    def __init__(self, host="smtp.gmail.com", port=587, user=None, password=None, starttls=True,
+                 sender=None, timeout=30, smtp_factory=smtplib.SMTP):
+        super().__init__(name="email-outbox", daemon=True)
+        self.host = host
+        self.port = int(port)
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.sender = sender or user or "noreply@localhost"
+        self.timeout = timeout
+        self.smtp_factory = smtp_factory
+        self._stop_event = threading.Event()
+        self._smtp = None
+
+    def _connection(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.noop()
+                return self._smtp
+            except (smtplib.SMTPException, OSError):
+                self._close()
+        smtp = self.smtp_factory(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            smtp.starttls()
+        if self.user and self.password:
+            smtp.login(self.user, self.password)
+        self._smtp = smtp
+        return smtp
+
+    def _close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+    def process_once(self):
+        """Send everything currently due; returns the number of outbox rows handled"""
+        rows = _claim_due_messages(BATCH_SIZE)
+        unsettled = {row[0] for row in rows}
+        try:
+            for group in _group_messages(rows):
+                try:
+                    self._connection().send_message(_build_message(self.sender, group))
+                    _mark_sent([row[0] for row in group])
+                except (smtplib.SMTPException, OSError) as e:
+                    logger.warning("Email to %s failed: %s", group[0][1], e)
+                    self._close()
+                    _mark_failed(group, e)
+                except Exception as e:
+                    # e.g. a header the email package rejects; retried like a send failure
+                    logger.exception("Email to %s could not be sent", group[0][1])
+                    self._close()
+                    _mark_failed(group, e)
+                unsettled.difference_update(row[0] for row in group)
+        finally:
+            # Don't leave the rest of the batch claimed until the next restart
+            if unsettled:
+                _release_claims(sorted(unsettled))
+        return len(rows)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                handled = self.process_once()
+            except Exception:
+                logger.exception("Email outbox worker error")
+                handled = 0
+            if not handled:
+                self._close()  # don't hold the SMTP session open while idle
+                _wake.wait(POLL_INTERVAL)
+                _wake.clear()
+
+    def stop(self):
+        self._stop_event.set()
+        _wake.set()
+
+
+_wake = threading.Event()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def start_outbox_worker(email_settings):
+    """Start the process-wide worker once, from the [email] secrets section"""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            settings = dict(email_settings)
+            _worker = OutboxWorker(
+                host=settings.get("server", "smtp.gmail.com"),
+                port=settings.get("port", 587),
+                user=settings.get("user"),
+                password=settings.get("password"),
+                starttls=settings.get("starttls", True),
+                sender=settings.get("sender"),
+            )
+            # Messages claimed by a worker that died mid-send go back in the queue
+            run_query("UPDATE email_outbox SET status='pending' WHERE status='sending' AND claimed_at < ?",
+                      (time.time() - STALE_CLAIM_AFTER,))
+            _worker.start()
+    return _worker
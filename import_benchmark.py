@@ -0,0 +1,97 @@
+# import_benchmark.py
+"""Import-time benchmark for app.py's startup imports.
+
+Reads the module-level imports of app.py, imports them in a fresh interpreter under
+`python -X importtime` and reports the slowest. The run fails (exit status 1) in two
+cases. One is any page module or page_router.LAZY_MODULES entry being loaded at
+startup, which is the regression this guards against. The other is the total going
+over --budget-ms.
+
+    python import_benchmark.py                   # report
+    python import_benchmark.py --budget-ms 1500  # and fail above 1.5 s
+"""
+import argparse
+import ast
+import subprocess
+import sys
+
+from page_router import LAZY_MODULES, PAGE_MODULES
+
+
+def startup_imports(path="app.py"):
+    """Top-level module names app.py imports unconditionally, in order"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            if name not in modules:
+                modules.append(name)
+    return modules
+
+
+def measure(modules):
+    """{module: (cumulative microseconds, imported directly)} for every module `modules` load"""
+    code = "; ".join(f"import {name}" for name in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            # Nested imports are indented under the module that triggered them
+            top_level = not name[1:].startswith(" ")
+            timings[name.strip()] = (int(cumulative), top_level)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the import time of app.py's startup imports")
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters; the fastest run counts")
+    parser.add_argument("--budget-ms", type=float, help="fail if the startup imports take longer")
+    parser.add_argument("--top", type=int, default=15)
+    options = parser.parse_args()
+
+    modules = startup_imports(options.app)
+    try:
+        # What a bare interpreter loads anyway (site, encodings...) is not the app's cost
+        baseline = measure([])
+        runs = [measure(modules) for _ in range(max(options.runs, 1))]
+    except RuntimeError as e:
+        print(f"Importing the startup modules failed: {e}")
+        return 2
+    runs = [{name: timing for name, timing in run.items() if name not in baseline} for run in runs]
+
+    totals = [sum(us for us, top_level in run.values() if top_level) for run in runs]
+    best = runs[totals.index(min(totals))]
+    top = sorted(((us, name) for name, (us, top_level) in best.items() if top_level), reverse=True)
+    for us, name in top[:options.top]:
+        print(f"{us / 1000:9.1f} ms  {name}")
+    total_ms = min(totals) / 1000
+    print(f"{total_ms:9.1f} ms  total ({len(modules)} startup imports)")
+
+    lazy = {module for module, _ in PAGE_MODULES.values()} | set(LAZY_MODULES)
+    eager = sorted(name for name in best if name.split(".")[0] in lazy)
+    failed = False
+    if eager:
+        print(f"FAIL: lazily loaded modules imported at startup: {', '.join(eager)}")
+        failed = True
+    if options.budget_ms is not None and total_ms > options.budget_ms:
+        print(f"FAIL: {total_ms:.1f} ms is over the {options.budget_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# indexes.py
+"""Managed secondary indexes and an EXPLAIN QUERY PLAN check for the hot query paths.
+
+Run `python indexes.py` against a database to see which of the page queries below
+still fall back to a full table scan.
+"""
+import sys
+
+# name -> table(columns). Each group is created by the migration that introduced it, so
+# adding indexes means a new group plus a new migration that passes it to ensure_indexes().
+HOT_PATH_INDEXES = {
+    'idx_projects_user_id': 'projects(user_id)',
+    'idx_project_team_user_id': 'project_team(user_id)',
+    'idx_tasks_project_id': 'tasks(project_id)',
+    'idx_tasks_assigned_to': 'tasks(assigned_to)',
+    'idx_tasks_status_deadline': 'tasks(status, deadline)',
+    'idx_tasks_deadline': 'tasks(deadline)',
+    'idx_subtasks_task_id': 'subtasks(task_id)',
+    'idx_subtasks_assigned_to': 'subtasks(assigned_to)',
+    'idx_task_dependencies_task_id': 'task_dependencies(task_id)',
+    'idx_task_dependencies_depends_on': 'task_dependencies(depends_on_task_id)',
+    'idx_comments_task_id': 'comments(task_id)',
+    'idx_attachments_project_id': 'attachments(project_id, task_id)',
+    'idx_attachments_task_id': 'attachments(task_id)',
+    'idx_discussion_topics_project_id': 'discussion_topics(project_id)',
+    'idx_discussion_messages_topic_id': 'discussion_messages(topic_id, created_at)',
+}
+
+BLOB_STORE_INDEXES = {
+    'idx_attachments_content_hash': 'attachments(content_hash)',
+}
+
+INDEXES = {**HOT_PATH_INDEXES, **BLOB_STORE_INDEXES}
+
+
+# Representative queries from the page modules: (label, sql, sample args)
+HOT_QUERIES = [
+    ("fetch_tasks by project", """
+        SELECT t.title, assignee.username, p.name, owner.username
+        FROM tasks t
+        LEFT JOIN users assignee ON t.assigned_to = assignee.id
+        LEFT JOIN projects p ON t.project_id = p.id
+        LEFT JOIN users owner ON p.user_id = owner.id
+        WHERE t.project_id = ?
+    """, (1,)),
+    ("tasks assigned to user", "SELECT * FROM tasks WHERE assigned_to=?", (1,)),
+    ("tasks by project and assignee", "SELECT * FROM tasks WHERE project_id=? AND assigned_to=?", (1, 1)),
+    ("dashboard overdue count", """
+        SELECT COUNT(*) FROM tasks
+        WHERE status != 'Completed' AND deadline < DATE('now')
+    """, ()),
+    ("dashboard upcoming count", """
+        SELECT COUNT(*) FROM tasks
+        WHERE status != 'Completed'
+        AND deadline BETWEEN DATE('now') AND DATE('now', '+' || ? || ' days')
+    """, (7,)),
+    ("dashboard completed count", "SELECT COUNT(*) FROM tasks WHERE status = 'Completed'", ()),
+    ("subtasks of task", "SELECT * FROM subtasks WHERE task_id = ?", (1,)),
+    ("subtasks of project", """
+        SELECT s.* FROM subtasks s
+        WHERE s.task_id IN (SELECT id FROM tasks WHERE project_id = ?)
+    """, (1,)),
+    ("task dependencies", "SELECT depends_on_task_id FROM task_dependencies WHERE task_id=?", (1,)),
+    ("dependants of task", "SELECT task_id FROM task_dependencies WHERE depends_on_task_id=?", (1,)),
+    ("comments of task", "SELECT * FROM comments WHERE task_id=?", (1,)),
+    ("project files", """
+        SELECT a.id, a.file_name, a.uploaded_at, u.username
+        FROM attachments a
+        JOIN users u ON a.uploaded_by = u.id
+        WHERE a.project_id = ? AND a.task_id IS NULL
+        ORDER BY a.uploaded_at DESC
+    """, (1,)),
+    ("task files", "SELECT id, file_name FROM attachments WHERE task_id = ?", (1,)),
+    ("blob references", "SELECT 1 FROM attachments WHERE content_hash=? LIMIT 1", ('0' * 64,)),
+    ("discussion topics", "SELECT * FROM discussion_topics WHERE project_id = ?", (1,)),
+    ("discussion messages", """
+        SELECT id, user_id, message, created_at FROM discussion_messages
+        WHERE topic_id = ? ORDER BY created_at
+    """, (1,)),
+    ("team projects of user", "SELECT project_id FROM project_team WHERE user_id = ?", (1,)),
+    ("projects owned by user", "SELECT * FROM projects WHERE user_id = ?", (1,)),
+]
+
+
+def ensure_indexes(c, indexes=None):
+    """Create any managed index that does not exist yet"""
+    for name, target in (indexes or INDEXES).items():
+        c.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def explain_query_plan(conn, query, args=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query"""
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", args).fetchall()]
+
+
+def full_scans(plan):
+    """Plan lines that read a whole table rather than searching an index"""
+    return [line for line in plan if line.startswith('SCAN') and 'USING' not in line]
+
+
+def check_hot_queries(conn, queries=None):
+    """Explain every hot query; returns (label, plan, full_scans) tuples"""
+    report = []
+    for label, query, args in (queries or HOT_QUERIES):
+        plan = explain_query_plan(conn, query, args)
+        report.append((label, plan, full_scans(plan)))
+    return report
+
+
+if __name__ == "__main__":
+    from database import get_pool
+
+    with get_pool().connection() as conn:
+        report = check_hot_queries(conn)
+    failures = 0
+    for label, plan, scans in report:
+        print(f"{'FULL SCAN' if scans else 'ok':<10} {label}")
+        for line in plan:
+            print(f"{'':<10}   {line}")
+        failures += bool(scans)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,221 @@
+# instrumentation.py
+"""Opt-in per-rerun instrumentation.
+
+While enabled, every rerun of app.py records a trace on its script thread:
+- the render_budget sections;
+- each query run_query executes, with its duration, row count and whether the query
+  cache answered it;
+- the query cache's hits and misses;
+- the time spent building Plotly figures (functions decorated with @timed_chart) and
+  serializing them (visualizations.plotly_chart).
+
+Finished traces are kept in memory, the last `keep_traces` reruns of the process. Each
+one exports as a JSON summary or in Chrome's trace-event format, which chrome://tracing
+and Perfetto open. This module needs nothing but the standard library, so database.py
+and query_cache.py can report to it. When instrumentation is off, each hook costs one
+thread-local lookup.
+
+    [instrumentation]
+    enabled = true
+    keep_traces = 20
+"""
+import functools
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+_settings = {"enabled": False, "max_events": 2000, "sql_chars": 300}
+
+_local = threading.local()
+_recent = deque(maxlen=20)
+_recent_lock = threading.Lock()
+
+
+def configure_instrumentation(enabled=False, keep_traces=20, max_events=2000, sql_chars=300):
+    """Apply the [instrumentation] settings; safe to call on every rerun"""
+    global _recent
+    _settings.update(enabled=bool(enabled), max_events=int(max_events), sql_chars=int(sql_chars))
+    if int(keep_traces) != _recent.maxlen:
+        with _recent_lock:
+            _recent = deque(_recent, maxlen=max(int(keep_traces), 1))
+
+
+class RerunTrace:
+    """Events recorded during one rerun. Times are perf_counter seconds."""
+
+    def __init__(self, label=""):
+        self.label = label
+        self.started = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc)
+        self.finished = None
+        self.thread_id = threading.get_ident()
+        self.events = []            # (category, name, start, duration, args)
+        self.dropped = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._charts = []           # serialize seconds of each open @timed_chart call
+
+    def add(self, category, name, start, duration, **args):
+        if len(self.events) >= _settings["max_events"]:
+            self.dropped += 1
+            return
+        self.events.append((category, name, start, duration, args))
+
+    def query(self, sql, start, duration, rows, cached):
+        self.add("query", "query", start, duration, sql=sql, rows=rows, cached=cached)
+
+    def cache_lookup(self, hit):
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+    def figure_serialized(self, name, start, duration):
+        if self._charts:
+            self._charts[-1] += duration
+        self.add("plotly", name, start, duration)
+
+    @contextmanager
+    def chart(self, name):
+        """Time a chart function; what its figures spend serializing is split out"""
+        self._charts.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            serialize = self._charts.pop()
+            if self._charts:
+                self._charts[-1] += serialize
+            self.add("chart", name, start, duration, build=duration - serialize, serialize=serialize)
+
+    @property
+    def total_seconds(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    # --- Export ---
+    def _ms(self, seconds):
+        return round(seconds * 1000, 3)
+
+    def _sql(self, sql):
+        sql = re.sub(r"\s+", " ", sql).strip()
+        limit = _settings["sql_chars"]
+        return sql if len(sql) <= limit else sql[:limit] + "…"
+
+    def summary(self):
+        """JSON-serializable report of the rerun"""
+        sections, queries, charts = [], [], []
+        for category, name, start, duration, args in self.events:
+            entry = {"name": name, "start_ms": self._ms(start - self.started), "duration_ms": self._ms(duration)}
+            if category == "section":
+                sections.append(entry)
+            elif category == "query":
+                queries.append({"sql": self._sql(args["sql"]), "start_ms": entry["start_ms"],
+                                "duration_ms": entry["duration_ms"], "rows": args["rows"],
+                                "cached": args["cached"]})
+            elif category == "chart":
+                charts.append(dict(entry, build_ms=self._ms(args["build"]),
+                                   serialize_ms=self._ms(args["serialize"])))
+            elif category == "plotly":
+                charts.append(dict(entry, build_ms=None, serialize_ms=entry["duration_ms"]))
+        return {
+            "label": self.label,
+            "started_at": self.started_at.isoformat(),
+            "total_ms": self._ms(self.total_seconds),
+            "sections": sections,
+            "queries": {
+                "count": len(queries),
+                "total_ms": round(sum(q["duration_ms"] for q in queries), 3),
+                "items": queries,
+            },
+            "cache": {"hits": self.cache_hits, "misses": self.cache_misses},
+            "charts": sorted(charts, key=lambda chart: chart["start_ms"]),
+            "dropped_events": self.dropped,
+        }
+
+    def chrome_events(self, origin=None, tid=None):
+        """Complete ("X") trace events, timestamps in microseconds from `origin`"""
+        origin = self.started if origin is None else origin
+        tid = self.thread_id if tid is None else tid
+        pid = os.getpid()
+        events = [{
+            "name": f"Rerun {self.label}".strip(), "cat": "rerun", "ph": "X", "pid": pid, "tid": tid,
+            "ts": round((self.started - origin) * 1e6), "dur": round(self.total_seconds * 1e6),
+            "args": {"cache_hits": self.cache_hits, "cache_misses": self.cache_misses},
+        }]
+        for category, name, start, duration, args in self.events:
+            if category == "query":
+                name, args = self._sql(args["sql"]), {"rows": args["rows"], "cached": args["cached"]}
+            elif category == "chart":
+                args = {"build_ms": self._ms(args["build"]), "serialize_ms": self._ms(args["serialize"])}
+            events.append({"name": name, "cat": category, "ph": "X", "pid": pid, "tid": tid,
+                           "ts": round((start - origin) * 1e6), "dur": round(duration * 1e6),
+                           "args": args})
+        return events
+
+
+def chrome_trace(traces):
+    """Chrome trace-event document for one or more traces, one row per rerun"""
+    traces = list(traces)
+    origin = min((trace.started for trace in traces), default=0)
+    events = []
+    for row, trace in enumerate(traces, start=1):
+        events.extend(trace.chrome_events(origin, tid=row))
+        events.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": row,
+                       "args": {"name": f"{trace.started_at:%H:%M:%S} {trace.label}".strip()}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+# --- Per-rerun lifecycle ---
+def start_trace(label=""):
+    """Begin recording this thread's rerun; a no-op while instrumentation is off"""
+    _local.trace = RerunTrace(label) if _settings["enabled"] else None
+    _local.last = None
+    return _local.trace
+
+
+def active_trace():
+    """The trace being recorded on this thread, or None"""
+    return getattr(_local, "trace", None)
+
+
+def finish_trace(label=None):
+    """Stop recording, keep the trace among the recent ones and return it"""
+    trace = active_trace()
+    if trace is None:
+        return None
+    _local.trace = None
+    trace.finished = time.perf_counter()
+    if label is not None:
+        trace.label = label
+    _local.last = trace
+    with _recent_lock:
+        _recent.append(trace)
+    return trace
+
+
+def last_trace():
+    """The trace this thread finished last"""
+    return getattr(_local, "last", None)
+
+
+def recent_traces():
+    """Finished traces from every session, oldest first"""
+    with _recent_lock:
+        return list(_recent)
+
+
+def timed_chart(func):
+    """Record a chart-building function's build and serialize time in the active trace"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        trace = active_trace()
+        if trace is None:
+            return func(*args, **kwargs)
+        with trace.chart(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
@@ -1,12 +1,14 @@
 import streamlit as st
-import sqlite3
 import hashlib
 import base64  # Add to imports at top
 from PIL import Image  # Add this import for handling images
+from database import get_pool
+from query_cache import get_cache
 
 # --- DB Helpers ---
 def get_connection():
-    return sqlite3.connect("project_management.db", check_same_thread=False)
+    """Borrow a pooled connection; use as `with get_connection() as conn:`"""
+    return get_pool().connection()
 
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
@@ -16,25 +18,23 @@ def verify_password(stored_password, provided_password):
 
 @st.cache_data(show_spinner=False)
 def get_user(username):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT id, username, password, role FROM users WHERE username=?", (username,))
-    user = cur.fetchone()
-    conn.close()
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id, username, password, role FROM users WHERE username=?", (username,))
+        user = cur.fetchone()
     return user
 
 # --- Registration Helper ---
 def register_user(username, password):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT id FROM users WHERE username=?", (username,))
-    if cur.fetchone():
-        conn.close()
-        return False, "Username already exists"
-    hashed_pw = hash_password(password)
-    cur.execute("INSERT INTO users (username, password, role) VALUES (?, ?, 'User')", (username, hashed_pw))
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id FROM users WHERE username=?", (username,))
+        if cur.fetchone():
+            return False, "Username already exists"
+        hashed_pw = hash_password(password)
+        cur.execute("INSERT INTO users (username, password, role) VALUES (?, ?, 'User')", (username, hashed_pw))
+        conn.commit()
+    get_cache().invalidate_tables('users')
     return True, "User registered successfully"
 
 # --- Combined Login/Register UI ---
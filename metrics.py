@@ -0,0 +1,224 @@
+# metrics.py
+"""KPI counts for the Dashboard and Admin overview cards.
+
+All project, task and user cards come from a single aggregate statement that returns
+one row, instead of one query per card with the matching rows pulled into Python and
+counted with len().
+
+With `[metrics] counters = true` the database also keeps small counter tables up to
+date with triggers (rows per status, open tasks per project and per deadline). The
+dashboard then reads those instead of scanning tasks - worth it once tasks run into
+the hundreds of thousands, at the price of a few extra writes per task change.
+"""
+import threading
+
+from database import get_pool, run_query
+from query_cache import get_cache
+from task_status import overdue_sql, status_window, upcoming_sql
+
+COUNTER_TABLES = {
+    'metric_row_counts': """
+        CREATE TABLE IF NOT EXISTS metric_row_counts (
+            table_name TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL
+        )""",
+    'metric_task_status_counts': """
+        CREATE TABLE IF NOT EXISTS metric_task_status_counts (
+            status TEXT PRIMARY KEY,
+            task_count INTEGER NOT NULL
+        )""",
+    'metric_project_open_tasks': """
+        CREATE TABLE IF NOT EXISTS metric_project_open_tasks (
+            project_id INTEGER PRIMARY KEY,
+            open_tasks INTEGER NOT NULL
+        )""",
+    # Open (not Completed) tasks per deadline; '' stands for "no deadline"
+    'metric_open_task_deadlines': """
+        CREATE TABLE IF NOT EXISTS metric_open_task_deadlines (
+            deadline TEXT PRIMARY KEY,
+            open_tasks INTEGER NOT NULL
+        )""",
+}
+
+_BACKFILL = [
+    "DELETE FROM metric_row_counts",
+    "INSERT INTO metric_row_counts SELECT 'users', COUNT(*) FROM users",
+    "INSERT INTO metric_row_counts SELECT 'projects', COUNT(*) FROM projects",
+    "DELETE FROM metric_task_status_counts",
+    """INSERT INTO metric_task_status_counts
+       SELECT COALESCE(status, ''), COUNT(*) FROM tasks GROUP BY COALESCE(status, '')""",
+    "DELETE FROM metric_project_open_tasks",
+    """INSERT INTO metric_project_open_tasks
+       SELECT project_id, COUNT(*) FROM tasks
+       WHERE status != 'Completed' AND project_id IS NOT NULL GROUP BY project_id""",
+    "DELETE FROM metric_open_task_deadlines",
+    """INSERT INTO metric_open_task_deadlines
+       SELECT COALESCE(deadline, ''), COUNT(*) FROM tasks
+       WHERE status != 'Completed' GROUP BY COALESCE(deadline, '')""",
+]
+
+
+def _task_delta(row, sign):
+    """Trigger statements applying one task row (NEW or OLD) to the counters"""
+    open_row = f"{row}.status != 'Completed'"
+    statements = []
+    if sign > 0:
+        statements += [
+            f"INSERT OR IGNORE INTO metric_task_status_counts VALUES (COALESCE({row}.status, ''), 0);",
+            f"INSERT OR IGNORE INTO metric_project_open_tasks "
+            f"SELECT {row}.project_id, 0 WHERE {open_row} AND {row}.project_id IS NOT NULL;",
+            f"INSERT OR IGNORE INTO metric_open_task_deadlines "
+            f"SELECT COALESCE({row}.deadline, ''), 0 WHERE {open_row};",
+        ]
+    statements += [
+        f"UPDATE metric_task_status_counts SET task_count = task_count + ({sign}) "
+        f"WHERE status = COALESCE({row}.status, '');",
+        f"UPDATE metric_project_open_tasks SET open_tasks = open_tasks + ({sign}) "
+        f"WHERE project_id = {row}.project_id AND {open_row};",
+        f"UPDATE metric_open_task_deadlines SET open_tasks = open_tasks + ({sign}) "
+        f"WHERE deadline = COALESCE({row}.deadline, '') AND {open_row};",
+    ]
+    return "\n".join(statements)
+
+
+def _row_count_delta(table, sign):
+    return (f"UPDATE metric_row_counts SET row_count = row_count + ({sign}) "
+            f"WHERE table_name = '{table}';")
+
+
+COUNTER_TRIGGERS = {
+    'metric_tasks_insert': f"AFTER INSERT ON tasks BEGIN {_task_delta('NEW', 1)} END",
+    'metric_tasks_delete': f"AFTER DELETE ON tasks BEGIN {_task_delta('OLD', -1)} END",
+    'metric_tasks_update': (f"AFTER UPDATE OF status, project_id, deadline ON tasks BEGIN "
+                            f"{_task_delta('OLD', -1)} {_task_delta('NEW', 1)} END"),
+    'metric_users_insert': f"AFTER INSERT ON users BEGIN {_row_count_delta('users', 1)} END",
+    'metric_users_delete': f"AFTER DELETE ON users BEGIN {_row_count_delta('users', -1)} END",
+    'metric_projects_insert': f"AFTER INSERT ON projects BEGIN {_row_count_delta('projects', 1)} END",
+    'metric_projects_delete': f"AFTER DELETE ON projects BEGIN {_row_count_delta('projects', -1)} END",
+}
+
+# Writes to these tables change the counters through the triggers above
+_cache = get_cache()
+_cache.add_dependency('tasks', 'metric_task_status_counts', 'metric_project_open_tasks',
+                      'metric_open_task_deadlines')
+_cache.add_dependency('users', 'metric_row_counts')
+_cache.add_dependency('projects', 'metric_row_counts')
+
+_use_counters = False
+_configure_lock = threading.Lock()
+
+
+# --- Counter maintenance ---
+def counters_installed(conn):
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='metric_tasks_insert'").fetchone()
+    return row is not None
+
+
+def enable_metric_counters(conn):
+    """Create the counter tables and triggers and fill them from the current data"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for ddl in COUNTER_TABLES.values():
+            conn.execute(ddl)
+        for name, body in COUNTER_TRIGGERS.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        for statement in _BACKFILL:
+            conn.execute(statement)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    get_cache().invalidate_tables(*COUNTER_TABLES)
+
+
+def disable_metric_counters(conn):
+    """Drop the triggers and counter tables so task writes carry no extra cost"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for name in COUNTER_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        for table in COUNTER_TABLES:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    get_cache().invalidate_tables(*COUNTER_TABLES)
+
+
+def configure_metrics(counters=False):
+    """Install or remove the counters to match the setting; safe to call on every rerun"""
+    global _use_counters
+    counters = bool(counters)
+    with _configure_lock:
+        with get_pool().connection() as conn:
+            if counters_installed(conn) != counters:
+                (enable_metric_counters if counters else disable_metric_counters)(conn)
+        _use_counters = counters
+
+
+# --- Dashboard queries ---
+_SCAN_METRICS = f"""
+    WITH open_by_project AS (
+        SELECT project_id, COUNT(*) AS open_tasks FROM tasks
+        WHERE status != 'Completed' GROUP BY project_id
+    )
+    SELECT pr.total, pr.active, pr.overdue, pr.completed,
+           tk.total, tk.overdue, tk.upcoming, tk.completed,
+           (SELECT COUNT(*) FROM users)
+    FROM (
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM(p.end_date >= ?), 0) AS active,
+               COALESCE(SUM(p.end_date < ? AND o.open_tasks IS NOT NULL), 0) AS overdue,
+               COALESCE(SUM(o.open_tasks IS NULL), 0) AS completed
+        FROM projects p LEFT JOIN open_by_project o ON o.project_id = p.id
+    ) pr, (
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM({overdue_sql('t')}), 0) AS overdue,
+               COALESCE(SUM({upcoming_sql('t')}), 0) AS upcoming,
+               COALESCE(SUM(t.status = 'Completed'), 0) AS completed
+        FROM tasks t
+    ) tk
+"""
+
+_COUNTER_METRICS = """
+    SELECT pr.total,
+           (SELECT COUNT(*) FROM projects WHERE end_date >= ?),
+           (SELECT COUNT(*) FROM projects p JOIN metric_project_open_tasks o ON o.project_id = p.id
+            WHERE o.open_tasks > 0 AND p.end_date < ?),
+           pr.total - (SELECT COUNT(*) FROM projects p JOIN metric_project_open_tasks o ON o.project_id = p.id
+                       WHERE o.open_tasks > 0),
+           (SELECT COALESCE(SUM(task_count), 0) FROM metric_task_status_counts),
+           (SELECT COALESCE(SUM(open_tasks), 0) FROM metric_open_task_deadlines
+            WHERE deadline != '' AND deadline < ?),
+           (SELECT COALESCE(SUM(open_tasks), 0) FROM metric_open_task_deadlines
+            WHERE deadline BETWEEN ? AND ?),
+           (SELECT COALESCE(SUM(task_count), 0) FROM metric_task_status_counts WHERE status = 'Completed'),
+           (SELECT row_count FROM metric_row_counts WHERE table_name = 'users')
+    FROM (SELECT row_count AS total FROM metric_row_counts WHERE table_name = 'projects') pr
+"""
+
+METRIC_NAMES = (
+    'total_projects', 'active_projects', 'overdue_projects', 'completed_projects',
+    'total_tasks', 'overdue_tasks', 'upcoming_tasks', 'completed_tasks',
+    'total_users',
+)
+
+
+def get_dashboard_metrics(reminder_days=7, today=None):
+    """Every KPI card value in one query, as a dict keyed by METRIC_NAMES"""
+    today, horizon = status_window(reminder_days, today)
+    query = _COUNTER_METRICS if _use_counters else _SCAN_METRICS
+    row = run_query(query, (today, today, today, today, horizon), one=True)
+    return dict(zip(METRIC_NAMES, row))
+
+
+def get_user_metrics():
+    """(total, active in the last 7 days, admins) for the user overview cards"""
+    return run_query("""
+        SELECT COUNT(*),
+               COALESCE(SUM(last_login IS NOT NULL AND last_login != 'Never'
+                            AND datetime(last_login) > datetime('now', '-7 days')), 0),
+               COALESCE(SUM(role = 'Admin'), 0)
+        FROM users
+    """, one=True)
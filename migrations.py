@@ -0,0 +1,377 @@
+# migrations.py
+"""Numbered schema migrations.
+
+The schema version lives in SQLite's `PRAGMA user_version`, so once the database is
+current a rerun costs a single version check. To change the schema, append a new
+function to MIGRATIONS - never edit one that has already shipped.
+"""
+import logging
+
+from discussions import install_discussion_counters
+from indexes import BLOB_STORE_INDEXES, HOT_PATH_INDEXES, ensure_indexes
+from search_index import install_search_index
+from task_rollups import install_subtask_status_counters
+
+logger = logging.getLogger(__name__)
+
+
+# Helpers
+def _column_types(c, table):
+    c.execute(f"PRAGMA table_info({table})")
+    return {column[1]: column[2] for column in c.fetchall()}
+
+
+def _add_missing_columns(c, table, columns):
+    """Add each (name, declaration) pair the table does not have yet"""
+    existing = _column_types(c, table)
+    for column_name, column_type in columns.items():
+        if column_name not in existing:
+            c.execute(f"ALTER TABLE {table} ADD COLUMN {column_name} {column_type}")
+
+
+def _rebuild_table(c, table, create_sql):
+    """Recreate a table from create_sql (which must create `{table}_new`) and copy the rows over"""
+    old_columns = _column_types(c, table)
+    c.execute(f"DROP TABLE IF EXISTS {table}_new")
+    c.execute(create_sql)
+    new_columns = _column_types(c, f"{table}_new")
+    shared = ", ".join(name for name in new_columns if name in old_columns)
+    c.execute(f"INSERT INTO {table}_new ({shared}) SELECT {shared} FROM {table}")
+    c.execute(f"DROP TABLE {table}")
+    c.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+
+USERS_DDL = '''
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL UNIQUE,
+        password TEXT NOT NULL,
+        role TEXT NOT NULL DEFAULT 'User',
+        first_name TEXT,
+        last_name TEXT,
+        company TEXT,
+        job_title TEXT,
+        department TEXT,
+        email TEXT,
+        phone TEXT,
+        profile_picture BLOB,
+        last_login TEXT,
+        login_count INTEGER DEFAULT 0,
+        is_active BOOLEAN DEFAULT 1
+    )
+'''
+
+ATTACHMENTS_DDL = '''
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id INTEGER,
+        file_name TEXT NOT NULL,
+        file_data BLOB NOT NULL,
+        project_id INTEGER,
+        uploaded_by INTEGER,
+        uploader_name TEXT,
+        uploaded_at TEXT,
+        file_size INTEGER,
+        FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE
+    )
+'''
+
+
+# Migrations
+def migration_001_baseline(c):
+    """Tables and columns that the original init_db created or patched in"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            name TEXT NOT NULL,
+            description TEXT,
+            start_date TEXT,
+            end_date TEXT,
+            budget REAL,
+            status TEXT DEFAULT 'Planning',
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    _add_missing_columns(c, 'projects', {
+        'budget': 'REAL',
+        'status': "TEXT DEFAULT 'Planning'",
+    })
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT DEFAULT 'Pending',
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            deadline TEXT,
+            time_spent INTEGER DEFAULT 0,
+            priority TEXT DEFAULT 'Medium',
+            recurrence TEXT,
+            assigned_to INTEGER,
+            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE,
+            FOREIGN KEY (assigned_to) REFERENCES users (id)
+        )
+    ''')
+    _add_missing_columns(c, 'tasks', {
+        'actual_time_spent': 'REAL',
+        'start_date': 'TEXT',
+        'actual_start_date': 'TEXT',
+        'actual_deadline': 'TEXT',
+        'budget': 'REAL',
+        'actual_cost': 'REAL',
+        'budget_variance': 'REAL',
+    })
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS task_dependencies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER,
+            depends_on_task_id INTEGER,
+            FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE,
+            FOREIGN KEY (depends_on_task_id) REFERENCES tasks (id)
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS comments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER,
+            user_id INTEGER,
+            comment TEXT NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS project_team (
+            project_id INTEGER,
+            user_id INTEGER,
+            FOREIGN KEY (project_id) REFERENCES projects(id),
+            FOREIGN KEY (user_id) REFERENCES users(id),
+            PRIMARY KEY (project_id, user_id)
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS subtasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER,
+            title TEXT NOT NULL,
+            status TEXT DEFAULT 'Pending',
+            FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE
+        )
+    ''')
+    _add_missing_columns(c, 'subtasks', {
+        'description': 'TEXT',
+        'start_date': 'TEXT',
+        'deadline': 'TEXT',
+        'priority': "TEXT DEFAULT 'Medium'",
+        'assigned_to': 'INTEGER',
+        'budget': 'REAL',
+        'time_spent': 'INTEGER DEFAULT 0',
+    })
+
+    c.execute(ATTACHMENTS_DDL.format(name='attachments'))
+    _add_missing_columns(c, 'attachments', {
+        'project_id': 'INTEGER',
+        'uploaded_by': 'INTEGER',
+        'uploader_name': 'TEXT',
+        'uploaded_at': 'TEXT',
+        'file_size': 'INTEGER',
+    })
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS app_settings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            setting_name TEXT UNIQUE,
+            setting_value BLOB
+        )
+    ''')
+
+    c.execute(USERS_DDL.format(name='users'))
+    _add_missing_columns(c, 'users', {
+        'first_name': 'TEXT',
+        'last_name': 'TEXT',
+        'company': 'TEXT',
+        'job_title': 'TEXT',
+        'department': 'TEXT',
+        'email': 'TEXT',
+        'phone': 'TEXT',
+        'profile_picture': 'BLOB',
+    })
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS discussion_topics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            topic TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES projects(id),
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS discussion_messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            message TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (topic_id) REFERENCES discussion_topics(id),
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    ''')
+
+
+def migration_002_missing_columns(c):
+    """Columns the pages already read and write but init_db never created"""
+    _add_missing_columns(c, 'subtasks', {
+        'actual_start_date': 'TEXT',
+        'actual_deadline': 'TEXT',
+        'actual_cost': 'REAL',
+        'actual_time_spent': 'REAL',
+    })
+    _add_missing_columns(c, 'users', {
+        'last_login': 'TEXT',
+        'login_count': 'INTEGER DEFAULT 0',
+        'is_active': 'BOOLEAN DEFAULT 1',
+    })
+    _add_missing_columns(c, 'discussion_topics', {
+        'is_archived': 'INTEGER DEFAULT 0',
+    })
+
+
+def migration_003_repair_column_types(c):
+    """Rebuild tables whose DDL drifted: users.phone swallowed the profile_picture
+    declaration (missing comma) and attachments.uploaded_at was added without a type."""
+    if _column_types(c, 'users').get('phone', 'TEXT').upper() != 'TEXT':
+        _rebuild_table(c, 'users', USERS_DDL.format(name='users_new'))
+    if _column_types(c, 'attachments').get('uploaded_at', 'TEXT').upper() != 'TEXT':
+        _rebuild_table(c, 'attachments', ATTACHMENTS_DDL.format(name='attachments_new'))
+
+
+def migration_004_hot_path_indexes(c):
+    """Secondary indexes for the filters every page runs (see indexes.HOT_PATH_INDEXES)"""
+    ensure_indexes(c, HOT_PATH_INDEXES)
+    c.execute("ANALYZE")
+
+
+def migration_005_attachment_content_hash(c):
+    """Attachment bodies may live in the blob store, addressed by SHA-256"""
+    _add_missing_columns(c, 'attachments', {'content_hash': 'TEXT'})
+    ensure_indexes(c, BLOB_STORE_INDEXES)
+
+
+def migration_006_email_outbox(c):
+    """Queue for notification emails drained by the background worker in email_outbox.py"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS email_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            recipient TEXT NOT NULL,
+            cc TEXT,
+            subject TEXT NOT NULL,
+            html_body TEXT NOT NULL,
+            digest INTEGER NOT NULL DEFAULT 1,
+            status TEXT NOT NULL DEFAULT 'pending',  -- pending, sending, sent, failed
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,           -- unix time
+            claimed_at REAL,
+            last_error TEXT,
+            created_at TEXT NOT NULL,
+            sent_at TEXT
+        )
+    ''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox(status, next_attempt_at)")
+
+
+def migration_007_subtask_status_counters(c):
+    """Trigger-maintained subtask counts per task, for O(1) parent-status updates"""
+    install_subtask_status_counters(c)
+
+
+def migration_008_recurring_occurrences(c):
+    """Occurrences of a recurring task point at their template; one per template and deadline"""
+    _add_missing_columns(c, 'tasks', {'recurrence_of': 'INTEGER'})
+    c.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_recurrence_occurrence
+        ON tasks(recurrence_of, deadline) WHERE recurrence_of IS NOT NULL
+    """)
+
+
+def migration_009_search_index(c):
+    """FTS5 index over discussions, tasks, subtasks and comments (see search_index.py)"""
+    install_search_index(c)
+
+
+def migration_010_discussion_counters(c):
+    """Per-topic message counts and last activity, and an edit version per message"""
+    _add_missing_columns(c, 'discussion_topics', {
+        'message_count': 'INTEGER DEFAULT 0',
+        'last_activity_at': 'TEXT',
+    })
+    _add_missing_columns(c, 'discussion_messages', {'version': 'INTEGER DEFAULT 0'})
+    install_discussion_counters(c)
+
+
+MIGRATIONS = [
+    migration_001_baseline,
+    migration_002_missing_columns,
+    migration_003_repair_column_types,
+    migration_004_hot_path_indexes,
+    migration_005_attachment_content_hash,
+    migration_006_email_outbox,
+    migration_007_subtask_status_counters,
+    migration_008_recurring_occurrences,
+    migration_009_search_index,
+    migration_010_discussion_counters,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Apply every migration newer than the database's user_version.
+
+    Returns the list of migration names that ran (empty when already current).
+    Pending migrations run in one IMMEDIATE transaction, and the version is re-read
+    under that lock, so concurrent sessions starting at once never apply one twice.
+    """
+    if get_schema_version(conn) >= SCHEMA_VERSION:
+        return []
+
+    applied = []
+    c = conn.cursor()
+    c.execute("BEGIN IMMEDIATE")
+    try:
+        version = get_schema_version(conn)
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            logger.info("Applying migration %d: %s", number, migration.__name__)
+            migration(c)
+            c.execute(f"PRAGMA user_version = {number}")
+            applied.append(migration.__name__)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return applied
+
+
+if __name__ == "__main__":
+    from database import bootstrap_db, get_pool
+
+    logging.basicConfig(level=logging.INFO)
+    bootstrap_db()
+    with get_pool().connection() as conn:
+        ran = migrate(conn)
+        print(f"Schema version {get_schema_version(conn)}; applied {len(ran)} migration(s)")
@@ -0,0 +1,260 @@
+# notifications_page.py
+"""Notifications page: upcoming and overdue task reminders."""
+from datetime import datetime, timedelta
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from page_helpers import get_upcoming_and_overdue_tasks, query_db
+
+
+def show_notifications_page():
+    """Render the Notifications page"""
+    st.markdown("---")
+
+
+    # Header Section with Gradient
+    st.markdown("""
+        <div class="doc-header">
+            <h1 style="color: white; margin-bottom: 0.5rem;">🔔 Notifications Center</h1>
+            <p style="font-size: 1.1rem; opacity: 0.9;"></p>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 20px;'></div>", unsafe_allow_html=True)  
+
+    # Initialize session state for viewing task details
+    if 'viewing_task_id' not in st.session_state:
+        st.session_state.viewing_task_id = None
+
+    # Custom CSS for notifications
+    st.markdown("""
+        <style>
+            .notification-card {
+                border: 1px solid #e0e0e0;
+                border-radius: 8px;
+                padding: 16px;
+                margin: 16px 0;
+                background: white;
+                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+            }
+            .overdue {
+                border-left: 4px solid #ff4d4d;
+                background: #fff5f5;
+            }
+            .upcoming {
+                border-left: 4px solid #ffa500;
+                background: #fffaf0;
+            }
+            .notification-header {
+                font-weight: bold;
+                font-size: 1.1rem;
+                margin-bottom: 8px;
+                color: #2c3e50;
+            }
+        </style>
+        """, unsafe_allow_html=True)
+
+    # Classified in SQL by the shared task_status rules, cached per user and day
+    upcoming_tasks, overdue_tasks = get_upcoming_and_overdue_tasks()
+
+    # Summary Cards
+    st.subheader("📊 Notification Summary")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown(f"""
+            <div class="notification-card" style="background-color: #F5F5F5;">
+                <div style="font-size: 0.9rem; color: #666;">Total Notifications</div>
+                <div style="font-size: 1.8rem; font-weight: 700;">{len(overdue_tasks) + len(upcoming_tasks)}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown(f"""
+            <div class="notification-card" style="background-color: #FFF5F5;">
+                <div style="font-size: 0.9rem; color: #666;">Overdue Tasks</div>
+                <div style="font-size: 1.8rem; font-weight: 700; color: #D32F2F;">{len(overdue_tasks)}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with col3:
+        st.markdown(f"""
+            <div class="notification-card" style="background-color: #FFF9E6;">
+                <div style="font-size: 0.9rem; color: #666;">Upcoming Deadlines</div>
+                <div style="font-size: 1.8rem; font-weight: 700; color: #FF8F00;">{len(upcoming_tasks)}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # Filters Section
+    st.markdown("---")
+    st.subheader("🔍 Filter Notifications")
+
+    with st.expander("Filter Options", expanded=True):
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            priority_filter = st.multiselect(
+                "Priority Level",
+                options=["High", "Medium", "Low"],
+                default=["High", "Medium", "Low"],
+                key="priority_filter"
+            )
+
+        with col2:
+            # Handle None project names safely
+            project_options = sorted(list(set(
+                [task[-1] if task[-1] else "Unassigned Project" for task in overdue_tasks + upcoming_tasks]
+            )))
+            project_filter = st.multiselect(
+                "Project",
+                options=project_options,
+                default=project_options,
+                key="project_filter"
+            )
+
+        with col3:
+            min_date = datetime.today().date()
+            max_date = min_date + timedelta(days=st.session_state.reminder_period)
+            deadline_filter = st.date_input(
+                "Deadline Range",
+                value=[min_date, max_date],
+                key="deadline_filter"
+            )
+
+    # Apply filters
+    def apply_filters(task_list):
+        filtered = []
+        for task in task_list:
+            priority = task[8] if len(task) > 8 else "Medium"
+            project_name = task[-1] if task[-1] else "Unassigned Project"
+            deadline = datetime.strptime(task[6], "%Y-%m-%d").date() if task[6] else datetime.today().date()
+
+            if (priority in priority_filter and
+                project_name in project_filter and
+                (len(deadline_filter) == 2 and deadline_filter[0] <= deadline <= deadline_filter[1])):
+                filtered.append(task)
+        return filtered
+
+    filtered_overdue = apply_filters(overdue_tasks)
+    filtered_upcoming = apply_filters(upcoming_tasks)
+
+    # Notifications Display
+    st.markdown("---")
+    st.subheader("📨 Your Notifications")
+
+    # Overdue Tasks Section
+    with st.expander(f"⚠️ Overdue Tasks ({len(filtered_overdue)})", expanded=True):
+        if filtered_overdue:
+            for task in filtered_overdue:
+                with st.container():
+                    deadline = datetime.strptime(task[6], "%Y-%m-%d").date() if task[6] else "No deadline"
+                    days_overdue = (datetime.today().date() - deadline).days if task[6] else 0
+                    project_name = task[-1] if task[-1] else "Unassigned Project"
+
+                    st.markdown(f"""
+                        <div class="notification-card overdue">
+                            <div class="notification-header">
+                                {task[2]}
+                            </div>
+                            <div style="margin-bottom: 8px;">
+                                <strong>Project:</strong> {project_name} | 
+                                <strong>Deadline:</strong> {deadline} ({days_overdue} days overdue)
+                            </div>
+                            <div style="margin-bottom: 8px;">{task[3] or "No description"}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                    # Use Streamlit button instead of HTML button
+                    if st.button("View Details", key=f"view_{task[0]}"):
+                        st.session_state.viewing_task_id = task[0]
+                        st.rerun()
+        else:
+            st.info("No overdue tasks matching your filters.")
+
+    # Upcoming Tasks Section
+    with st.expander(f"🔜 Upcoming Deadlines ({len(filtered_upcoming)})", expanded=True):
+        if filtered_upcoming:
+            for task in filtered_upcoming:
+                with st.container():
+                    deadline = datetime.strptime(task[6], "%Y-%m-%d").date() if task[6] else "No deadline"
+                    days_remaining = (deadline - datetime.today().date()).days if task[6] else 0
+                    project_name = task[-1] if task[-1] else "Unassigned Project"
+
+                    st.markdown(f"""
+                        <div class="notification-card upcoming">
+                            <div class="notification-header">
+                                {task[2]}
+                            </div>
+                            <div style="margin-bottom: 8px;">
+                                <strong>Project:</strong> {project_name} | 
+                                <strong>Deadline:</strong> {deadline} (in {days_remaining} days)
+                            </div>
+                            <div style="margin-bottom: 8px;">{task[3] or "No description"}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                    if st.button("View Details", key=f"view_{task[0]}_upcoming"):
+                        st.session_state.viewing_task_id = task[0]
+                        st.rerun()
+        else:
+            st.info("No upcoming tasks matching your filters.")
+
+    # Display task details at the BOTTOM of the page if a task is selected
+    if st.session_state.viewing_task_id:
+        task_id = st.session_state.viewing_task_id
+        task = query_db("""
+                SELECT t.*, p.name as project_name, u.username as assignee_name
+                FROM tasks t
+                LEFT JOIN projects p ON t.project_id = p.id
+                LEFT JOIN users u ON t.assigned_to = u.id
+                WHERE t.id = ?
+            """, (task_id,), one=True)
+
+        if task:
+            st.markdown("---")  # Add a divider before the task details
+            with st.expander(f"📝 Task Details: {task[2]}", expanded=True):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.write(f"**Project:** {task[-2] if task[-2] else 'No project'}")
+                    st.write(f"**Title:** {task[2]}")
+                    st.write(f"**Status:** {task[4]}")
+                with col2:
+                    st.write(f"**Assignee:** {task[-1] if task[-1] else 'Unassigned'}")
+                    st.write(f"**Start Date:** {task[11] if task[11] else 'Not set'}")
+                    st.write(f"**Deadline:** {task[6]}")
+
+                st.divider()
+                st.write("**Description:**")
+                st.write(task[3] or "No description available")
+
+                st.divider()
+                st.write(f"**Time Spent:** {task[7]} hours")
+
+                if st.button("Close Details"):
+                    st.session_state.viewing_task_id = None
+                    st.rerun()
+        else:
+            st.warning("Task not found")
+            st.session_state.viewing_task_id = None
+            st.rerun()
+
+    # JavaScript to handle button clicks
+    components.html("""
+        <script>
+            window.addEventListener('message', function(event) {
+                if (event.data.taskId) {
+                    // This will trigger Streamlit to update the viewing_task state
+                    window.parent.postMessage({
+                        streamlit: {
+                            type: 'streamlit:componentMessage',
+                            data: {taskId: event.data.taskId}
+                        }
+                    }, '*');
+                }
+            });
+        </script>
+        """, height=0)
@@ -0,0 +1,214 @@
+# page_helpers.py
+"""Helpers shared by app.py and the page modules.
+
+Everything here is cheap to import (no pandas or plotly), so app.py can load it at
+startup and the page modules can share it without pulling each other in.
+"""
+import functools
+import hashlib
+import os
+
+import streamlit as st
+
+from database import get_pool, run_query
+from migrations import migrate
+from recurrence import expand_recurring_tasks
+from task_graph import can_complete_task as dependencies_met
+from task_status import (
+    classify_deadline, get_upcoming_and_overdue_tasks as fetch_upcoming_and_overdue
+)
+from user_directory import get_username as lookup_username
+
+STYLESHEET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "style.css")
+
+
+# Database Initialization
+def init_db():
+    """Apply pending schema migrations - a single user_version check once the schema is current"""
+    with get_pool().connection() as conn:
+        migrate(conn)
+
+
+# Query Database
+def query_db(query, args=(), one=False):
+    # Queries are timed and listed by the instrumentation debug panel, see instrumentation.py
+    return run_query(query, args, one)
+
+
+# Helper Functions
+def hash_password(password):
+    """Hash a password for storing."""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def verify_password(stored_password, provided_password):
+    """Verify a stored password against one provided by the user."""
+    return stored_password == hashlib.sha256(provided_password.encode()).hexdigest()
+
+
+# Helper Functions
+def get_projects():
+    if st.session_state.user_role == "Admin":
+        return query_db("SELECT * FROM projects")
+    else:
+        return query_db("""
+                SELECT DISTINCT p.* FROM projects p
+                LEFT JOIN tasks t ON p.id = t.project_id
+                WHERE p.user_id = ?  -- User owns project
+                OR t.assigned_to = ? -- User has tasks in project
+                OR p.id IN (        -- User is in project team
+                    SELECT project_id FROM project_team WHERE user_id = ?
+                )
+            """, (st.session_state.user_id, st.session_state.user_id, st.session_state.user_id))
+
+
+def get_username(user_id):
+    return lookup_username(user_id)
+
+
+# Helper function to get tasks
+def get_tasks(project_id=None):
+    """Fetch only tasks where current user is assignee"""
+    if project_id:
+        return query_db(
+            "SELECT * FROM tasks WHERE project_id=? AND assigned_to=?",
+            (project_id, st.session_state.user_id)
+        )
+
+    return query_db(
+        "SELECT * FROM tasks WHERE assigned_to=?",
+        (st.session_state.user_id,)
+    )
+
+
+def delete_task(task_id):
+    query_db("DELETE FROM tasks WHERE id=?", (task_id,))
+
+
+# Helper function to check if a task is upcoming or overdue
+def get_task_status(task_deadline):
+    return classify_deadline(task_deadline, reminder_days=st.session_state.reminder_period)
+
+
+# Define status colors for tasks
+status_colors = {
+    "Pending": "#FFA500",  # Orange
+    "In Progress": "#00BFFF",  # DeepSkyBlue
+    "Completed": "#32CD32",  # LimeGreen
+    "Overdue": "#FF4500"  # OrangeRed
+}
+
+
+# Helper function if task under assignee
+def is_task_assignee(task):
+    """Check if current user is task assignee"""
+    return task[10] == st.session_state.user_id  # assigned_to is index 10
+
+
+# Helper function if user can edit task
+def user_can_edit_task(task):
+    """Check if current user can edit this task"""
+    if st.session_state.user_role == "Admin":
+        return True
+
+    # User is the assignee
+    if task[10] == st.session_state.user_id:  # assigned_to is at index 10
+        return True
+
+    # User is project owner
+    project_owner = query_db(
+        "SELECT user_id FROM projects WHERE id=?",
+        (task[1],), one=True
+    )
+    if project_owner and project_owner[0] == st.session_state.user_id:
+        return True
+
+    # User is in project team
+    return query_db(
+        "SELECT 1 FROM project_team WHERE project_id=? AND user_id=?",
+        (task[1], st.session_state.user_id), one=True
+    )
+
+
+# Helper function user can modify task
+def user_can_modify_task(task):
+    """Check if user can edit/delete this task"""
+    if st.session_state.user_role == "Admin":
+        return True
+    if task[10] == st.session_state.user_id:  # User is assignee
+        return True
+    # Check if user is project owner
+    return query_db(
+        "SELECT 1 FROM projects WHERE id=? AND user_id=?", 
+        (task[1], st.session_state.user_id), 
+        one=True
+    )
+
+
+# Helper function to get upcoming and overdue tasks
+def get_upcoming_and_overdue_tasks():
+    user_id = None if st.session_state.user_role == "Admin" else st.session_state.user_id
+    return fetch_upcoming_and_overdue(user_id, st.session_state.reminder_period)
+
+
+# Helper function to create a new instance of a recurring task
+def create_recurring_task(task):
+    """Materialise the upcoming instances of a recurring task (see recurrence.py)."""
+    if not task[9]:
+        return 0  # Not a recurring task
+    return expand_recurring_tasks(task_ids=[task[0]])
+
+
+# Helper function to get task dependencies
+def get_task_dependencies(task_id):
+    """Get the list of tasks that the given task depends on."""
+    return query_db("SELECT depends_on_task_id FROM task_dependencies WHERE task_id=?", (task_id,))
+
+
+# Helper function to check if a task can be completed
+def can_complete_task(task_id):
+    """Check if a task can be completed (all dependencies are met)."""
+    return dependencies_met(task_id)
+
+
+# Breadcrumbs Functionality
+def update_breadcrumbs(page):
+    """Update the breadcrumbs in session state."""
+    if page not in st.session_state.breadcrumbs:
+        st.session_state.breadcrumbs.append(page)
+
+
+def display_breadcrumbs():
+    """Display breadcrumbs as clickable links."""
+    if st.session_state.breadcrumbs:
+        breadcrumb_links = " > ".join([
+            f'<a href="#{crumb}" style="text-decoration: none; color: inherit;">{crumb}</a>'
+            for crumb in st.session_state.breadcrumbs
+        ])
+        st.markdown(f"**Navigation:** {breadcrumb_links}", unsafe_allow_html=True)
+
+
+def save_logo_to_db(logo_bytes):
+    """Save logo to database"""
+    query_db(
+        "INSERT OR REPLACE INTO app_settings (setting_name, setting_value) VALUES (?, ?)",
+        ("login_logo", logo_bytes)
+    )
+
+
+def get_logo_from_db():
+    """Retrieve logo from database"""
+    result = query_db(
+        "SELECT setting_value FROM app_settings WHERE setting_name=?",
+        ("login_logo",),
+        one=True
+    )
+    return result[0] if result else None
+
+
+# --- Stylesheet ---
+@functools.lru_cache(maxsize=None)
+def app_stylesheet(path=STYLESHEET_PATH):
+    """style.css as a <style> block, read from disk once per process"""
+    with open(path, encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
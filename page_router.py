@@ -0,0 +1,50 @@
+# page_router.py
+"""Lazy page loading.
+
+app.py asks the router for a page's render function instead of importing every page
+module at startup. A page module and everything it imports - pandas, plotly,
+components - loads the first time the page is visited. Later visits reuse the module
+Python already holds. Register pages in PAGE_MODULES. import_benchmark.py checks
+that none of them, nor LAZY_MODULES, creep back into app.py's startup imports.
+"""
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# page name -> (module, render function)
+PAGE_MODULES = {
+    "Dashboard": ("dashboard_page", "show_dashboard_page"),
+    "Projects": ("projects_page", "show_projects_page"),
+    "Tasks": ("tasks_page", "show_tasks_page"),
+    "Notifications": ("notifications_page", "show_notifications_page"),
+    "Calendar": ("calendar_page", "show_calendar_page"),
+    "Admin": ("admin_page", "show_admin_page"),
+    "Profile": ("profile_page", "show_profile_page"),
+    "Documentation": ("documentation_page", "show_documentation_page"),
+    "Workspace": ("workspace_page", "workspace_page"),
+}
+
+# Heavy third-party modules only some pages need; app.py must not import them eagerly
+LAZY_MODULES = ("statsmodels", "streamlit_calendar")
+
+_loaded = {}
+_load_lock = threading.Lock()
+
+
+def load_page(page):
+    """The render function for a page, importing its module on first use"""
+    render = _loaded.get(page)
+    if render is not None:
+        return render
+    module_name, function_name = PAGE_MODULES[page]
+    with _load_lock:
+        if page not in _loaded:
+            started = time.perf_counter()
+            module = importlib.import_module(module_name)
+            _loaded[page] = getattr(module, function_name)
+            logger.info("Loaded page %s (%s) in %.0f ms", page, module_name,
+                        (time.perf_counter() - started) * 1000)
+    return _loaded[page]
@@ -0,0 +1,531 @@
+# profile_page.py
+"""Profile page: the signed-in user's details, password and activity."""
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from page_helpers import get_projects, get_tasks, hash_password, query_db, verify_password
+from visualizations import plotly_chart
+
+
+def update_user_profile(user_id):
+    """
+    Allow users to update their profile information, including profile picture.
+    """
+    st.subheader("Update Your Profile")
+
+    # Fetch current user data
+    user = query_db("SELECT * FROM users WHERE id=?", (user_id,), one=True)
+    if not user:
+        st.error("User not found.")
+        return
+
+    # Debugging: Print the user tuple to verify its structure
+    print("User Data:", user)
+    print("Number of Columns in User Tuple:", len(user))
+
+    with st.form(key="update_profile_form"):
+        # Display current profile picture (if available)
+        if len(user) > 11 and user[11]:  # Check if profile_picture exists
+            st.image(user[11], width=100, caption="Current Profile Picture")
+        else:
+            st.write("No profile picture uploaded.")
+
+        # Upload new profile picture
+        uploaded_file = st.file_uploader("Upload a new profile picture", type=["jpg", "jpeg", "png"])
+
+        # Input fields for profile details
+        first_name = st.text_input("First Name", value=user[4] if len(user) > 4 else "")
+        last_name = st.text_input("Last Name", value=user[5] if len(user) > 5 else "")
+        company = st.text_input("Company", value=user[6] if len(user) > 6 else "")
+        job_title = st.text_input("Job Title", value=user[7] if len(user) > 7 else "")
+        department = st.text_input("Department", value=user[8] if len(user) > 8 else "")
+        email = st.text_input("Email", value=user[9] if len(user) > 9 else "")
+        phone = st.text_input("Phone", value=user[10] if len(user) > 10 else "")
+
+        if st.form_submit_button("Update Profile"):
+            # Update profile picture if a new file is uploaded
+            profile_picture = user[11] if len(user) > 11 else None  # Keep the existing picture by default
+            if uploaded_file is not None:
+                profile_picture = uploaded_file.read()  # Read the file as binary data
+
+            # Debugging: Print the values being passed to the UPDATE query
+            print("Updating Profile with the following values:")
+            print("First Name:", first_name)
+            print("Last Name:", last_name)
+            print("Company:", company)
+            print("Job Title:", job_title)
+            print("Department:", department)
+            print("Email:", email)
+            print("Phone:", phone)
+            print("Profile Picture:", profile_picture)
+
+            # Update the user's profile in the database
+            query_db('''
+                UPDATE users
+                SET first_name=?, last_name=?, company=?, job_title=?, department=?, email=?, phone=?, profile_picture=?
+                WHERE id=?
+            ''', (
+                first_name if first_name else user[4],  # Use existing value if new value is None
+                last_name if last_name else user[5],
+                company if company else user[6],
+                job_title if job_title else user[7],
+                department if department else user[8],
+                email if email else user[9],
+                phone if phone else user[10],
+                profile_picture if profile_picture else user[11],  # Use existing picture if new picture is None
+                user_id
+            ))
+
+            st.success("Profile updated successfully!")
+            st.rerun()  # Rerun the app to reflect changes
+
+
+def display_user_profile(user_id):
+    """
+    Display the user's profile information.
+    """
+    st.subheader("Your Profile")
+
+    # Fetch user data
+    user = query_db("SELECT * FROM users WHERE id=?", (user_id,), one=True)
+    if not user:
+        st.error("User not found.")
+        return
+
+    # Debugging: Print the user tuple to verify its structure
+    print("User Data:", user)
+
+    # Display profile picture
+    if len(user) > 11 and user[11]:  # Check if profile_picture exists
+        st.image(user[11], width=100, caption="Profile Picture")
+    else:
+        st.write("No profile picture uploaded.")
+
+    # Display profile details
+    st.write(f"**Username:** {user[1]}")
+    st.write(f"**First Name:** {user[4]}")
+    st.write(f"**Last Name:** {user[5]}")
+    st.write(f"**Company:** {user[6]}")
+    st.write(f"**Job Title:** {user[7]}")
+    st.write(f"**Department:** {user[8]}")
+    st.write(f"**Email:** {user[9]}")
+    st.write(f"**Phone:** {user[10]}")
+
+
+def show_profile_page():
+    """Render the Profile page"""
+    st.markdown("---")
+
+
+    # Header Section with Gradient
+    st.markdown("""
+        <div class="doc-header">
+            <h1 style="color: white; margin-bottom: 0.5rem;">👤 User Profile</h1>
+            <p style="font-size: 1.1rem; opacity: 0.9;"></p>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+    st.markdown("---")
+
+
+    # Display user profile information
+    display_user_profile(st.session_state.user_id)
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 20px;'></div>", unsafe_allow_html=True)  
+
+    # Success notification state
+    if 'profile_update_success' not in st.session_state:
+        st.session_state.profile_update_success = False
+    if 'password_change_success' not in st.session_state:
+        st.session_state.password_change_success = False
+
+    # Display success notifications
+    if st.session_state.profile_update_success:
+        st.success("✅ Profile updated successfully!")
+        st.session_state.profile_update_success = False
+
+    if st.session_state.password_change_success:
+        st.success("✅ Password changed successfully!")
+        st.session_state.password_change_success = False
+
+    # Main profile layout
+    col1, col2 = st.columns([1, 2], gap="large")
+
+    with col1:
+        # Profile Picture Section
+        st.subheader("Profile Picture")
+        user = query_db("SELECT profile_picture FROM users WHERE id=?", (st.session_state.user_id,), one=True)
+
+        if user and user[0]:
+            st.image(user[0], width=150)
+        else:
+            st.image("https://via.placeholder.com/150", width=150)
+
+        uploaded_file = st.file_uploader("Upload new photo", type=["jpg", "jpeg", "png"])
+
+    with col2:
+        # Profile Information Section
+        st.subheader("Personal Information")
+        user = query_db("""
+                SELECT username, first_name, last_name, email, phone, 
+                    company, job_title, department, profile_picture
+                FROM users WHERE id=?
+            """, (st.session_state.user_id,), one=True)
+
+        with st.form("profile_form"):
+            cols = st.columns(2)
+            with cols[0]:
+                first_name = st.text_input("First Name", value=user[1] if user[1] else "")
+                email = st.text_input("Email", value=user[3] if user[3] else "")
+                company = st.text_input("Company", value=user[5] if user[5] else "")
+            with cols[1]:
+                last_name = st.text_input("Last Name", value=user[2] if user[2] else "")
+                phone = st.text_input("Phone", value=user[4] if user[4] else "")
+                job_title = st.text_input("Job Title", value=user[6] if user[6] else "")
+
+            department = st.text_input("Department", value=user[7] if user[7] else "")
+
+            if st.form_submit_button("Update Profile"):
+                # Handle profile picture upload
+                profile_pic = user[8]  # Keep existing if no new upload
+                if uploaded_file is not None:
+                    profile_pic = uploaded_file.read()
+
+                query_db("""
+                        UPDATE users SET
+                            first_name=?, last_name=?, email=?,
+                            phone=?, company=?, job_title=?,
+                            department=?, profile_picture=?
+                        WHERE id=?
+                    """, (
+                    first_name, last_name, email,
+                    phone, company, job_title,
+                    department, profile_pic,
+                    st.session_state.user_id
+                ))
+                st.session_state.profile_update_success = True
+                st.rerun()
+
+    # Change Password Section
+    st.divider()
+    st.subheader("Change Password")
+
+    with st.form("password_form"):
+        current_password = st.text_input("Current Password", type="password")
+        new_password = st.text_input("New Password", type="password")
+        confirm_password = st.text_input("Confirm New Password", type="password")
+
+        if st.form_submit_button("Change Password"):
+            # Verify current password
+            user = query_db("SELECT password FROM users WHERE id=?", (st.session_state.user_id,), one=True)
+            if not verify_password(user[0], current_password):
+                st.error("Current password is incorrect")
+            elif new_password != confirm_password:
+                st.error("New passwords don't match")
+            elif len(new_password) < 8:
+                st.error("Password must be at least 8 characters")
+            else:
+                query_db("UPDATE users SET password=? WHERE id=?", 
+                        (hash_password(new_password), st.session_state.user_id))
+                st.session_state.password_change_success = True
+                st.rerun()
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 30px;'></div>", unsafe_allow_html=True)
+
+
+    # ======= Activity Summary Section =======
+    st.subheader("📊 Activity Summary")
+
+    # Custom CSS for the cards (similar to Notifications page)
+    st.markdown("""
+        <style>
+            .metric-card {
+                border-radius: 8px;
+                background-color: #FFFFFF;
+                padding: 16px;
+                margin-bottom: 16px;
+                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+                transition: all 0.3s ease;
+            }
+            .metric-card:hover {
+                transform: translateY(-2px);
+                box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+            }
+            .metric-title {
+                font-size: 0.9rem;
+                color: #666;
+                margin-bottom: 8px;
+            }
+            .metric-value {
+                font-size: 1.8rem;
+                font-weight: 700;
+                color: #2c3e50;
+                margin: 0;
+            }
+        </style>
+        """, unsafe_allow_html=True)
+
+    # Get activity data
+    tasks_assigned = len(get_tasks())
+    tasks_completed = len([task for task in get_tasks() if task[4] == "Completed"])
+    projects_involved = len(get_projects())
+
+    # Create cards in columns
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown(f"""
+            <div class="metric-card" style="border-left: 4px solid #4E8BF5;">
+                <div class="metric-title">Tasks Assigned</div>
+                <div class="metric-value">{tasks_assigned}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown(f"""
+            <div class="metric-card" style="border-left: 4px solid #32CD32;">
+                <div class="metric-title">Tasks Completed</div>
+                <div class="metric-value">{tasks_completed}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with col3:
+        st.markdown(f"""
+            <div class="metric-card" style="border-left: 4px solid #FFA500;">
+                <div class="metric-title">Projects Involved</div>
+                <div class="metric-value">{projects_involved}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # Completion rate visualization
+    if tasks_assigned > 0:
+        completion_rate = (tasks_completed / tasks_assigned) * 100
+        remaining_rate = 100 - completion_rate
+
+        st.markdown("---")
+        st.write("### Task Completion Progress")
+
+        # Create a completion card similar to notification cards
+        st.markdown(f"""
+            <div class="metric-card" style="border-left: 4px solid #6BB9F0; margin-top: 16px;">
+                <div style="display: flex; justify-content: space-between; margin-bottom: 8px;">
+                    <span class="metric-title">Overall Completion Rate</span>
+                    <span style="font-weight: 600; color: #2c3e50;">{completion_rate:.1f}%</span>
+                </div>
+                <div style="height: 8px; background: #f0f0f0; border-radius: 4px; overflow: hidden;">
+                    <div style="width: {completion_rate}%; height: 100%; background: #4CAF50;"></div>
+                </div>
+                <div style="display: flex; justify-content: space-between; margin-top: 8px;">
+                    <span style="font-size: 0.8rem; color: #666;">Completed: {tasks_completed}</span>
+                    <span style="font-size: 0.8rem; color: #666;">Pending: {tasks_assigned - tasks_completed}</span>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+
+        # Divider
+        st.markdown("---")
+        st.header("📊 Your Task Analytics")
+
+
+        # Fetch the user's tasks with proper error handling
+        try:
+            # Get tasks assigned to the current user
+            tasks = query_db("""
+                    SELECT 
+                        t.id, t.title, t.status, t.priority, t.deadline, 
+                        t.time_spent, p.name as project_name,
+                        t.start_date, t.actual_start_date,
+                        t.deadline as planned_deadline, t.actual_deadline,
+                        t.budget, t.actual_cost
+                    FROM tasks t
+                    JOIN projects p ON t.project_id = p.id
+                    WHERE t.assigned_to = ?
+                """, (st.session_state.user_id,))
+
+            if not tasks:
+                st.info("No tasks found for your account.")
+            else:
+                # Create DataFrame with proper column names
+                tasks_df = pd.DataFrame(tasks, columns=[
+                    "ID", "Title", "Status", "Priority", "Deadline", 
+                    "Time Spent", "Project",
+                    "Planned Start", "Actual Start",
+                    "Planned Deadline", "Actual Deadline",
+                    "Budget", "Actual Cost"
+                ])
+
+                # Convert date columns
+                date_cols = ["Deadline", "Planned Start", "Actual Start", "Planned Deadline", "Actual Deadline"]
+                for col in date_cols:
+                    tasks_df[col] = pd.to_datetime(tasks_df[col])
+
+                # Calculate additional metrics
+                today = pd.Timestamp.today()
+                tasks_df["Days Until Deadline"] = (tasks_df["Deadline"] - today).dt.days
+                tasks_df["Duration Variance"] = (tasks_df["Actual Deadline"] - tasks_df["Planned Deadline"]).dt.days
+                tasks_df["Budget Variance"] = tasks_df["Budget"] - tasks_df["Actual Cost"]
+
+                # Create tabs for different visualizations
+                tab1, tab2, tab3 = st.tabs(["Productivity", "Time Management", "Performance"])
+
+                with tab1:
+
+                    # --- NEW: Project Task Status Bar Chart ---
+                    st.subheader("📋 Tasks by Project and Status")
+
+                    # Group by Project and Status
+                    project_status_counts = tasks_df.groupby(['Project', 'Status']).size().unstack(fill_value=0)
+
+                    # Create stacked bar chart
+                    fig = px.bar(
+                        project_status_counts,
+                        x=project_status_counts.index,
+                        y=project_status_counts.columns,
+                        title="Your Tasks by Project and Status",
+                        labels={'value': 'Number of Tasks', 'index': 'Project'},
+                        color_discrete_map={
+                            'Pending': '#FFA500',  # Orange
+                            'In Progress': '#1E90FF',  # DodgerBlue
+                            'Completed': '#32CD32',  # LimeGreen
+                            'Overdue': '#FF4500'  # OrangeRed
+                        }
+                    )
+
+                    # Improve layout
+                    fig.update_layout(
+                        barmode='stack',
+                        xaxis_title="Project",
+                        yaxis_title="Number of Tasks",
+                        legend_title="Task Status",
+                        hovermode="x unified"
+                    )
+
+                    # Display the chart
+                    plotly_chart(fig, use_container_width=True)
+
+
+                    st.subheader("🔄 Task Completion Rate")
+
+                    # Weekly completion rate
+                    completed_tasks = tasks_df[tasks_df["Status"] == "Completed"]
+                    if not completed_tasks.empty:
+                        weekly_completion = completed_tasks.groupby(
+                            pd.Grouper(key="Actual Deadline", freq="W-MON")
+                        ).size().reset_index(name="Tasks Completed")
+
+                        fig = px.line(
+                            weekly_completion,
+                            x="Actual Deadline",
+                            y="Tasks Completed",
+                            title="Your Weekly Task Completion",
+                            markers=True
+                        )
+                        plotly_chart(fig, use_container_width=True)
+                    else:
+                        st.info("No completed tasks to show completion rate.")
+
+                    # Status distribution
+                    st.subheader("📊 Current Task Status")
+                    status_counts = tasks_df["Status"].value_counts().reset_index()
+                    fig = px.pie(
+                        status_counts,
+                        names="Status",
+                        values="count",
+                        title="Your Task Status Distribution"
+                    )
+                    plotly_chart(fig, use_container_width=True)
+
+                with tab2:
+                    st.subheader("⏱️ Time Management")
+
+                    # Risk metric
+                    st.subheader("⚡ Risk Matrix - Priority vs Days Overdue")
+                    tasks_df['Days_Overdue'] = (pd.to_datetime('today') - 
+                                                pd.to_datetime(tasks_df['Deadline'])).dt.days
+                    fig = px.scatter(
+                        tasks_df,
+                        x='Days_Overdue',
+                        y='Priority',
+                        color='Project',
+                        size='Budget',
+                        title='Task Risk Assessment',
+                        labels={'Days_Overdue': 'Days Overdue'}
+                    )
+                    plotly_chart(fig, use_container_width=True)   
+
+                    # Duration variance
+                    if "Actual Deadline" in tasks_df.columns and "Planned Deadline" in tasks_df.columns:
+                        fig = px.scatter(
+                            tasks_df,
+                            x="Planned Deadline",
+                            y="Duration Variance",
+                            color="Project",
+                            title="Planned vs Actual Duration Variance",
+                            hover_data=["Title", "Project"]
+                        )
+                        fig.add_hline(y=0, line_dash="dash", line_color="red")
+                        plotly_chart(fig, use_container_width=True)
+
+                    # Time spent distribution
+                    st.subheader("⏳ Time Spent Analysis")
+                    fig = px.box(
+                        tasks_df,
+                        x="Project",
+                        y="Time Spent",
+                        color="Priority",
+                        title="Time Spent by Project and Priority"
+                    )
+                    plotly_chart(fig, use_container_width=True)
+
+                with tab3:
+                    st.subheader("📈 Budget Performance")
+
+                    # Budget variance
+                    if "Budget Variance" in tasks_df.columns:
+                        fig = px.bar(
+                            tasks_df,
+                            x="Project",
+                            y="Budget Variance",
+                            color="Priority",
+                            title="Your Budget Variance by Project",
+                            labels={"Budget Variance": "Budget Variance ($)"}
+                        )
+                        fig.add_hline(y=0, line_dash="dash", line_color="green")
+                        plotly_chart(fig, use_container_width=True)
+
+                    # Efficiency metric
+                    st.subheader("⚡ Your Efficiency")
+                    efficiency_df = tasks_df.groupby("Project").agg({
+                        "Time Spent": "sum",
+                        "Budget Variance": "mean"
+                    }).reset_index()
+
+                    fig = px.scatter(
+                        efficiency_df,
+                        x="Time Spent",
+                        y="Budget Variance",
+                        size="Time Spent",
+                        color="Project",
+                        title="Time Investment vs Budget Performance",
+                        labels={
+                            "Time Spent": "Total Hours Spent",
+                            "Budget Variance": "Average Budget Variance ($)"
+                        }
+                    )
+                    plotly_chart(fig, use_container_width=True)
+
+
+        except Exception as e:
+            st.error(f"Error loading task data: {str(e)}")
+            st.info("Please try refreshing the page or contact support if the problem persists.")
+
+
+    # Final divider at bottom
+    st.markdown("---")
@@ -0,0 +1,926 @@
+# projects_page.py
+"""Projects page: project list, cards and portfolio analytics."""
+from datetime import datetime
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from page_helpers import get_tasks, query_db, status_colors
+from task_operations import delete_project
+from visualizations import (
+    plot_budget_comparison, plot_completion_heatmap, plot_duration_comparison,
+    plot_duration_variance, plot_project_health, plot_project_timeline, plotly_chart
+)
+
+
+# Helper function to display projects as cards
+def display_projects_as_cards():
+    """Display projects in a professional dropdown interface for selection and management"""
+    # Fetch all users for owner dropdown
+    users = query_db("SELECT id, username FROM users")
+    user_options = {user[0]: user[1] for user in users}
+
+    projects = query_db("""
+        SELECT id, user_id, name, description, start_date, end_date, budget 
+        FROM projects
+    """)
+
+    if not projects:
+        st.warning("No projects found in the database.")
+        return
+
+    # Success notifications
+    if st.session_state.get('show_edit_success'):
+        st.success("✓ Project updated successfully!")
+        del st.session_state['show_edit_success']
+
+    # Professional Project Selection Dropdown
+    st.subheader("Project Management")
+    project_options = {p[0]: f"{p[2]} (ID: {p[0]})" for p in projects}
+    selected_project_id = st.selectbox(
+        "Select Project to Manage",
+        options=list(project_options.keys()),
+        format_func=lambda x: project_options[x],
+        placeholder="Choose a project...",
+        key="project_selector"
+    )
+
+    # Get the selected project
+    selected_project = next((p for p in projects if p[0] == selected_project_id), None)
+
+    if selected_project:
+        project_id, owner_id, name, description, start_date, end_date, budget = selected_project
+        owner_username = user_options.get(owner_id, "Unknown")
+
+        # Format budget display safely
+        budget_display = "Not set"
+        if budget is not None:
+            try:
+                budget_display = f"${float(budget):,.2f}"
+            except (TypeError, ValueError):
+                budget_display = "Invalid value"
+
+        # Check if project is overdue
+        today = datetime.now().date()
+        end_date_obj = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else today
+        is_overdue = end_date_obj < today
+
+        # Project Details Card with conditional coloring
+        card_style = """
+            border: 1px solid #e0e0e0;
+            border-radius: 8px;
+            padding: 16px;
+            margin: 16px 0;
+            background: white;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+        """
+
+        if is_overdue:
+            card_style = """
+                border-left: 4px solid #ff4d4d;
+                border-radius: 8px;
+                padding: 16px;
+                margin: 16px 0;
+                background: #fff5f5;
+                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+            """
+
+        with st.container():
+            st.markdown(f"""
+            <div style="{card_style}">
+                <h3 style="margin-top:0;color:#2c3e50;">{name}</h3>
+                <p><strong>Description:</strong> {description or "No description"}</p>
+                <p><strong>Owner:</strong> {owner_username}</p>
+                <p><strong>Start Date:</strong> {start_date}</p>
+                <p><strong>Due Date:</strong> <span style="color: {'#ff4d4d' if is_overdue else 'inherit'}">{end_date}</span></p>
+                <p><strong>Status:</strong> {'<span style="color:#ff4d4d">⚠️ Overdue</span>' if is_overdue else 'On track'}</p>
+                <p><strong>Budget:</strong> {budget_display}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+            # Action Buttons - Only show if admin or project owner
+            show_edit = st.session_state.user_role == "Admin" or owner_id == st.session_state.user_id
+            show_delete = st.session_state.user_role == "Admin"
+
+            if show_edit or show_delete:
+                cols = st.columns([1,1,2])
+                with cols[0]:
+                    if show_edit and st.button("✏️ Edit Project", key=f"edit_{project_id}"):
+                        st.session_state.editing_project_id = project_id
+                        st.rerun()
+                with cols[1]:
+                    if show_delete and st.button("🗑️ Delete Project", type="primary", key=f"delete_{project_id}"):
+                        st.session_state.deleting_project_id = project_id
+                        st.rerun()
+
+        # Edit Form
+        if st.session_state.get('editing_project_id') == project_id and show_edit:
+            with st.form(f"edit_form_{project_id}"):
+                st.subheader(f"Edit Project: {name}")
+                new_name = st.text_input("Name", value=name)
+                new_desc = st.text_area("Description", value=description)
+
+                if st.session_state.user_role == "Admin":
+                    current_owner_name = user_options.get(owner_id, "Unknown")
+                    new_owner_name = st.selectbox(
+                        "Owner",
+                        options=list(user_options.values()),
+                        index=list(user_options.values()).index(current_owner_name) if current_owner_name in user_options.values() else 0
+                    )
+                    new_owner_id = [uid for uid, uname in user_options.items() if uname == new_owner_name][0]
+                else:
+                    new_owner_id = owner_id
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    new_start = st.date_input("Start Date", value=datetime.strptime(start_date, "%Y-%m-%d").date())
+                with col2:
+                    new_end = st.date_input("Due Date", value=datetime.strptime(end_date, "%Y-%m-%d").date())
+
+                new_budget = st.number_input("Budget", value=float(budget) if budget else 0.0, step=0.01)
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.form_submit_button("💾 Save Changes"):
+                        query_db("""
+                            UPDATE projects SET 
+                            name=?, description=?, user_id=?, 
+                            start_date=?, end_date=?, budget=?
+                            WHERE id=?
+                        """, (new_name, new_desc, new_owner_id, 
+                              new_start, new_end, new_budget, project_id))
+                        st.session_state.show_edit_success = True
+                        st.session_state.editing_project_id = None
+                        st.rerun()
+                with col2:
+                    if st.form_submit_button("❌ Cancel"):
+                        st.session_state.editing_project_id = None
+                        st.rerun()
+
+        # Delete Confirmation
+        if st.session_state.get('deleting_project_id') == project_id and show_delete:
+            st.warning(f"⚠️ Delete project '{name}'? This action cannot be undone!")
+            st.error("All associated tasks and data will be permanently deleted!")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("✅ Confirm Deletion", type="primary"):
+                    delete_project(project_id)
+                    st.success("Project deleted successfully")
+                    st.session_state.deleting_project_id = None
+                    st.rerun()
+            with col2:
+                if st.button("❌ Cancel"):
+                    st.session_state.deleting_project_id = None
+                    st.rerun()
+
+
+def display_project_card(project):
+    """Helper function to display a project card"""
+    # Unpack only the needed values
+    project_id = project[0]
+    name = project[2]
+    description = project[3]
+    start_date = project[4]
+    end_date = project[5]
+    budget = project[6] if len(project) > 6 else None  # Safely get budget
+
+    with st.container():
+        # Format budget display safely
+        budget_display = "Not set"
+        if budget is not None:
+            try:
+                budget_display = f"${float(budget):,.2f}"
+            except (TypeError, ValueError):
+                budget_display = "Invalid value"
+
+        st.markdown(f"""
+            <div style="border: 1px solid #e0e0e0; border-radius: 8px; padding: 16px; margin-bottom: 16px;">
+                <h3>{name}</h3>
+                <p><strong>Description:</strong> {description or "No description"}</p>
+                <p><strong>Timeline:</strong> {start_date} to {end_date}</p>
+                <p><strong>Budget:</strong> {budget_display}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        # Fetch tasks for the current project
+        tasks = get_tasks(project_id)
+        if not tasks:
+            st.warning("No tasks found for this project.")
+        else:
+            # Calculate progress
+            completed_tasks = len([task for task in tasks if task[4] == "Completed"])
+            total_tasks = len(tasks)
+            progress = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
+
+            st.progress(int(progress))
+            st.write(f"**Progress:** {completed_tasks}/{total_tasks} tasks completed ({progress:.1f}%)")
+
+
+def display_project_card_with_gantt(project):
+    """Helper function to display a project card with Gantt chart"""
+    project_id = project[0]
+    name = project[2]
+    description = project[3]
+    start_date = project[4]
+    end_date = project[5]
+    budget = project[6] if len(project) > 6 else None
+
+    with st.container():
+        # Format budget display safely
+        budget_display = "Not set"
+        if budget is not None:
+            try:
+                budget_display = f"${float(budget):,.2f}"
+            except (TypeError, ValueError):
+                budget_display = "Invalid value"
+
+        st.markdown(f"""
+            <div style="border: 1px solid #e0e0e0; border-radius: 8px; padding: 16px; margin-bottom: 16px;">
+                <h3>{name}</h3>
+                <p><strong>Description:</strong> {description or "No description"}</p>
+                <p><strong>Timeline:</strong> {start_date} to {end_date}</p>
+                <p><strong>Budget:</strong> {budget_display}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        # Fetch tasks for the current project
+        tasks = get_tasks(project_id)
+        if not tasks:
+            st.warning("No tasks found for this project.")
+        else:
+            # Calculate progress
+            completed_tasks = len([task for task in tasks if task[4] == "Completed"])
+            total_tasks = len(tasks)
+            progress = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
+
+            st.progress(int(progress))
+            st.write(f"**Progress:** {completed_tasks}/{total_tasks} tasks completed ({progress:.1f}%)")
+
+            # Prepare Gantt chart data
+            gantt_data = []
+            for task in tasks:
+                task_start = datetime.strptime(task[11], "%Y-%m-%d").date() if task[11] else datetime.strptime(start_date, "%Y-%m-%d").date()
+                task_end = datetime.strptime(task[6], "%Y-%m-%d").date() if task[6] else task_start
+
+                gantt_data.append({
+                    "Task": task[2],
+                    "Start": task_start,
+                    "Finish": task_end,
+                    "Status": task[4],
+                    "Color": status_colors.get(task[4], "#f0f0f0")
+                })
+
+            # Create Gantt chart if there are tasks
+            if gantt_data:
+                st.subheader("📅 Project Timeline")
+                gantt_df = pd.DataFrame(gantt_data)
+                fig = px.timeline(
+                    gantt_df,
+                    x_start="Start",
+                    x_end="Finish",
+                    y="Task",
+                    color="Status",
+                    color_discrete_map=status_colors,
+                    title=f"Gantt Chart for {name}"
+                )
+                fig.update_yaxes(autorange="reversed")  # Show tasks in order
+                plotly_chart(fig, use_container_width=True)
+
+
+# Add this helper function somewhere in your helper functions section (before the page routing)
+def display_project_analytics_table(projects_data):
+    """Display the project analytics table with consistent styling"""
+    # Convert to DataFrame with correct column names
+    project_df = pd.DataFrame(projects_data, columns=[
+        "ID", "Owner ID", "Project", "Description", "Start Date", "End Date",
+        "Budget", "Actual Cost", "Budget Variance", "Total Tasks",
+        "Completed Tasks", "Owner", "Completion %",
+        "Planned Duration (days)", "Actual Duration (days)"
+    ])
+
+    # Ensure date columns are proper datetime objects
+    project_df["Start Date"] = pd.to_datetime(project_df["Start Date"])
+    project_df["End Date"] = pd.to_datetime(project_df["End Date"])
+
+    def format_date(date_val):
+        if pd.isna(date_val):
+            return ""
+        if isinstance(date_val, (pd.Timestamp, datetime.date)):
+            return date_val.strftime('%Y-%m-%d')
+        try:
+            return pd.to_datetime(date_val).strftime('%Y-%m-%d')
+        except:
+            return str(date_val)
+
+    def style_project_table(df):
+        """Style the project table with robust duration column handling"""
+        styled_df = df.copy()
+
+        # Safely format dates
+        styled_df["Start Date"] = pd.to_datetime(styled_df["Start Date"], errors='coerce').dt.strftime('%Y-%m-%d')
+        styled_df["End Date"] = pd.to_datetime(styled_df["End Date"], errors='coerce').dt.strftime('%Y-%m-%d')
+
+        # Robust duration formatting with error handling
+        def safe_duration_format(x):
+            try:
+                if pd.isna(x):
+                    return "N/A"
+                # Check if value is already numeric
+                if isinstance(x, (int, float)):
+                    return f"{float(x):.1f} days"
+                # Handle string representations of numbers
+                if isinstance(x, str) and x.replace('.', '', 1).isdigit():
+                    return f"{float(x):.1f} days"
+                return "N/A"
+            except (ValueError, TypeError):
+                return "N/A"
+
+        # Apply safe formatting to duration columns
+        styled_df["Planned Duration"] = styled_df["Planned Duration (days)"].apply(safe_duration_format)
+        styled_df["Actual Duration"] = styled_df["Actual Duration (days)"].apply(safe_duration_format)
+
+        # Format other columns with error handling
+        def safe_currency_format(x):
+            try:
+                return f"${float(x):,.2f}" if pd.notnull(x) and str(x).strip() else "$0.00"
+            except (ValueError, TypeError):
+                return "$0.00"
+
+        styled_df["Budget"] = styled_df["Budget"].apply(safe_currency_format)
+        styled_df["Actual Cost"] = styled_df["Actual Cost"].apply(safe_currency_format)
+        styled_df["Budget Variance"] = styled_df["Budget Variance"].apply(safe_currency_format)
+
+        # Safely format progress percentage
+        def safe_progress_format(x):
+            try:
+                return f"{float(x):.1f}%" if pd.notnull(x) and str(x).strip() else "0.0%"
+            except (ValueError, TypeError):
+                return "0.0%"
+
+        styled_df["Progress"] = styled_df["Completion %"].apply(safe_progress_format)
+
+        return styled_df[[
+            "Project", "Owner", "Start Date", "End Date",
+            "Planned Duration", "Actual Duration",
+            "Budget", "Actual Cost", "Budget Variance",
+            "Total Tasks", "Progress"
+        ]]
+
+    styled_df = style_project_table(project_df)
+
+    # Display the styled table with container styling
+    st.markdown("""
+    <div style="border-radius: 8px; overflow: hidden; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+        <div style="background-color: #f8f9fa; padding: 15px; border-bottom: 1px solid #e0e0e0;">
+            <h3 style="margin: 0; color: #2c3e50;">Project Analytics</h3>
+        </div>
+    """, unsafe_allow_html=True)
+
+    # Display the dataframe with Streamlit
+    st.dataframe(
+        styled_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Start Date": st.column_config.DateColumn("Start Date"),
+            "End Date": st.column_config.DateColumn("End Date"),
+            "Budget Variance": st.column_config.TextColumn("Budget Variance"),
+            "Planned Duration": st.column_config.TextColumn("Planned Duration"),
+            "Actual Duration": st.column_config.TextColumn("Actual Duration")
+        }
+    )
+
+    st.write("</div>", unsafe_allow_html=True)  # Close the styled container
+
+
+def show_projects_page():
+    """Render the Projects page"""
+    st.markdown("---")
+
+
+    # Header Section with Gradient
+    st.markdown("""
+        <div class="doc-header">
+            <h1 style="color: white; margin-bottom: 0.5rem;">📂 Projects</h1>
+            <p style="font-size: 1.1rem; opacity: 0.9;"></p>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 20px;'></div>", unsafe_allow_html=True)  
+
+    # Initialize success message state
+    if 'show_project_success' not in st.session_state:
+        st.session_state.show_project_success = False
+
+    # Display success message if flag is True
+    if st.session_state.show_project_success:
+        st.success("Project added successfully!")
+        st.session_state.show_project_success = False
+
+    # Fetch all users for owner dropdown
+    users = query_db("SELECT id, username FROM users")
+    user_options = {user[0]: user[1] for user in users}
+
+
+    # In the Projects page section, modify the "Add New Project" form as follows:
+
+    # ======= Add New Project Section =======
+    st.subheader("➕ Add New Project")
+
+    # Only show the project creation form if user is admin
+    if st.session_state.user_role == "Admin":
+
+        with st.expander("Create New Project", expanded=False):
+            with st.form(key="add_project_form", clear_on_submit=True):
+                name = st.text_input("Project Name*", help="Project name must be unique (case-insensitive)")
+                description = st.text_area("Description")
+
+                # Project Owner Dropdown
+                project_owner = st.selectbox(
+                    "Project Owner*",
+                    options=list(user_options.values()),
+                    format_func=lambda x: user_options.get(x, x)
+                )
+
+                # Project Dates
+                col1, col2 = st.columns(2)
+                with col1:
+                    start_date = st.date_input("Start Date*")
+                with col2:
+                    due_date = st.date_input("Due Date*")
+
+                # Project Budget
+                budget = st.number_input("Project Budget", min_value=0.0, value=0.0)
+
+                if st.form_submit_button("Add Project"):
+                    # Validate required fields
+                    if not name.strip():
+                        st.error("Project name is required")
+                    elif due_date < start_date:
+                        st.error("Due date must be on or after the start date")
+                    else:
+                        # Check for existing project name (case-insensitive)
+                        existing_project = query_db(
+                            "SELECT 1 FROM projects WHERE LOWER(name) = LOWER(?)", 
+                            (name.strip(),), 
+                            one=True
+                        )
+
+                        if existing_project:
+                            st.error(f"A project with name '{name.strip()}' already exists (case-insensitive check)")
+                        else:
+                            project_owner_id = [user_id for user_id, username in user_options.items() if username == project_owner][0]
+                            query_db("""
+                                    INSERT INTO projects (user_id, name, description, start_date, end_date, budget)
+                                    VALUES (?, ?, ?, ?, ?, ?)
+                                """, (project_owner_id, name.strip(), description, start_date, due_date, budget))
+                            st.session_state.show_project_success = True
+                            st.rerun()
+
+    else:
+        st.warning("⛔ Only administrators can create new projects. Please contact your admin.")                       
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 20px;'></div>", unsafe_allow_html=True)
+
+
+    # ======= Project Analytics Section =======
+    st.subheader("📂 Select Project")
+
+
+    # First fetch all project data (same as before)
+    projects_data = query_db("""
+            SELECT 
+                p.id, 
+                p.user_id as owner_id, 
+                p.name, 
+                p.description, 
+                p.start_date as planned_start_date,
+                p.end_date as planned_deadline,
+                p.budget,
+                ROUND(COALESCE(SUM(t.actual_cost), 0)) as actual_cost,
+                ROUND(p.budget - COALESCE(SUM(t.actual_cost), 0)) as budget_variance,
+                COUNT(t.id) as task_count,
+                SUM(CASE WHEN t.status = 'Completed' THEN 1 ELSE 0 END) as completed_tasks,
+                u.username as owner_name,
+                (ROUND(SUM(CASE WHEN t.status = 'Completed' THEN 1 ELSE 0 END) * 100.0 / 
+                NULLIF(COUNT(t.id), 0), 2)) as completion_pct,
+                julianday(p.end_date) - julianday(p.start_date) as planned_duration,
+                CASE
+                    WHEN MIN(t.actual_start_date) IS NULL OR MAX(t.actual_deadline) IS NULL THEN NULL
+                    ELSE julianday(MAX(t.actual_deadline)) - julianday(MIN(t.actual_start_date))
+                END as actual_duration
+            FROM projects p
+            LEFT JOIN tasks t ON t.project_id = p.id
+            LEFT JOIN users u ON p.user_id = u.id
+            GROUP BY p.id
+        """)
+
+    # Convert to DataFrame
+    project_df = pd.DataFrame(projects_data, columns=[
+        "ID", "Owner ID", "Project", "Description", "Planned Start Date", "Planned Deadline",
+        "Budget", "Actual Cost", "Budget Variance", "Total Tasks",
+        "Completed Tasks", "Owner", "Completion %",
+        "Planned Duration (days)", "Actual Duration (days)"
+    ])
+
+    # Ensure date columns are proper datetime objects
+    project_df["Planned Start Date"] = pd.to_datetime(project_df["Planned Start Date"])
+    project_df["Planned Deadline"] = pd.to_datetime(project_df["Planned Deadline"])
+
+    # Create filter widgets - matching your task page style but simplified
+    with st.expander("🔍 Filter Projects", expanded=False):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Project filter - matches your task page dropdown style
+            project_options = ['All Projects'] + sorted(project_df['Project'].unique().tolist())
+            selected_project = st.selectbox(
+                "Filter by Project", 
+                project_options,
+                key="project_filter"
+            )
+
+        with col2:
+            # Owner filter - matches your task page dropdown style
+            owner_options = ['All Owners'] + sorted(project_df['Owner'].dropna().unique().tolist())
+            selected_owner = st.selectbox(
+                "Filter by Owner",
+                owner_options,
+                key="owner_filter"
+            )
+
+    # Apply filters - same logic as your task page but simplified
+    filtered_df = project_df.copy()
+
+    if selected_project != 'All Projects':
+        filtered_df = filtered_df[filtered_df['Project'] == selected_project]
+
+    if selected_owner != 'All Owners':
+        filtered_df = filtered_df[filtered_df['Owner'] == selected_owner]
+
+    # Display the filtered table with same styling as your task page
+    st.subheader("📊 Project Analytics")
+
+    # Create a copy for display with formatted currency values
+    display_df = filtered_df.copy()
+
+    # Format currency columns as whole numbers (matches your task page style)
+    display_df["Actual Cost"] = display_df["Actual Cost"].apply(
+        lambda x: f"${int(x):,}" if pd.notnull(x) else "$0"
+    )
+    display_df["Budget Variance"] = display_df["Budget Variance"].apply(
+        lambda x: f"${int(x):,}" if pd.notnull(x) else "$0"
+    )
+    display_df["Budget"] = display_df["Budget"].apply(
+        lambda x: f"${int(x):,}" if pd.notnull(x) else "$0"
+    )
+
+    # Format durations (matches your task page style)
+    display_df["Planned Duration"] = display_df["Planned Duration (days)"].apply(
+        lambda x: f"{float(x):.1f} days" if pd.notnull(x) else "N/A"
+    )
+    display_df["Actual Duration"] = display_df["Actual Duration (days)"].apply(
+        lambda x: f"{float(x):.1f} days" if pd.notnull(x) else "N/A"
+    )
+
+    # Display the formatted table (matches your task page style)
+    st.dataframe(
+        display_df[[
+            "Project", "Owner", "Planned Start Date", "Planned Deadline",
+            "Planned Duration", "Actual Duration", "Total Tasks",
+            "Completed Tasks", "Completion %", "Budget", "Actual Cost",
+            "Budget Variance"
+        ]],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Planned Start Date": st.column_config.DateColumn("Planned Start Date"),
+            "Planned Deadline": st.column_config.DateColumn("Planned Deadline"),
+            "Completion %": st.column_config.NumberColumn(
+                "Completion %",
+                format="%.1f%%",
+                min_value=0,
+                max_value=100
+            )
+        }
+    )
+
+    st.write("</div>", unsafe_allow_html=True)  # Close the styled container
+
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 30px;'></div>", unsafe_allow_html=True)
+
+
+    # Visualization Tabs (controlled by the same filters)
+    tab1, tab2, tab3, tab4 = st.tabs(["Timeline", "Budget", "Analytics", "Duration"])
+
+    # In your Projects page section where you have tabs:
+    with tab1:  # Timeline tab
+        # First ensure the dataframe has the correct columns
+        if all(col in project_df.columns for col in ['Planned Start Date', 'Planned Deadline']):
+            plot_project_timeline(project_df)
+        else:
+            st.error("Required columns for timeline visualization not found in data")
+
+    with tab2:  # Budget tab
+        plot_budget_comparison(project_df)
+        plot_project_health(project_df)
+
+    with tab3:  # Analytics tab
+        plot_completion_heatmap(project_df)
+        plot_duration_variance(project_df)
+
+    with tab4:  # Add this as a new tab in your existing tab structure
+        st.subheader("⏱️ Duration Analysis")
+        # plot_plan_vs_actual_gantt(project_df)
+        # plot_duration_variance(project_df)
+        plot_duration_comparison(project_df)
+
+
+    # Divider with spacing
+    st.markdown("---")
+    st.markdown("<div style='margin-bottom: 20px;'></div>", unsafe_allow_html=True)
+
+
+    # ======= Project List Section =======
+    # ======= Project List Section =======
+    st.subheader("📋 Project List")
+
+    # Add custom CSS for card styling
+    st.markdown("""
+        <style>
+            /* Card styling */
+            .project-card {
+                border: 1px solid #e0e0e0;
+                border-radius: 8px;
+                padding: 16px;
+                margin-bottom: 20px;
+                background-color: #FFFFFF;
+                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+                height: 100%;
+                display: flex;
+                flex-direction: column;
+            }
+            
+            .project-card-header {
+                display: flex;
+                justify-content: space-between;
+                align-items: center;
+                margin-bottom: 12px;
+            }
+            
+            .project-card-title {
+                margin: 0;
+                color: #2c3e50;
+                font-size: 1.1rem;
+                font-weight: 600;
+                flex-grow: 1;
+                white-space: nowrap;
+                overflow: hidden;
+                text-overflow: ellipsis;
+            }
+            
+            .project-card-body {
+                flex-grow: 1;
+                margin-bottom: 12px;
+            }
+            
+            .project-card-description {
+                color: #666;
+                font-size: 0.9rem;
+                margin-bottom: 12px;
+                display: -webkit-box;
+                -webkit-line-clamp: 3;
+                -webkit-box-orient: vertical;
+                overflow: hidden;
+            }
+            
+            .project-card-detail {
+                display: flex;
+                align-items: center;
+                margin-bottom: 8px;
+                font-size: 0.85rem;
+            }
+            
+            .project-card-detail-icon {
+                margin-right: 8px;
+                color: #666;
+            }
+            
+            .project-card-footer {
+                margin-top: auto;
+                padding-top: 12px;
+                border-top: 1px solid #f0f0f0;
+                display: flex;
+                justify-content: space-between;
+                align-items: center;
+            }
+            
+            .project-status {
+                font-size: 0.8rem;
+                font-weight: 500;
+                padding: 4px 8px;
+                border-radius: 4px;
+            }
+            
+            .status-overdue {
+                background-color: #FFEBEE;
+                color: #D32F2F;
+            }
+            
+            .status-ontrack {
+                background-color: #E8F5E9;
+                color: #388E3C;
+            }
+            
+            .project-card-actions {
+                display: flex;
+                gap: 8px;
+            }
+            
+            /* Ensure columns have equal height */
+            [data-testid="column"] {
+                display: flex;
+                flex-direction: column;
+            }
+            
+            /* Make sure all cards in a row have equal height */
+            .stColumn > div {
+                height: 100%;
+            }
+        </style>
+        """, unsafe_allow_html=True)            
+
+    # Fetch all projects with additional details
+    projects = query_db("""
+            SELECT p.id, p.user_id, p.name, p.description, p.start_date, p.end_date, p.budget, 
+                u.username as owner_name
+            FROM projects p
+            LEFT JOIN users u ON p.user_id = u.id
+            ORDER BY p.name
+        """)
+
+    # Get user options for owner dropdown
+    users = query_db("SELECT id, username FROM users")
+    user_options = {user[0]: user[1] for user in users}
+
+    # Replace text search with dropdown selection
+    project_names = ["All Projects"] + [p[2] for p in projects]  # p[2] is the project name
+    selected_project = st.selectbox("🔍 Filter Projects", project_names)
+
+    # Get filtered projects
+    if selected_project == "All Projects":
+        filtered_projects = projects
+    else:
+        filtered_projects = [p for p in projects if p[2] == selected_project]
+
+    if not filtered_projects:
+        st.info("No projects found matching your selection.")
+    else:
+        # Display projects in a grid of cards
+        cols = st.columns(3)  # 3 columns for the grid
+        for idx, project in enumerate(filtered_projects):
+            project_id, owner_id, name, description, start_date, end_date, budget, owner_username = project
+
+            # Format dates and budget
+            start_fmt = datetime.strptime(start_date, "%Y-%m-%d").strftime("%b %d, %Y") if start_date else "Not set"
+            end_fmt = datetime.strptime(end_date, "%Y-%m-%d").strftime("%b %d, %Y") if end_date else "Not set"
+            budget_fmt = f"${float(budget):,.2f}" if budget else "Not set"
+
+            # Check if project is overdue
+            today = datetime.now().date()
+            end_date_obj = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else today
+            is_overdue = end_date_obj < today
+            status_class = "status-overdue" if is_overdue else "status-ontrack"
+            status_text = "⚠️ Overdue" if is_overdue else "🟢 On track"
+
+            with cols[idx % 3]:  # Distribute across columns
+                # Create a card container
+                st.markdown(f"""
+                    <div class="project-card">
+                        <div class="project-card-header">
+                            <h3 class="project-card-title" title="{name}">{name}</h3>
+                        </div>
+                        <div class="project-card-body">
+                            <p class="project-card-description" title="{description or 'No description provided'}">
+                                {description or "No description provided"}
+                            </p>
+                            <div class="project-card-detail">
+                                <span class="project-card-detail-icon">👤</span>
+                                <span>{owner_username}</span>
+                            </div>
+                            <div class="project-card-detail">
+                                <span class="project-card-detail-icon">📅</span>
+                                <span>{start_fmt} → {end_fmt}</span>
+                            </div>
+                            <div class="project-card-detail">
+                                <span class="project-card-detail-icon">💰</span>
+                                <span>{budget_fmt}</span>
+                            </div>
+                        </div>
+                        <div class="project-card-footer">
+                            <span class="project-status {status_class}">{status_text}</span>
+                            <div class="project-card-actions">
+                    """, unsafe_allow_html=True)
+
+                # Action buttons - Only show if admin or project owner
+                show_edit = st.session_state.user_role == "Admin" or owner_id == st.session_state.user_id
+                show_delete = st.session_state.user_role == "Admin"
+
+                if show_edit:
+                    if st.button("✏️ Edit", key=f"edit_{project_id}"):
+                        st.session_state['editing_project_id'] = project_id
+                        st.rerun()
+
+                if show_delete:
+                    if st.button("🗑️ Delete", key=f"delete_{project_id}"):
+                        st.session_state['deleting_project_id'] = project_id
+                        st.rerun()
+
+                st.markdown("""
+                            </div>
+                        </div>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+
+    # Edit Form Modal - This needs to be OUTSIDE the card display loop
+    if 'editing_project_id' in st.session_state and st.session_state.editing_project_id:
+        project_id = st.session_state.editing_project_id
+        project = next((p for p in projects if p[0] == project_id), None)
+
+        if project:
+            # Create a modal-like container
+            with st.expander(f"✏️ Editing Project: {project[2]}", expanded=True):
+                with st.form(f"edit_form_{project_id}"):
+                    new_name = st.text_input("Name", value=project[2])
+                    new_desc = st.text_area("Description", value=project[3])
+
+                    if st.session_state.user_role == "Admin":
+                        current_owner_name = user_options.get(project[1], "Unknown")
+                        new_owner_name = st.selectbox(
+                            "Owner",
+                            options=list(user_options.values()),
+                            index=list(user_options.values()).index(current_owner_name) if current_owner_name in user_options.values() else 0
+                        )
+                        new_owner_id = [uid for uid, uname in user_options.items() if uname == new_owner_name][0]
+                    else:
+                        new_owner_id = project[1]
+
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        new_start = st.date_input("Start Date", value=datetime.strptime(project[4], "%Y-%m-%d").date())
+                    with col2:
+                        new_end = st.date_input("Due Date", value=datetime.strptime(project[5], "%Y-%m-%d").date())
+
+                    new_budget = st.number_input("Budget", value=float(project[6]) if project[6] else 0.0, step=0.01)
+
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.form_submit_button("💾 Save Changes"):
+                            query_db("""
+                                    UPDATE projects SET 
+                                    name=?, description=?, user_id=?, 
+                                    start_date=?, end_date=?, budget=?
+                                    WHERE id=?
+                                """, (new_name, new_desc, new_owner_id, 
+                                new_start, new_end, new_budget, project_id))
+                            st.session_state.pop('editing_project_id', None)
+                            st.success("Project updated successfully!")
+                            st.rerun()
+                    with col2:
+                        if st.form_submit_button("❌ Cancel"):
+                            st.session_state.pop('editing_project_id', None)
+                            st.rerun()
+
+    # Delete Confirmation Modal - Also needs to be OUTSIDE the card display loop
+    if 'deleting_project_id' in st.session_state and st.session_state.deleting_project_id:
+        project_id = st.session_state.deleting_project_id
+        project = next((p for p in projects if p[0] == project_id), None)
+
+        if project:
+            # Create a modal-like container
+            with st.expander(f"🗑️ Delete Project: {project[2]}", expanded=True):
+                st.warning("⚠️ This action cannot be undone!")
+                st.error("All associated tasks and data will be permanently deleted!")
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button("✅ Confirm Deletion", key=f"confirm_delete_{project_id}", type="primary"):
+                        delete_project(project_id)
+                        st.session_state.pop('deleting_project_id', None)
+                        st.success("Project deleted successfully!")
+                        st.rerun()
+                with col2:
+                    if st.button("❌ Cancel", key=f"cancel_delete_{project_id}"):
+                        st.session_state.pop('deleting_project_id', None)
+                        st.rerun()
@@ -0,0 +1,191 @@
+# query_cache.py
+"""Process-wide cache of read query results with table-level invalidation.
+
+Entries are keyed on (SQL text, arguments, row factory) and tagged with the tables the
+statement reads. Any write that goes through database.run_query evicts every entry
+tagged with the table it modifies, so a session never sees its own edits - or another
+session's - go stale. Entries also expire after a TTL, which bounds staleness for
+writes made outside this process (another worker, a manual sqlite3 shell).
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from instrumentation import active_trace
+
+DEFAULT_TTL = float(os.environ.get('PM_QUERY_CACHE_TTL', 300))
+DEFAULT_MAX_ENTRIES = int(os.environ.get('PM_QUERY_CACHE_MAX_ENTRIES', 2048))
+DEFAULT_MAX_ROWS = int(os.environ.get('PM_QUERY_CACHE_MAX_ROWS', 20000))
+
+_READ_TABLES = re.compile(r'\b(?:FROM|JOIN)\s+["`\[]?([A-Za-z_]\w*)', re.IGNORECASE)
+_WRITE_TABLE = re.compile(
+    r'^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+["`\[]?([A-Za-z_]\w*)',
+    re.IGNORECASE,
+)
+_READ_STATEMENT = re.compile(r'^\s*(?:SELECT|WITH)\b', re.IGNORECASE)
+# Results that depend on the clock, the connection or chance must never be reused
+_UNCACHEABLE = re.compile(r"'now'|\brandom\s*\(|\blast_insert_rowid\s*\(|\bchanges\s*\(", re.IGNORECASE)
+
+
+def tables_read(query):
+    return {name.lower() for name in _READ_TABLES.findall(query)}
+
+
+def table_written(query):
+    """Table modified by an INSERT/UPDATE/DELETE/REPLACE, or None for any other statement"""
+    match = _WRITE_TABLE.match(query)
+    return match.group(1).lower() if match else None
+
+
+def is_read(query):
+    return bool(_READ_STATEMENT.match(query))
+
+
+def is_cacheable(query):
+    return is_read(query) and not _UNCACHEABLE.search(query)
+
+
+class QueryCache:
+    """LRU + TTL cache of query results, invalidated per table"""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, max_rows=DEFAULT_MAX_ROWS,
+                 enabled=True):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.enabled = enabled
+        self._entries = OrderedDict()      # key -> (rows, expires_at, tables)
+        self._by_table = {}                # table -> set of keys
+        self._generations = {}             # table -> write counter, guards against racing loads
+        self._dependents = {}              # table -> tables whose contents change with it
+        self._epoch = 0                    # bumped by clear()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # --- Lookup ---
+    def get_or_load(self, key, tables, loader):
+        """Return cached rows for key, or call loader() and cache what it returns"""
+        if not self.enabled:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            trace = active_trace()
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if trace is not None:
+                    trace.cache_lookup(True)
+                return list(entry[0])
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            if trace is not None:
+                trace.cache_lookup(False)
+            generations = {table: self._generations.get(table, 0) for table in tables}
+            epoch = self._epoch
+
+        rows = loader()
+
+        if len(rows) <= self.max_rows:
+            with self._lock:
+                # A write that landed while we were loading makes these rows suspect
+                if epoch == self._epoch and all(
+                        self._generations.get(table, 0) == gen for table, gen in generations.items()):
+                    self._store(key, rows, tables, time.monotonic() + self.ttl)
+        return list(rows)
+
+    def _store(self, key, rows, tables, expires_at):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (rows, expires_at, tables)
+        for table in tables:
+            self._by_table.setdefault(table, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        _, _, tables = self._entries.pop(key)
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    # --- Invalidation ---
+    def add_dependency(self, table, *dependent_tables):
+        """Declare that writes to `table` also change `dependent_tables` (e.g. via triggers)"""
+        with self._lock:
+            self._dependents.setdefault(table.lower(), set()).update(t.lower() for t in dependent_tables)
+
+    def _expand(self, tables):
+        pending, seen = list(tables), set()
+        while pending:
+            table = pending.pop()
+            if table not in seen:
+                seen.add(table)
+                pending.extend(self._dependents.get(table, ()))
+        return seen
+
+    def generation(self, table):
+        """Write counter for a table - changes whenever its cached results are invalidated"""
+        with self._lock:
+            return (self._epoch, self._generations.get(table.lower(), 0))
+
+    def invalidate_tables(self, *tables):
+        """Drop every entry that reads any of the given tables"""
+        with self._lock:
+            for table in self._expand(t.lower() for t in tables):
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in list(self._by_table.get(table, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._by_table.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+_cache = QueryCache()
+
+
+def get_cache():
+    return _cache
+
+
+def configure_cache(ttl=None, max_entries=None, max_rows=None, enabled=None):
+    """Update cache limits in place; safe to call on every rerun"""
+    cache = get_cache()
+    if ttl is not None:
+        cache.ttl = float(ttl)
+    if max_rows is not None:
+        cache.max_rows = int(max_rows)
+    if enabled is not None:
+        cache.enabled = bool(enabled)
+        if not cache.enabled:
+            cache.clear()
+    if max_entries is not None and int(max_entries) != cache.max_entries:
+        with cache._lock:
+            cache.max_entries = int(max_entries)
+            while len(cache._entries) > cache.max_entries:
+                cache._remove(next(iter(cache._entries)))
+                cache.evictions += 1
+    return cache
@@ -0,0 +1,251 @@
+# recurrence.py
+"""Recurring tasks, materialised ahead of time from RRULE-style patterns.
+
+A task whose `recurrence` column holds a pattern is a template. The engine expands
+each template's pattern lazily up to a horizon and bulk-inserts the occurrences as
+ordinary Pending tasks that point back at it through `recurrence_of`. All templates
+are read in one query and all new occurrences are written in one transaction. A
+unique index on (recurrence_of, deadline) makes repeated runs idempotent.
+
+Patterns are a subset of RFC 5545 RRULE, e.g. "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH"
+or "FREQ=MONTHLY;BYMONTHDAY=-1;COUNT=12":
+    FREQ        DAILY, WEEKLY, MONTHLY or YEARLY
+    INTERVAL    every n-th period (default 1)
+    BYDAY       weekdays MO..SU (DAILY and WEEKLY)
+    BYMONTHDAY  days of the month, negative counting from the end (MONTHLY)
+    COUNT       total occurrences, the template included
+    UNTIL       last possible date, YYYYMMDD or YYYY-MM-DD
+The legacy values "daily", "weekly" and "monthly" are still understood. "monthly"
+now means the same day each calendar month, not every 30 days. Unlike FREQ=MONTHLY
+it never skips a month: a template due on the 31st falls on the last day of shorter
+months.
+
+`python recurrence.py --horizon 90` expands every template once, from cron or by hand.
+"""
+import argparse
+import calendar
+import logging
+import threading
+from collections import namedtuple
+from datetime import date, timedelta
+
+from database import run_query, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HORIZON_DAYS = 60
+DEFAULT_INTERVAL = 3600     # seconds between scheduler runs
+
+WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+LEGACY_RULES = {'daily': 'FREQ=DAILY', 'weekly': 'FREQ=WEEKLY', 'monthly': 'FREQ=MONTHLY'}
+
+# clamp: move days a month does not have to its last day instead of skipping the month
+Rule = namedtuple('Rule', 'freq interval by_day by_month_day count until clamp', defaults=(False,))
+
+
+# --- Patterns ---
+def _parse_date(value):
+    value = value.strip()[:10].replace('-', '')
+    return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+
+
+def parse_rule(text):
+    """Rule for a recurrence pattern; raises ValueError for anything unsupported"""
+    clamp = text.strip().lower() == 'monthly'
+    text = LEGACY_RULES.get(text.strip().lower(), text.strip())
+    if text.upper().startswith('RRULE:'):
+        text = text[6:]
+    parts = {}
+    for part in filter(None, text.split(';')):
+        name, _, value = part.partition('=')
+        parts[name.strip().upper()] = value.strip().upper()
+
+    freq = parts.pop('FREQ', None)
+    if freq not in ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY'):
+        raise ValueError(f"Unsupported recurrence frequency: {freq!r}")
+    try:
+        interval = int(parts.pop('INTERVAL', 1))
+        by_day = tuple(sorted({WEEKDAYS[day] for day in parts.pop('BYDAY').split(',')})) if 'BYDAY' in parts else ()
+        by_month_day = tuple(int(day) for day in parts.pop('BYMONTHDAY').split(',')) if 'BYMONTHDAY' in parts else ()
+        count = int(parts.pop('COUNT')) if 'COUNT' in parts else None
+        until = _parse_date(parts.pop('UNTIL')) if 'UNTIL' in parts else None
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Invalid recurrence pattern {text!r}: {e}") from None
+    if parts:
+        raise ValueError(f"Unsupported recurrence parts: {', '.join(sorted(parts))}")
+    if interval < 1 or (count is not None and count < 1):
+        raise ValueError(f"Invalid recurrence pattern {text!r}")
+    if by_month_day and freq != 'MONTHLY' or by_day and freq not in ('DAILY', 'WEEKLY'):
+        raise ValueError(f"Unsupported recurrence pattern {text!r}")
+    return Rule(freq, interval, by_day, by_month_day, count, until, clamp)
+
+
+def _add_months(day, months):
+    month = day.month - 1 + months
+    return day.year + month // 12, month % 12 + 1
+
+
+def _period_dates(rule, start, k):
+    """Candidate dates of the k-th period of the rule, in order"""
+    step = k * rule.interval
+    if rule.freq == 'DAILY':
+        day = start + timedelta(days=step)
+        return [day] if not rule.by_day or day.weekday() in rule.by_day else []
+    if rule.freq == 'WEEKLY':
+        monday = start - timedelta(days=start.weekday()) + timedelta(weeks=step)
+        return [monday + timedelta(days=weekday) for weekday in (rule.by_day or (start.weekday(),))]
+    if rule.freq == 'MONTHLY':
+        year, month = _add_months(start, step)
+        length = calendar.monthrange(year, month)[1]
+        days = {day if day > 0 else length + day + 1 for day in (rule.by_month_day or (start.day,))}
+        if rule.clamp:
+            days = {min(day, length) for day in days}
+        # Days the month does not have (the 31st in April) are skipped, as in RFC 5545
+        return [date(year, month, day) for day in sorted(days) if 1 <= day <= length]
+    year = start.year + step
+    if start.month == 2 and start.day == 29 and not calendar.isleap(year):
+        return []
+    return [start.replace(year=year)]
+
+
+def _period_floor(rule, start, k):
+    """First day of the k-th period"""
+    step = k * rule.interval
+    if rule.freq == 'DAILY':
+        return start + timedelta(days=step)
+    if rule.freq == 'WEEKLY':
+        return start - timedelta(days=start.weekday()) + timedelta(weeks=step)
+    if rule.freq == 'MONTHLY':
+        return date(*_add_months(start, step), 1)
+    return date(start.year + step, 1, 1)
+
+
+def occurrences(rule, start, end):
+    """Dates of the rule from `start` (the first occurrence) up to `end`, generated lazily"""
+    if rule.until is not None:
+        end = min(end, rule.until)
+    produced = 0
+    k = 0
+    while _period_floor(rule, start, k) <= end:
+        for day in _period_dates(rule, start, k):
+            if day < start:
+                continue
+            if day > end:
+                return
+            yield day
+            produced += 1
+            if rule.count is not None and produced >= rule.count:
+                return
+        k += 1
+
+
+# --- Expansion ---
+_TEMPLATES_SQL = """
+    SELECT t.id, t.project_id, t.title, t.description, t.priority, t.assigned_to,
+           t.start_date, t.deadline, t.budget, t.time_spent, t.recurrence, MAX(o.deadline)
+    FROM tasks t
+    LEFT JOIN tasks o ON o.recurrence_of = t.id
+    WHERE t.recurrence IS NOT NULL AND t.recurrence != '' AND t.recurrence_of IS NULL
+      AND t.deadline IS NOT NULL {ids}
+    GROUP BY t.id
+"""
+
+_INSERT_OCCURRENCE = """
+    INSERT OR IGNORE INTO tasks (
+        project_id, title, description, status, priority, assigned_to,
+        start_date, deadline, budget, time_spent, recurrence_of
+    ) VALUES (?, ?, ?, 'Pending', ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _occurrence_rows(template, horizon_end):
+    (task_id, project_id, title, description, priority, assigned_to,
+     start_date, deadline, budget, time_spent, recurrence, last_deadline) = template
+    try:
+        rule = parse_rule(recurrence)
+        first = _parse_date(deadline)
+        lead = first - _parse_date(start_date) if start_date else None
+    except ValueError as e:
+        logger.warning("Skipping recurring task %s: %s", task_id, e)
+        return
+    last = _parse_date(last_deadline) if last_deadline else first
+    for day in occurrences(rule, first, horizon_end):
+        # The template is the first occurrence; later ones already stored are skipped
+        if day <= last:
+            continue
+        new_start = (day - lead).isoformat() if lead is not None else None
+        yield (project_id, title, description, priority, assigned_to,
+               new_start, day.isoformat(), budget, time_spent, task_id)
+
+
+def expand_recurring_tasks(horizon_days=DEFAULT_HORIZON_DAYS, today=None, task_ids=None):
+    """Insert every occurrence due within horizon_days that is not stored yet; returns how many.
+
+    task_ids limits the run to those templates. Safe to call any number of times.
+    """
+    horizon_end = (today or date.today()) + timedelta(days=int(horizon_days))
+    if task_ids is None:
+        templates = run_query(_TEMPLATES_SQL.format(ids=""), use_cache=False)
+    else:
+        task_ids = [int(task_id) for task_id in task_ids]
+        if not task_ids:
+            return 0
+        ids = f"AND t.id IN ({','.join('?' * len(task_ids))})"
+        templates = run_query(_TEMPLATES_SQL.format(ids=ids), task_ids, use_cache=False)
+
+    rows = [row for template in templates for row in _occurrence_rows(template, horizon_end)]
+    if not rows:
+        return 0
+    with transaction('tasks') as conn:
+        inserted = conn.executemany(_INSERT_OCCURRENCE, rows).rowcount
+    logger.info("Materialised %d recurring task occurrence(s)", inserted)
+    return inserted
+
+
+# --- Scheduler ---
+class RecurrenceScheduler(threading.Thread):
+    """Daemon thread that keeps occurrences materialised up to the horizon"""
+
+    def __init__(self, horizon_days=DEFAULT_HORIZON_DAYS, interval=DEFAULT_INTERVAL):
+        super().__init__(name="recurrence-scheduler", daemon=True)
+        self.horizon_days = int(horizon_days)
+        self.interval = float(interval)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                expand_recurring_tasks(self.horizon_days)
+            except Exception:
+                logger.exception("Recurring task expansion failed")
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def start_recurrence_scheduler(recurrence_settings):
+    """Start the process-wide scheduler once, from the [recurrence] secrets section"""
+    global _scheduler
+    settings = dict(recurrence_settings)
+    if not settings.get("enabled", True):
+        return None
+    with _scheduler_lock:
+        if _scheduler is None or not _scheduler.is_alive():
+            _scheduler = RecurrenceScheduler(
+                horizon_days=settings.get("horizon_days", DEFAULT_HORIZON_DAYS),
+                interval=settings.get("interval", DEFAULT_INTERVAL),
+            )
+            _scheduler.start()
+    return _scheduler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Materialise recurring task occurrences")
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON_DAYS, help="days ahead to expand")
+    options = parser.parse_args()
+    print(f"Inserted {expand_recurring_tasks(options.horizon)} occurrence(s)")
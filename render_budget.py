@@ -0,0 +1,95 @@
+# render_budget.py
+"""Per-rerun timing report.
+
+Streamlit executes app.py top to bottom on every interaction. app.py marks the parts
+of a rerun with checkpoint(). Each checkpoint ends the section the previous one
+started, so marking a section costs one clock read and needs no re-indenting.
+show_rerun_report() closes the last section. It lists every section's cost in a
+sidebar expander and logs a warning when the rerun goes over budget_ms. Sections
+are also recorded in the rerun's trace when instrumentation.py is enabled.
+
+Off by default. Turn it on with the optional [render_budget] section of secrets.toml:
+
+    [render_budget]
+    enabled = true
+    budget_ms = 300
+"""
+import logging
+import threading
+import time
+
+import streamlit as st
+
+from instrumentation import active_trace, finish_trace, start_trace
+
+logger = logging.getLogger(__name__)
+
+_settings = {"enabled": False, "budget_ms": 500.0, "show_report": True}
+
+# Streamlit runs each session's reruns on that session's script thread
+_rerun = threading.local()
+
+
+def configure_render_budget(enabled=False, budget_ms=500, show_report=True):
+    """Apply the [render_budget] settings; show_report = false only logs over-budget reruns"""
+    _settings.update(enabled=bool(enabled), budget_ms=float(budget_ms), show_report=bool(show_report))
+
+
+def start_rerun(section="Startup"):
+    """Start timing a rerun, with `section` as its first section"""
+    start_trace()
+    now = time.perf_counter()
+    _rerun.started = now
+    _rerun.section = section
+    _rerun.section_started = now
+    _rerun.sections = []
+
+
+def _close_section(now):
+    duration = now - _rerun.section_started
+    _rerun.sections.append((_rerun.section, duration))
+    trace = active_trace()
+    if trace is not None:
+        trace.add("section", _rerun.section, _rerun.section_started, duration)
+
+
+def checkpoint(section):
+    """End the running section and start `section`"""
+    if getattr(_rerun, "sections", None) is None:
+        return
+    now = time.perf_counter()
+    _close_section(now)
+    _rerun.section = section
+    _rerun.section_started = now
+
+
+def rerun_timings():
+    """(section, seconds) pairs for the current rerun so far, the running section included"""
+    if getattr(_rerun, "sections", None) is None:
+        return []
+    return _rerun.sections + [(_rerun.section, time.perf_counter() - _rerun.section_started)]
+
+
+def show_rerun_report(label=""):
+    """End the rerun's timing; report it when enabled. Returns the total in milliseconds."""
+    timings = rerun_timings()
+    if timings:
+        _close_section(time.perf_counter())
+        _rerun.sections = None
+    finish_trace(label)
+    if not timings or not _settings["enabled"]:
+        return None
+    total_ms = sum(seconds for _, seconds in timings) * 1000
+    budget_ms = _settings["budget_ms"]
+    if total_ms > budget_ms:
+        slowest, seconds = max(timings, key=lambda timing: timing[1])
+        logger.warning("Rerun %s took %.0f ms (budget %.0f ms); slowest section %s at %.0f ms",
+                       label, total_ms, budget_ms, slowest, seconds * 1000)
+
+    if _settings["show_report"]:
+        rows = "\n".join(f"| {name} | {seconds * 1000:.1f} | {seconds * 100000 / max(total_ms, 1e-9):.0f}% |"
+                         for name, seconds in timings)
+        with st.sidebar.expander(f"⏱️ Rerun: {total_ms:.0f} ms"):
+            st.markdown(f"| Section | ms | Share |\n|---|---:|---:|\n{rows}")
+            st.caption(f"{'Over' if total_ms > budget_ms else 'Within'} the {budget_ms:.0f} ms budget")
+    return total_ms
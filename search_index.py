@@ -0,0 +1,200 @@
+# search_index.py
+"""Full-text search over discussions, tasks, subtasks and comments (SQLite FTS5).
+
+One FTS5 table, search_index, holds a (title, body) pair for every discussion topic
+and message, task, subtask and comment. Triggers on the source tables keep it in
+sync. The rowid encodes where a row came from: source id * KIND_SLOTS + kind. That
+lets the triggers update entries by rowid and lets a search join hits back to their
+source rows. A search is one ranked query with highlighted titles and snippets,
+whatever the number of topics or messages.
+
+`python search_index.py` rebuilds the index from the source tables, for data repair.
+"""
+import argparse
+import html
+import re
+
+from database import run_query, transaction
+from query_cache import get_cache
+
+KIND_SLOTS = 8
+KIND_TOPIC = 1
+KIND_MESSAGE = 2
+KIND_TASK = 3
+KIND_SUBTASK = 4
+KIND_COMMENT = 5
+
+KIND_LABELS = {
+    KIND_TOPIC: "Discussion",
+    KIND_MESSAGE: "Message",
+    KIND_TASK: "Task",
+    KIND_SUBTASK: "Subtask",
+    KIND_COMMENT: "Comment",
+}
+
+# FTS5 marks matches with these control characters; highlight_html() swaps them for
+# markup once the text itself is escaped
+MATCH_OPEN = '\x02'
+MATCH_CLOSE = '\x03'
+
+# Same look as the Discussions tab's substring highlighting
+HIGHLIGHT_OPEN = '<span class="search-highlight">'
+HIGHLIGHT_CLOSE = '</span>'
+
+SEARCH_INDEX_DDL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )
+"""
+
+# table -> (kind, title expression, body expression, columns whose update re-indexes)
+_SOURCES = {
+    'discussion_topics': (KIND_TOPIC, "{row}.topic", "''", "topic"),
+    'discussion_messages': (KIND_MESSAGE, "''", "{row}.message", "message"),
+    'tasks': (KIND_TASK, "{row}.title", "COALESCE({row}.description, '')", "title, description"),
+    'subtasks': (KIND_SUBTASK, "{row}.title", "COALESCE({row}.description, '')", "title, description"),
+    'comments': (KIND_COMMENT, "''", "{row}.comment", "comment"),
+}
+
+
+def _index_row(kind, title, body, row):
+    return (f"INSERT INTO search_index (rowid, title, body) VALUES "
+            f"({row}.id * {KIND_SLOTS} + {kind}, {title.format(row=row)}, {body.format(row=row)});")
+
+
+def _unindex_row(kind, row):
+    return f"DELETE FROM search_index WHERE rowid = {row}.id * {KIND_SLOTS} + {kind};"
+
+
+def _triggers():
+    triggers = {}
+    for table, (kind, title, body, columns) in _SOURCES.items():
+        triggers[f'search_{table}_insert'] = (
+            f"AFTER INSERT ON {table} BEGIN {_index_row(kind, title, body, 'NEW')} END")
+        triggers[f'search_{table}_delete'] = (
+            f"AFTER DELETE ON {table} BEGIN {_unindex_row(kind, 'OLD')} END")
+        triggers[f'search_{table}_update'] = (
+            f"AFTER UPDATE OF {columns} ON {table} BEGIN "
+            f"{_unindex_row(kind, 'OLD')} {_index_row(kind, title, body, 'NEW')} END")
+    return triggers
+
+
+SEARCH_TRIGGERS = _triggers()
+
+_BACKFILL = ["DELETE FROM search_index"] + [
+    f"INSERT INTO search_index (rowid, title, body) "
+    f"SELECT id * {KIND_SLOTS} + {kind}, {title.format(row=table)}, {body.format(row=table)} FROM {table}"
+    for table, (kind, title, body, _) in _SOURCES.items()
+]
+
+# The triggers rewrite the index whenever a source table changes
+_cache = get_cache()
+for _table in _SOURCES:
+    _cache.add_dependency(_table, 'search_index')
+
+
+# --- Maintenance ---
+def install_search_index(c):
+    """Create the index and its triggers and fill it from the current rows"""
+    c.execute(SEARCH_INDEX_DDL)
+    for name, body in SEARCH_TRIGGERS.items():
+        c.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    for statement in _BACKFILL:
+        c.execute(statement)
+
+
+def rebuild_search_index():
+    """Re-index every source row and merge the index segments"""
+    with transaction('search_index') as conn:
+        for statement in _BACKFILL:
+            conn.execute(statement)
+        conn.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+
+
+# --- Queries ---
+def match_expression(text):
+    """FTS5 query for free text: every word must appear, each as a prefix. None if no words."""
+    words = re.findall(r"\w+", text or "")
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+_HITS = f"""
+    SELECT rowid % {KIND_SLOTS} AS kind, rowid / {KIND_SLOTS} AS ref_id, rank,
+           highlight(search_index, 0, '{MATCH_OPEN}', '{MATCH_CLOSE}') AS title,
+           snippet(search_index, 1, '{MATCH_OPEN}', '{MATCH_CLOSE}', '…', 16) AS snippet
+    FROM search_index
+    WHERE search_index MATCH ?1
+"""
+
+# Resolves each hit to its project, task and topic
+_SEARCH_SQL = f"""
+    SELECT h.kind, h.ref_id, h.title, h.snippet,
+           COALESCE(dt.project_id, tk.project_id) AS project_id, p.name,
+           tk.id AS task_id, tk.title AS task_title, dt.id AS topic_id, dt.topic
+    FROM ({_HITS}) h
+    LEFT JOIN discussion_messages m ON h.kind = {KIND_MESSAGE} AND m.id = h.ref_id
+    LEFT JOIN discussion_topics dt
+        ON dt.id = CASE h.kind WHEN {KIND_TOPIC} THEN h.ref_id WHEN {KIND_MESSAGE} THEN m.topic_id END
+    LEFT JOIN subtasks s ON h.kind = {KIND_SUBTASK} AND s.id = h.ref_id
+    LEFT JOIN comments c ON h.kind = {KIND_COMMENT} AND c.id = h.ref_id
+    LEFT JOIN tasks tk
+        ON tk.id = CASE h.kind WHEN {KIND_TASK} THEN h.ref_id WHEN {KIND_SUBTASK} THEN s.task_id
+                               WHEN {KIND_COMMENT} THEN c.task_id END
+    LEFT JOIN projects p ON p.id = COALESCE(dt.project_id, tk.project_id)
+    WHERE (?2 IS NULL OR tk.assigned_to = ?2 OR p.user_id = ?2 OR p.id IN (
+        SELECT project_id FROM project_team WHERE user_id = ?2
+    ))
+    ORDER BY h.rank
+    LIMIT ?3
+"""
+
+
+def highlight_html(text):
+    """Escape indexed text for HTML and turn its match markers into highlight spans"""
+    return (html.escape(text or "")
+            .replace(MATCH_OPEN, HIGHLIGHT_OPEN)
+            .replace(MATCH_CLOSE, HIGHLIGHT_CLOSE))
+
+
+def search(text, user_id=None, limit=20):
+    """Ranked hits for free text, best first.
+
+    Each hit is (kind, id, highlighted title, highlighted snippet, project id, project
+    name, task id, task title, topic id, topic). The title and snippet are escaped HTML
+    (see highlight_html); the other fields are plain text. user_id limits the hits to
+    that user's projects and assigned tasks; None searches everything (the Admin view).
+    """
+    expression = match_expression(text)
+    if expression is None:
+        return []
+    return [(kind, ref_id, highlight_html(title), highlight_html(snippet)) + tuple(rest)
+            for kind, ref_id, title, snippet, *rest
+            in run_query(_SEARCH_SQL, (expression, user_id, int(limit)))]
+
+
+def search_discussions(project_id, text):
+    """{topic id: whether the topic title itself matched} for the project's active topics
+    whose title or messages match the text"""
+    expression = match_expression(text)
+    if expression is None:
+        return {}
+    rows = run_query(f"""
+        SELECT dt.id, MAX(h.kind = {KIND_TOPIC})
+        FROM (
+            SELECT rowid % {KIND_SLOTS} AS kind, rowid / {KIND_SLOTS} AS ref_id
+            FROM search_index WHERE search_index MATCH ?
+        ) h
+        LEFT JOIN discussion_messages m ON h.kind = {KIND_MESSAGE} AND m.id = h.ref_id
+        JOIN discussion_topics dt
+            ON dt.id = CASE h.kind WHEN {KIND_TOPIC} THEN h.ref_id WHEN {KIND_MESSAGE} THEN m.topic_id END
+        WHERE dt.project_id = ? AND NOT COALESCE(dt.is_archived, 0)
+        GROUP BY dt.id
+    """, (expression, project_id))
+    return {topic_id: bool(title_match) for topic_id, title_match in rows}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the full-text search index")
+    parser.parse_args()
+    rebuild_search_index()
+    print("Search index rebuilt")
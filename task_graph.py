@@ -0,0 +1,177 @@
+# task_graph.py
+"""In-memory dependency graph of a project's tasks, with critical-path scheduling.
+
+A project's tasks and task_dependencies edges are loaded in one query and turned into
+a graph that answers the questions the pages used to ask one row at a time: can this
+task be completed, would a new dependency create a cycle, which tasks are critical.
+
+Scheduling is the classic critical path method over task durations (deadline minus
+start date, in days; 0 when either date is missing): earliest and latest start, slack
+and the zero-slack tasks that make up the critical path. Graphs are cached per project
+in the shared query cache and rebuilt after any task or dependency write.
+"""
+import heapq
+from datetime import date
+
+from database import run_query
+from query_cache import get_cache
+
+# Slack below this many days counts as zero (durations are float day counts)
+SLACK_EPSILON = 1e-9
+
+
+class TaskGraph:
+    """Tasks of one project and the dependencies between them.
+
+    predecessors[t] are the tasks t depends on, successors[t] the tasks that depend on t.
+    Dependencies on tasks outside the project are kept in `external` (task -> {id: status})
+    so completion checks still see them, but they take no part in scheduling.
+    """
+
+    def __init__(self, project_id, tasks, edges, external):
+        self.project_id = project_id
+        self.tasks = tasks                      # id -> (title, status, duration in days)
+        self.edges = edges                      # [(task_id, depends_on_task_id)]
+        self.external = external
+        self.predecessors = {task_id: set() for task_id in tasks}
+        self.successors = {task_id: set() for task_id in tasks}
+        for task_id, depends_on in edges:
+            self.predecessors[task_id].add(depends_on)
+            self.successors[depends_on].add(task_id)
+
+        self.order, self.cyclic = self._topological_order()
+        self.earliest_start = {}
+        self.latest_start = {}
+        self.slack = {}
+        self.project_duration = 0.0
+        if not self.cyclic:
+            self._schedule()
+
+    # --- Structure ---
+    def _topological_order(self):
+        """Kahn's algorithm, lowest id first; tasks left over sit on or behind a cycle"""
+        indegree = {task_id: len(preds) for task_id, preds in self.predecessors.items()}
+        ready = [task_id for task_id, count in indegree.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            task_id = heapq.heappop(ready)
+            order.append(task_id)
+            for successor in self.successors[task_id]:
+                indegree[successor] -= 1
+                if indegree[successor] == 0:
+                    heapq.heappush(ready, successor)
+        return order, {task_id for task_id, count in indegree.items() if count > 0}
+
+    def has_cycle(self):
+        return bool(self.cyclic)
+
+    def ancestors(self, task_id):
+        """Every task task_id depends on, directly or transitively"""
+        seen = set()
+        stack = list(self.predecessors.get(task_id, ()))
+        while stack:
+            current = stack.pop()
+            if current not in seen:
+                seen.add(current)
+                stack.extend(self.predecessors.get(current, ()))
+        return seen
+
+    def creates_cycle(self, task_id, depends_on_ids):
+        """Whether making task_id depend on depends_on_ids would close a loop"""
+        depends_on_ids = set(depends_on_ids)
+        if task_id in depends_on_ids:
+            return True
+        return any(task_id in self.ancestors(dep) for dep in depends_on_ids if dep in self.tasks)
+
+    # --- Completion ---
+    def blocking_dependencies(self, task_id):
+        """Ids of the tasks task_id depends on that are not Completed yet"""
+        blocking = [dep for dep in self.predecessors.get(task_id, ())
+                    if self.tasks[dep][1] != "Completed"]
+        blocking += [dep for dep, status in self.external.get(task_id, {}).items() if status != "Completed"]
+        return sorted(blocking)
+
+    def can_complete(self, task_id):
+        return not self.blocking_dependencies(task_id)
+
+    # --- Critical path ---
+    def _schedule(self):
+        earliest_finish = {}
+        for task_id in self.order:
+            start = max((earliest_finish[pred] for pred in self.predecessors[task_id]), default=0.0)
+            self.earliest_start[task_id] = start
+            earliest_finish[task_id] = start + self.tasks[task_id][2]
+        self.project_duration = max(earliest_finish.values(), default=0.0)
+
+        for task_id in reversed(self.order):
+            finish = min((self.latest_start[succ] for succ in self.successors[task_id]),
+                         default=self.project_duration)
+            self.latest_start[task_id] = finish - self.tasks[task_id][2]
+            self.slack[task_id] = self.latest_start[task_id] - self.earliest_start[task_id]
+
+    def is_critical(self, task_id):
+        return task_id in self.slack and self.slack[task_id] <= SLACK_EPSILON
+
+    def is_critical_edge(self, task_id, depends_on):
+        """Whether the dependency is tight: both tasks critical and no gap between them"""
+        if not (self.is_critical(task_id) and self.is_critical(depends_on)):
+            return False
+        finish = self.earliest_start[depends_on] + self.tasks[depends_on][2]
+        return abs(self.earliest_start[task_id] - finish) <= SLACK_EPSILON
+
+    def critical_path(self):
+        """Zero-slack task ids in topological order; empty when the graph has a cycle"""
+        return [task_id for task_id in self.order if self.is_critical(task_id)]
+
+
+def _duration_days(start_date, deadline):
+    if not start_date or not deadline:
+        return 0.0
+    try:
+        days = (date.fromisoformat(str(deadline)[:10]) - date.fromisoformat(str(start_date)[:10])).days
+    except ValueError:
+        return 0.0
+    return float(max(days, 0))
+
+
+def _build_task_graph(project_id):
+    rows = run_query("""
+        SELECT t.id, t.title, t.status, t.start_date, t.deadline,
+               d.depends_on_task_id, p.status
+        FROM tasks t
+        LEFT JOIN task_dependencies d ON d.task_id = t.id
+        LEFT JOIN tasks p ON p.id = d.depends_on_task_id
+        WHERE t.project_id IS ?
+    """, (project_id,), use_cache=False)
+
+    tasks = {}
+    for task_id, title, status, start_date, deadline, *_ in rows:
+        tasks[task_id] = (title, status, _duration_days(start_date, deadline))
+
+    edges, external = [], {}
+    for task_id, *_, depends_on, dep_status in rows:
+        if depends_on is None:
+            continue
+        if depends_on in tasks:
+            edges.append((task_id, depends_on))
+        else:
+            # Another project's task, or a dangling id (None status, never Completed)
+            external.setdefault(task_id, {})[depends_on] = dep_status
+    return TaskGraph(project_id, tasks, edges, external)
+
+
+def load_task_graph(project_id):
+    """The project's TaskGraph, cached until a task or dependency changes. Treat it as read-only."""
+    return get_cache().get_or_load(
+        ('task_graph', project_id), ('tasks', 'task_dependencies'),
+        lambda: [_build_task_graph(project_id)]
+    )[0]
+
+
+def can_complete_task(task_id):
+    """Whether every task this one depends on is Completed"""
+    row = run_query("SELECT project_id FROM tasks WHERE id = ?", (task_id,), one=True)
+    if not row:
+        return False
+    return load_task_graph(row[0]).can_complete(task_id)
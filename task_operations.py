@@ -0,0 +1,177 @@
+# task_operations.py
+"""Bulk task writes, each applied as one transaction.
+
+Every function takes a list of task ids (delete_project a project id) and issues a
+handful of set-based statements inside database.transaction(), so changing hundreds
+of tasks costs one commit rather than one per row per table.
+
+They keep the rules the single-task edits follow: a task cannot be completed while a
+task it depends on is open, a task with subtasks takes its status and dates from
+them (task_rollups), and new assignees get an assignment email.
+"""
+from html import escape
+
+from attachments import release_blob
+from database import after_commit, run_query, transaction
+from email_outbox import enqueue_email
+from task_graph import load_task_graph
+from task_rollups import recompute_task_rollups, update_parent_status
+from user_directory import get_email, get_username
+
+
+def _id_list(task_ids):
+    task_ids = [int(task_id) for task_id in task_ids]
+    return task_ids, ",".join("?" * len(task_ids))
+
+
+def delete_tasks(task_ids):
+    """Delete tasks with their dependencies, comments, subtasks and attachments"""
+    task_ids, marks = _id_list(task_ids)
+    if not task_ids:
+        return 0
+    with transaction():
+        hashes = {row[0] for row in run_query(
+            f"SELECT DISTINCT content_hash FROM attachments WHERE task_id IN ({marks}) AND content_hash IS NOT NULL",
+            task_ids)}
+        run_query(f"DELETE FROM task_dependencies WHERE task_id IN ({marks}) OR depends_on_task_id IN ({marks})",
+                  task_ids + task_ids)
+        run_query(f"DELETE FROM comments WHERE task_id IN ({marks})", task_ids)
+        run_query(f"DELETE FROM subtasks WHERE task_id IN ({marks})", task_ids)
+        run_query(f"DELETE FROM attachments WHERE task_id IN ({marks})", task_ids)
+        run_query(f"DELETE FROM tasks WHERE id IN ({marks})", task_ids)
+        # Blob files are only removed once the rows referencing them are gone for good
+        for content_hash in hashes:
+            after_commit(lambda content_hash=content_hash: release_blob(content_hash))
+    return len(task_ids)
+
+
+def delete_project(project_id):
+    """Delete a project with its tasks (see delete_tasks), attachments, team and discussions"""
+    with transaction():
+        task_ids = [row[0] for row in run_query(
+            "SELECT id FROM tasks WHERE project_id=?", (project_id,), use_cache=False)]
+        delete_tasks(task_ids)
+        # Attachments filed on the project itself rather than on one of its tasks
+        hashes = {row[0] for row in run_query(
+            "SELECT DISTINCT content_hash FROM attachments WHERE project_id=? AND content_hash IS NOT NULL",
+            (project_id,), use_cache=False)}
+        run_query("DELETE FROM attachments WHERE project_id=?", (project_id,))
+        run_query("""
+            DELETE FROM discussion_messages
+            WHERE topic_id IN (SELECT id FROM discussion_topics WHERE project_id=?)
+        """, (project_id,))
+        run_query("DELETE FROM discussion_topics WHERE project_id=?", (project_id,))
+        run_query("DELETE FROM project_team WHERE project_id=?", (project_id,))
+        run_query("DELETE FROM projects WHERE id=?", (project_id,))
+        for content_hash in hashes:
+            after_commit(lambda content_hash=content_hash: release_blob(content_hash))
+
+
+def _blocked_from_completion(task_ids):
+    """Ids among task_ids that cannot be completed: they have open subtasks, or an open
+    dependency that is not being completed with them"""
+    _, marks = _id_list(task_ids)
+    blocking = {}
+    for task_id, project_id in run_query(f"SELECT id, project_id FROM tasks WHERE id IN ({marks})",
+                                         task_ids, use_cache=False):
+        blocking[task_id] = set(load_task_graph(project_id).blocking_dependencies(task_id))
+    # A task with subtasks is only Completed once they all are
+    blocked = {row[0] for row in run_query(
+        f"SELECT task_id FROM subtask_status_counts WHERE task_id IN ({marks}) AND completed < total",
+        task_ids, use_cache=False)}
+    while True:
+        completing = blocking.keys() - blocked
+        newly = {task_id for task_id in completing if blocking[task_id] - completing}
+        if not newly:
+            return sorted(blocked)
+        blocked |= newly
+
+
+def _roll_up_from_subtasks(task_ids):
+    """Re-derive the status and dates of the tasks that have subtasks"""
+    _, marks = _id_list(task_ids)
+    for (task_id,) in run_query(
+            f"SELECT task_id FROM subtask_status_counts WHERE task_id IN ({marks}) AND total > 0",
+            task_ids, use_cache=False):
+        update_parent_status(task_id)
+    recompute_task_rollups(task_ids)
+
+
+def set_task_status(task_ids, status):
+    """Set the status of the tasks; returns (number updated, ids skipped).
+
+    When completing, tasks with open subtasks or dependencies are skipped. Tasks with
+    subtasks end up with the status their subtasks give them.
+    """
+    task_ids, marks = _id_list(task_ids)
+    if not task_ids:
+        return 0, []
+    with transaction('tasks'):
+        blocked = _blocked_from_completion(task_ids) if status == "Completed" else []
+        task_ids = [task_id for task_id in task_ids if task_id not in blocked]
+        if task_ids:
+            _, marks = _id_list(task_ids)
+            run_query(f"UPDATE tasks SET status=? WHERE id IN ({marks})", [status] + task_ids)
+            _roll_up_from_subtasks(task_ids)
+    return len(task_ids), blocked
+
+
+def _assignment_email(title, project_name, deadline, assigner_name):
+    return f"""
+        <html>
+            <body>
+                <h2>You have been assigned a task</h2>
+                <p><strong>Task:</strong> {escape(title or '')}</p>
+                <p><strong>Project:</strong> {escape(project_name or 'No project')}</p>
+                <p><strong>Deadline:</strong> {escape(deadline or 'Not set')}</p>
+                <p><strong>Assigned by:</strong> {escape(assigner_name)}</p>
+                <br>
+                <p>Please log in to the system to view and update this assignment.</p>
+            </body>
+        </html>
+        """
+
+
+def reassign_tasks(task_ids, user_id, assigned_by=None):
+    """Assign every task to user_id (None to unassign) and email the new assignee.
+
+    The emails are queued in the same transaction, so they are sent only if the
+    reassignment commits. Tasks already assigned to user_id get no email.
+    """
+    task_ids, marks = _id_list(task_ids)
+    if not task_ids:
+        return 0
+    with transaction('tasks'):
+        changed = run_query(f"""
+            SELECT t.id, t.title, p.name, t.deadline, t.assigned_to
+            FROM tasks t LEFT JOIN projects p ON p.id = t.project_id
+            WHERE t.id IN ({marks}) AND t.assigned_to IS NOT ?
+        """, task_ids + [user_id], use_cache=False)
+        run_query(f"UPDATE tasks SET assigned_to=? WHERE id IN ({marks})", [user_id] + task_ids)
+        recipient = get_email(user_id) if user_id is not None else None
+        if recipient:
+            assigner_name = get_username(assigned_by, "System")
+            for _, title, project_name, deadline, previous in changed:
+                enqueue_email(recipient, f"Task Assigned to You: {title}",
+                              _assignment_email(title, project_name, deadline, assigner_name),
+                              cc=get_email(previous) if previous is not None else None)
+    return len(task_ids)
+
+
+def shift_task_dates(task_ids, days):
+    """Move the planned start and deadline of the tasks and their subtasks by `days`"""
+    task_ids, marks = _id_list(task_ids)
+    if not task_ids or not days:
+        return 0
+    offset = f"{int(days):+d} days"
+    with transaction():
+        run_query(f"""
+            UPDATE tasks SET start_date = date(start_date, ?), deadline = date(deadline, ?)
+            WHERE id IN ({marks})
+        """, [offset, offset] + task_ids)
+        run_query(f"""
+            UPDATE subtasks SET start_date = date(start_date, ?), deadline = date(deadline, ?)
+            WHERE task_id IN ({marks})
+        """, [offset, offset] + task_ids)
+        _roll_up_from_subtasks(task_ids)
+    return len(task_ids)
@@ -0,0 +1,193 @@
+# task_queries.py
+"""Filtered, sorted and paginated reads of the task table behind the Tasks page.
+
+Filters are turned into SQL predicates so only matching rows leave SQLite, and pages
+are fetched with keyset pagination - each page starts after the (sort key, id) of the
+previous page's last row - so later pages cost the same as the first one. Charts read
+GROUP BY summaries (summarize_tasks) or one window of rows, never every matching task.
+"""
+from database import run_query
+
+TASK_COLUMNS = [
+    "Task", "Status", "Assignee", "Planned Time Spent", "Actual Time Spent",
+    "Project", "Project Owner", "Planned Start Date", "Planned Deadline",
+    "Planned Duration", "Actual Start Date", "Actual Deadline", "Actual Duration",
+    "Priority", "Budget", "Actual Cost", "Budget Variance"
+]
+
+_SELECT = """
+    SELECT
+        t.title AS Task,
+        t.status,
+        assignee.username AS assignee,
+        t.time_spent AS "Planned Time Spent",
+        t.actual_time_spent AS "Actual Time Spent",
+        p.name AS Project,
+        owner.username AS "Project Owner",
+        t.start_date AS "Planned Start Date",
+        t.deadline AS "Planned Deadline",
+        CASE
+            WHEN t.start_date IS NULL OR t.deadline IS NULL THEN 'N/A'
+            ELSE ROUND(julianday(t.deadline) - julianday(t.start_date), 1) || ' days'
+        END AS "Planned Duration",
+        t.actual_start_date AS "Actual Start Date",
+        t.actual_deadline AS "Actual Deadline",
+        CASE
+            WHEN t.actual_start_date IS NULL OR t.actual_deadline IS NULL THEN 'N/A'
+            ELSE ROUND(julianday(t.actual_deadline) - julianday(t.actual_start_date), 1) || ' days'
+        END AS "Actual Duration",
+        t.priority AS Priority,
+        t.budget AS Budget,
+        t.actual_cost AS "Actual Cost",
+        CASE
+            WHEN t.budget IS NULL OR t.actual_cost IS NULL THEN NULL
+            ELSE t.budget - t.actual_cost
+        END AS "Budget Variance"
+"""
+
+_FROM = """
+    FROM tasks t
+    LEFT JOIN users assignee ON t.assigned_to = assignee.id
+    LEFT JOIN projects p ON t.project_id = p.id
+    LEFT JOIN users owner ON p.user_id = owner.id
+"""
+
+# filter name -> column it is compared with
+FILTER_COLUMNS = {
+    'project_id': 't.project_id',
+    'project': 'p.name',
+    'assignee': 'assignee.username',
+    'status': 't.status',
+    'priority': 't.priority',
+    'owner': 'owner.username',
+}
+
+# label -> sort expression; NULLs sort as '' so the keyset comparison stays total
+SORT_OPTIONS = {
+    "Planned Deadline": "COALESCE(t.deadline, '')",
+    "Planned Start Date": "COALESCE(t.start_date, '')",
+    "Task": "COALESCE(t.title, '')",
+    "Project": "COALESCE(p.name, '')",
+    "Status": "COALESCE(t.status, '')",
+    "Priority": "COALESCE(t.priority, '')",
+}
+
+
+# group name -> expression summarize_tasks() can group by
+GROUP_COLUMNS = {
+    'status': 't.status',
+    'priority': 't.priority',
+    'assignee': 'assignee.username',
+    'project': 'p.name',
+    'start_month': "strftime('%Y-%m', t.start_date)",
+    'start_week': "date(t.start_date, 'weekday 0', '-6 days')",   # Monday of the week
+}
+
+SUMMARY_COLUMNS = ["Tasks", "Completed", "Budget", "Actual Cost"]
+
+# Tasks the timeline can draw, and tasks with a budget variance
+_DATED = "date(t.start_date) IS NOT NULL AND date(t.deadline) IS NOT NULL"
+_BUDGETED = "t.budget IS NOT NULL AND t.actual_cost IS NOT NULL"
+
+
+def _where(filters, *conditions):
+    """SQL WHERE clause and arguments for the non-empty filters and extra conditions"""
+    clauses, args = list(conditions), []
+    for name, value in (filters or {}).items():
+        if value is not None:
+            clauses.append(f"{FILTER_COLUMNS[name]} = ?")
+            args.append(value)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+
+def fetch_task_rows(filters=None):
+    """Every task matching the filters, in TASK_COLUMNS order"""
+    where, args = _where(filters)
+    return run_query(_SELECT + _FROM + where, args)
+
+
+def fetch_task_page(filters=None, sort="Planned Deadline", descending=False, after=None, limit=50):
+    """One page of matching tasks.
+
+    Returns (rows, next_cursor). Pass next_cursor back as `after` for the following
+    page; it is None on the last page.
+    """
+    sort_expr = SORT_OPTIONS[sort]
+    where, args = _where(filters)
+    direction, compare = ("DESC", "<") if descending else ("ASC", ">")
+    if after is not None:
+        where += (" AND " if where else " WHERE ") + f"({sort_expr}, t.id) {compare} (?, ?)"
+        args += list(after)
+    rows = run_query(
+        f"{_SELECT}, {sort_expr} AS sort_key, t.id AS task_id {_FROM}{where} "
+        f"ORDER BY sort_key {direction}, t.id {direction} LIMIT ?",
+        args + [limit + 1]
+    )
+    next_cursor = tuple(rows[limit - 1][-2:]) if len(rows) > limit else None
+    return [row[:-2] for row in rows[:limit]], next_cursor
+
+
+def count_tasks(filters=None, dated=False):
+    """Number of matching tasks; dated=True counts only those with planned dates"""
+    where, args = _where(filters, *([_DATED] if dated else []))
+    return run_query(f"SELECT COUNT(*) {_FROM}{where}", args, one=True)[0]
+
+
+def summarize_tasks(filters=None, group_by=(), budgeted=False):
+    """Totals of the matching tasks, one row per group: the GROUP_COLUMNS values in
+    group_by order followed by SUMMARY_COLUMNS. Groups whose value is NULL are left out.
+
+    budgeted=True only counts tasks that have both a budget and an actual cost.
+    """
+    columns = [GROUP_COLUMNS[name] for name in group_by]
+    conditions = [f"{column} IS NOT NULL" for column in columns] + ([_BUDGETED] if budgeted else [])
+    where, args = _where(filters, *conditions)
+    group = f" GROUP BY {', '.join(columns)} ORDER BY {', '.join(columns)}" if columns else ""
+    return run_query(f"""
+        SELECT {''.join(column + ', ' for column in columns)}COUNT(*),
+               COUNT(CASE WHEN t.status = 'Completed' THEN 1 END),
+               TOTAL(t.budget), TOTAL(t.actual_cost)
+        {_FROM}{where}{group}
+    """, args)
+
+
+def fetch_task_timeline(filters=None, offset=0, limit=250):
+    """A window of the matching tasks that have planned dates, by planned start, in
+    TASK_COLUMNS order"""
+    where, args = _where(filters, _DATED)
+    return run_query(f"{_SELECT}{_FROM}{where} ORDER BY date(t.start_date), t.id LIMIT ? OFFSET ?",
+                     args + [int(limit), int(offset)])
+
+
+def fetch_budget_variances(filters=None, offset=0, limit=250):
+    """(task, project, budget variance) for a window of the matching tasks with both a
+    budget and an actual cost"""
+    where, args = _where(filters, _BUDGETED)
+    return run_query(f"""
+        SELECT t.title, p.name, t.budget - t.actual_cost
+        {_FROM}{where} ORDER BY t.id LIMIT ? OFFSET ?
+    """, args + [int(limit), int(offset)])
+
+
+def task_filter_options():
+    """Distinct values for each filter dropdown, each from a small indexed query"""
+    def values(query):
+        return [row[0] for row in run_query(query) if row[0] is not None]
+
+    return {
+        'project': values("""
+            SELECT DISTINCT name FROM projects
+            WHERE id IN (SELECT DISTINCT project_id FROM tasks) ORDER BY name
+        """),
+        'assignee': values("""
+            SELECT DISTINCT username FROM users
+            WHERE id IN (SELECT DISTINCT assigned_to FROM tasks) ORDER BY username
+        """),
+        'status': values("SELECT DISTINCT status FROM tasks ORDER BY status"),
+        'priority': values("SELECT DISTINCT priority FROM tasks ORDER BY priority"),
+        'owner': values("""
+            SELECT DISTINCT username FROM users
+            WHERE id IN (SELECT user_id FROM projects WHERE id IN (SELECT DISTINCT project_id FROM tasks))
+            ORDER BY username
+        """),
+    }
@@ -0,0 +1,174 @@
+# task_rollups.py
+"""Parent-task values derived from subtasks, computed inside SQLite.
+
+A task with subtasks spans at least its subtasks' planned and actual dates, and its
+time, budget and cost are the subtask totals. The rollup is one aggregate UPDATE per
+call, whatever the number of subtasks, and only touches tasks whose values change.
+
+The parent's status follows its subtasks too. Triggers keep per-task counts of total,
+completed and in-progress subtasks in subtask_status_counts, so deriving the status
+reads one row instead of every subtask.
+
+`python task_rollups.py rollups` recomputes every task that has subtasks and
+`python task_rollups.py status-counters` rebuilds the counters, for data repair.
+"""
+import argparse
+
+from database import run_query, transaction
+from query_cache import get_cache
+
+# --- Subtask status counters ---
+SUBTASK_STATUS_COUNTS_DDL = """
+    CREATE TABLE IF NOT EXISTS subtask_status_counts (
+        task_id INTEGER PRIMARY KEY,
+        total INTEGER NOT NULL DEFAULT 0,
+        completed INTEGER NOT NULL DEFAULT 0,
+        in_progress INTEGER NOT NULL DEFAULT 0
+    )
+"""
+
+
+def _count_delta(row, sign):
+    return (f"UPDATE subtask_status_counts SET "
+            f"total = total + ({sign}), "
+            f"completed = completed + ({sign}) * ({row}.status = 'Completed'), "
+            f"in_progress = in_progress + ({sign}) * ({row}.status = 'In Progress') "
+            f"WHERE task_id = {row}.task_id;")
+
+
+_ENSURE_ROW = "INSERT OR IGNORE INTO subtask_status_counts (task_id) SELECT NEW.task_id WHERE NEW.task_id IS NOT NULL;"
+
+SUBTASK_STATUS_TRIGGERS = {
+    'subtask_counts_insert': f"AFTER INSERT ON subtasks BEGIN {_ENSURE_ROW} {_count_delta('NEW', 1)} END",
+    'subtask_counts_delete': f"AFTER DELETE ON subtasks BEGIN {_count_delta('OLD', -1)} END",
+    'subtask_counts_update': (f"AFTER UPDATE OF status, task_id ON subtasks BEGIN "
+                              f"{_count_delta('OLD', -1)} {_ENSURE_ROW} {_count_delta('NEW', 1)} END"),
+}
+
+_BACKFILL_STATUS_COUNTS = [
+    "DELETE FROM subtask_status_counts",
+    """INSERT INTO subtask_status_counts (task_id, total, completed, in_progress)
+       SELECT task_id, COUNT(*), TOTAL(status = 'Completed'), TOTAL(status = 'In Progress')
+       FROM subtasks WHERE task_id IS NOT NULL GROUP BY task_id""",
+]
+
+# The counters change whenever subtasks do
+get_cache().add_dependency('subtasks', 'subtask_status_counts')
+
+
+def install_subtask_status_counters(c):
+    """Create the counter table and its triggers and fill it from the current subtasks"""
+    c.execute(SUBTASK_STATUS_COUNTS_DDL)
+    for name, body in SUBTASK_STATUS_TRIGGERS.items():
+        c.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    for statement in _BACKFILL_STATUS_COUNTS:
+        c.execute(statement)
+
+
+def backfill_subtask_status_counts():
+    """Rebuild every counter from the subtasks table"""
+    with transaction('subtask_status_counts') as conn:
+        for statement in _BACKFILL_STATUS_COUNTS:
+            conn.execute(statement)
+
+
+def derived_parent_status(total, completed, in_progress):
+    """Status a parent task takes from its subtask counts; None when it has no subtasks"""
+    if not total:
+        return None
+    if completed == total:
+        return "Completed"
+    return "In Progress" if in_progress else "Pending"
+
+
+def update_parent_status(task_id):
+    """Bring the task's status in line with its subtasks; returns True if it changed"""
+    row = run_query("""
+        SELECT t.status, c.total, c.completed, c.in_progress
+        FROM tasks t JOIN subtask_status_counts c ON c.task_id = t.id
+        WHERE t.id = ?
+    """, (task_id,), one=True, use_cache=False)
+    if not row:
+        return False
+    new_status = derived_parent_status(*row[1:])
+    if new_status is None or new_status == row[0]:
+        return False
+    run_query("UPDATE tasks SET status = ? WHERE id = ?", (new_status, task_id))
+    return True
+
+
+# --- Dates, time and budget ---
+
+_ROLLUP_SQL = """
+    UPDATE tasks SET
+        start_date = n.start_date, deadline = n.deadline,
+        actual_start_date = n.actual_start_date, actual_deadline = n.actual_deadline,
+        time_spent = n.time_spent, actual_time_spent = n.actual_time_spent,
+        budget = n.budget, actual_cost = n.actual_cost,
+        budget_variance = n.budget - n.actual_cost
+    FROM (
+        SELECT t.id,
+               -- dates only ever widen the task: earliest start, latest end
+               CASE WHEN r.start_date < COALESCE(date(t.start_date), '9999-12-31')
+                    THEN r.start_date ELSE date(t.start_date) END AS start_date,
+               CASE WHEN r.deadline > COALESCE(date(t.deadline), '')
+                    THEN r.deadline ELSE date(t.deadline) END AS deadline,
+               CASE WHEN r.actual_start_date < COALESCE(date(t.actual_start_date), '9999-12-31')
+                    THEN r.actual_start_date ELSE date(t.actual_start_date) END AS actual_start_date,
+               CASE WHEN r.actual_deadline > COALESCE(date(t.actual_deadline), '')
+                    THEN r.actual_deadline ELSE date(t.actual_deadline) END AS actual_deadline,
+               r.time_spent, r.actual_time_spent, r.budget, r.actual_cost
+        FROM tasks t
+        JOIN (
+            SELECT task_id,
+                   MIN(date(start_date)) AS start_date,
+                   MAX(date(deadline)) AS deadline,
+                   MIN(date(actual_start_date)) AS actual_start_date,
+                   MAX(date(actual_deadline)) AS actual_deadline,
+                   TOTAL(time_spent) AS time_spent,
+                   TOTAL(actual_time_spent) AS actual_time_spent,
+                   TOTAL(budget) AS budget,
+                   TOTAL(actual_cost) AS actual_cost
+            FROM subtasks
+            {where}
+            GROUP BY task_id
+        ) r ON r.task_id = t.id
+    ) AS n
+    WHERE tasks.id = n.id AND (
+        tasks.start_date IS NOT n.start_date OR tasks.deadline IS NOT n.deadline
+        OR tasks.actual_start_date IS NOT n.actual_start_date OR tasks.actual_deadline IS NOT n.actual_deadline
+        OR tasks.time_spent IS NOT n.time_spent OR tasks.actual_time_spent IS NOT n.actual_time_spent
+        OR tasks.budget IS NOT n.budget OR tasks.actual_cost IS NOT n.actual_cost
+        OR tasks.budget_variance IS NOT n.budget - n.actual_cost
+    )
+    RETURNING tasks.id
+"""
+
+
+def recompute_task_rollups(task_ids=None):
+    """Roll subtask dates, time and budget up into their tasks; returns the ids that changed.
+
+    task_ids=None recomputes every task that has subtasks.
+    """
+    if task_ids is None:
+        rows = run_query(_ROLLUP_SQL.format(where=""))
+    else:
+        task_ids = [int(task_id) for task_id in task_ids]
+        if not task_ids:
+            return []
+        where = f"WHERE task_id IN ({','.join('?' * len(task_ids))})"
+        rows = run_query(_ROLLUP_SQL.format(where=where), task_ids)
+    return [row[0] for row in rows]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute parent-task values derived from subtasks")
+    parser.add_argument("command", choices=["rollups", "status-counters"])
+    options = parser.parse_args()
+
+    if options.command == "rollups":
+        changed = recompute_task_rollups()
+        print(f"Updated {len(changed)} task(s)")
+    else:
+        backfill_subtask_status_counts()
+        print("Rebuilt subtask status counters")
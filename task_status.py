@@ -0,0 +1,97 @@
+# task_status.py
+"""The one definition of "overdue" and "upcoming" used across the app.
+
+A task is Completed, Overdue (deadline before today), Upcoming (deadline from today up
+to `reminder_days` ahead) or On Track (later deadline, or none at all). The rules are
+expressed once as SQL fragments so the Notifications page, the Calendar and the
+Dashboard counts classify in the database, plus classify_deadline() for code that
+already holds a single row.
+"""
+from datetime import date, datetime, timedelta
+
+from database import run_query
+from query_cache import get_cache
+
+COMPLETED = "Completed"
+OVERDUE = "Overdue"
+UPCOMING = "Upcoming"
+ON_TRACK = "On Track"
+
+
+def status_window(reminder_days=7, today=None):
+    """(today, last upcoming day) as ISO strings - the arguments for the SQL fragments below"""
+    today = today or date.today()
+    return today.isoformat(), (today + timedelta(days=int(reminder_days))).isoformat()
+
+
+def overdue_sql(alias="t"):
+    """Predicate for open tasks past their deadline; takes (today,). An empty deadline is
+    no deadline, as in status_sql()."""
+    return f"{alias}.status != 'Completed' AND {alias}.deadline != '' AND {alias}.deadline < ?"
+
+
+def upcoming_sql(alias="t"):
+    """Predicate for open tasks due within the reminder period; takes (today, last upcoming day)"""
+    return f"{alias}.status != 'Completed' AND {alias}.deadline != '' AND {alias}.deadline BETWEEN ? AND ?"
+
+
+def status_sql(alias="t"):
+    """CASE expression naming the task's status class; takes (today, last upcoming day)"""
+    return f"""CASE
+        WHEN {alias}.status = 'Completed' THEN '{COMPLETED}'
+        WHEN {alias}.deadline IS NULL OR {alias}.deadline = '' THEN '{ON_TRACK}'
+        WHEN {alias}.deadline < ?1 THEN '{OVERDUE}'
+        WHEN {alias}.deadline <= ?2 THEN '{UPCOMING}'
+        ELSE '{ON_TRACK}'
+    END"""
+
+
+def classify_deadline(deadline, status=None, reminder_days=7, today=None):
+    """Status class of a single task from its deadline (date, datetime or 'YYYY-MM-DD') and status"""
+    if status == "Completed":
+        return COMPLETED
+    if not deadline:
+        return ON_TRACK
+    # datetime (and pandas Timestamp) is a date subclass but cannot be compared with one
+    if isinstance(deadline, datetime):
+        deadline = deadline.date()
+    elif not isinstance(deadline, date):
+        deadline = date.fromisoformat(str(deadline)[:10])
+    today = today or date.today()
+    if isinstance(today, datetime):
+        today = today.date()
+    if deadline < today:
+        return OVERDUE
+    if (deadline - today).days <= int(reminder_days):
+        return UPCOMING
+    return ON_TRACK
+
+
+def get_upcoming_and_overdue_tasks(user_id=None, reminder_days=7, today=None):
+    """(upcoming, overdue) rows of `t.*, project name` for tasks the user is assigned or owns.
+
+    user_id=None means every task (the Admin view). Results are cached per user and
+    per day until a task or project changes.
+    """
+    today_iso, horizon = status_window(reminder_days, today)
+    key = ('upcoming_and_overdue', user_id, today_iso, horizon)
+    rows = get_cache().get_or_load(
+        key, ('tasks', 'projects'), lambda: _load_open_task_status(user_id, today_iso, horizon)
+    )
+    upcoming = [row[:-1] for row in rows if row[-1] == UPCOMING]
+    overdue = [row[:-1] for row in rows if row[-1] == OVERDUE]
+    return upcoming, overdue
+
+
+def _load_open_task_status(user_id, today, horizon):
+    query = f"""
+        SELECT t.*, p.name as project_name, {status_sql('t')} AS status_class
+        FROM tasks t
+        LEFT JOIN projects p ON t.project_id = p.id
+        WHERE t.status != 'Completed' AND t.deadline <= ?2
+    """
+    args = (today, horizon)
+    if user_id is not None:
+        query += " AND (t.assigned_to = ?3 OR p.user_id = ?3)"
+        args += (user_id,)
+    return run_query(query, args, use_cache=False)
@@ -0,0 +1,2208 @@
+# tasks_page.py
+"""Tasks page: the task table, edit form, bulk actions and task analytics.
+
+The chart helpers used to be defined inside app.py's page branch and so were
+re-created on every rerun; here they are defined once, when the page first loads.
+"""
+import sqlite3
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from page_helpers import get_projects, get_tasks, query_db, status_colors
+from instrumentation import timed_chart
+from task_operations import delete_tasks, reassign_tasks, set_task_status, shift_task_dates
+from task_queries import (
+    SORT_OPTIONS, SUMMARY_COLUMNS, TASK_COLUMNS, count_tasks, fetch_budget_variances,
+    fetch_task_page, fetch_task_timeline, summarize_tasks, task_filter_options
+)
+from task_status import OVERDUE, classify_deadline
+from user_directory import get_user_directory, get_username as lookup_username
+from visualizations import format_dates, gantt_page, plotly_chart, png_download_button
+
+
+# Define priority colors
+priority_colors = {
+    "High": "#FF0000",  # Red
+    "Medium": "#FFA500",  # Orange
+    "Low": "#32CD32"  # Green
+}
+
+TASK_TABLE_PAGE_SIZE = 50
+TASK_DATE_COLUMNS = ['Planned Start Date', 'Planned Deadline', 'Actual Start Date', 'Actual Deadline']
+
+
+def display_task_table():
+    """Display one page of tasks with filtering capabilities; returns the filters.
+
+    The analytics below the table query their own summaries with the same filters.
+    """
+    if not count_tasks():
+        st.warning("No tasks found.")
+        return {}
+
+    # Dropdown options come from DISTINCT queries rather than the loaded task list
+    options = task_filter_options()
+
+    # Create filter widgets
+    with st.expander("🔍 Filter Tasks", expanded=False):
+        col1, col2, col3, col4, col5 = st.columns(5)
+
+        with col1:
+            selected_project = st.selectbox("Filter by Project", ['All Projects'] + options['project'])
+
+        with col2:
+            selected_assignee = st.selectbox("Filter by Assignee", ['All Assignees'] + options['assignee'])
+
+        with col3:
+            selected_status = st.selectbox("Filter by Status", ['All Statuses'] + options['status'])
+
+        with col4:
+            selected_priority = st.selectbox("Filter by Priority", ['All Priorities'] + options['priority'])
+
+        with col5:
+            selected_owner = st.selectbox("Filter by Project Owner", ['All Owners'] + options['owner'])
+
+        sort_col1, sort_col2 = st.columns(2)
+        with sort_col1:
+            sort_by = st.selectbox("Sort by", list(SORT_OPTIONS))
+        with sort_col2:
+            descending = st.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Descending"
+
+    # Filters are applied in SQL
+    filters = {
+        'project': None if selected_project == 'All Projects' else selected_project,
+        'assignee': None if selected_assignee == 'All Assignees' else selected_assignee,
+        'status': None if selected_status == 'All Statuses' else selected_status,
+        'priority': None if selected_priority == 'All Priorities' else selected_priority,
+        'owner': None if selected_owner == 'All Owners' else selected_owner,
+    }
+    total = count_tasks(filters)
+
+    # Keyset pagination: keep the cursor each visited page started from, reset on any change
+    signature = (tuple(filters.items()), sort_by, descending)
+    if st.session_state.get('task_table_signature') != signature:
+        st.session_state.task_table_signature = signature
+        st.session_state.task_table_cursors = [None]
+    cursors = st.session_state.task_table_cursors
+    rows, next_cursor = fetch_task_page(filters, sort_by, descending, after=cursors[-1],
+                                        limit=TASK_TABLE_PAGE_SIZE)
+
+    # Only the visible page is formatted for display
+    display_df = pd.DataFrame(rows, columns=TASK_COLUMNS)
+    for column in TASK_DATE_COLUMNS:
+        display_df[column] = pd.to_datetime(display_df[column])
+
+    # Format currency columns as whole numbers
+    for column in ["Actual Cost", "Budget Variance", "Budget"]:
+        display_df[column] = display_df[column].apply(
+            lambda x: f"${int(x):,}" if pd.notnull(x) else "$0"
+        )
+
+    # Display the formatted table
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        column_config={
+            "Planned Start Date": st.column_config.DateColumn("Planned Start Date"),
+            "Planned Deadline": st.column_config.DateColumn("Planned Deadline"),
+            "Actual Start Date": st.column_config.DateColumn("Actual Start Date"),
+            "Actual Deadline": st.column_config.DateColumn("Actual Deadline"),
+            "Spent Time": st.column_config.NumberColumn("Spent Time (hours)"),
+            # Note: We don't need column_config for the currency columns 
+            # because we've already formatted them as strings
+        }
+    )
+
+    page = len(cursors)
+    nav_prev, nav_info, nav_next = st.columns([1, 3, 1])
+    with nav_prev:
+        if st.button("◀ Previous", key="task_table_prev", disabled=page == 1):
+            cursors.pop()
+            st.rerun()
+    with nav_info:
+        pages = max(1, -(-total // TASK_TABLE_PAGE_SIZE))
+        st.caption(f"Page {page} of {pages} · {total} matching tasks")
+    with nav_next:
+        if st.button("Next ▶", key="task_table_next", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+
+    return filters
+
+
+def display_tasks_as_cards(project_id):
+    """Display tasks as cards for a specific project."""
+    tasks = get_tasks(project_id)
+    if not tasks:
+        st.warning("No tasks found for this project.")
+    else:
+        for task in tasks:
+            with st.container():
+                st.markdown(f"""
+                <div class="card">
+                    <div class="card-title">{task[2]}</div>
+                    <div class="card-content">
+                        <p><strong>Description:</strong> {task[3]}</p>
+                        <p><strong>Status:</strong> {task[4]}</p>
+                        <p><strong>Priority:</strong> {task[8]}</p>
+                        <p><strong>Deadline:</strong> {task[6]}</p>
+                        <p><strong>Time Spent:</strong> {task[7]} hours</p>
+                        <p><strong>Recurrence:</strong> {task[9] if task[9] else "None"}</p>
+                        <p><strong>Assigned to:</strong> {lookup_username(task[10]) if task[10] else "Unassigned"}</p>
+                    </div>
+                    <div class="card-footer">
+                        <button onclick="editTask({task[0]})">Edit</button>
+                        <button onclick="deleteTask({task[0]})">Delete</button>
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+
+
+# Reusable edit task form function
+# First, update the edit_task_form function with a more professional design
+def edit_task_form(task_id, project_id):
+    task = query_db("SELECT * FROM tasks WHERE id=?", (task_id,), one=True)
+    if not task:
+        st.error("Task not found")
+        return False
+
+    # Main task editing form - using a container with consistent styling
+    with st.container():
+        st.markdown("### Edit Task")
+        with st.form(key=f"edit_task_form_{task_id}"):
+            # Two-column layout for better organization
+            col1, col2 = st.columns(2)
+
+            with col1:
+                title = st.text_input("Task Title*", value=task[2])
+                description = st.text_area("Description", value=task[3] or "")
+
+                # Status and priority in the same row
+                status_col, priority_col = st.columns(2)
+                with status_col:
+                    status = st.selectbox("Status", ["Pending", "In Progress", "Completed"], 
+                                        index=["Pending", "In Progress", "Completed"].index(task[4]))
+                with priority_col:
+                    priority = st.selectbox("Priority*", ["High", "Medium", "Low"], 
+                                          index=["High", "Medium", "Low"].index(task[8]))
+
+            with col2:
+                # Date fields in the same row
+                date_col1, date_col2 = st.columns(2)
+                with date_col1:
+                    try:
+                        task_start_date = datetime.strptime(task[5], "%Y-%m-%d").date() if task[5] else datetime.today().date()
+                    except ValueError:
+                        task_start_date = datetime.strptime(task[5], "%Y-%m-%d %H:%M:%S").date() if task[5] else datetime.today().date()
+                    start_date = st.date_input("Start Date*", value=task_start_date)
+                with date_col2:
+                    try:
+                        task_deadline = datetime.strptime(task[6], "%Y-%m-%d").date() if task[6] else datetime.today().date()
+                    except ValueError:
+                        task_deadline = datetime.strptime(task[6], "%Y-%m-%d %H:%M:%S").date() if task[6] else datetime.today().date()
+                    deadline = st.date_input("Deadline*", value=task_deadline)
+
+                # Budget and assignee
+                budget = st.number_input("Budget ($)", min_value=0.0, value=float(task[12] or 0), step=0.01)
+
+                team_members = query_db("SELECT id, username FROM users ORDER BY username")
+                assigned_to = st.selectbox("Assign To", [member[1] for member in team_members], 
+                                         index=[member[1] for member in team_members].index(
+                                             lookup_username(task[10])))
+
+            # Form submission buttons
+            submit_col1, submit_col2 = st.columns(2)
+            with submit_col1:
+                submitted = st.form_submit_button("Update Task")
+            with submit_col2:
+                cancel = st.form_submit_button("Cancel")
+
+            if submitted:
+                if not title.strip():
+                    st.error("Task title is required")
+                elif deadline < start_date:
+                    st.error("Deadline must be on or after the start date")
+                else:
+                    assigned_to_id = query_db(
+                        "SELECT id FROM users WHERE username = ?", 
+                        (assigned_to,), 
+                        one=True
+                    )[0]
+
+                    query_db("""
+                        UPDATE tasks 
+                        SET title=?, description=?, status=?, start_date=?, deadline=?, 
+                        priority=?, assigned_to=?, budget=?
+                        WHERE id=?
+                    """, (
+                        title.strip(), description, status, start_date, deadline, 
+                        priority, assigned_to_id, budget, task_id
+                    ))
+
+                    st.success("Task updated successfully!")
+                    return True
+            if cancel:
+                return False
+
+    # Subtask section - redesigned with consistent styling
+    # Subtask section - completely reworked assignment handling
+    st.markdown("---")
+    st.subheader("Subtasks Management")
+
+    # Get all subtasks with proper assignment handling
+    subtasks = query_db("""
+        SELECT s.id, s.title, s.description, s.status, s.start_date, s.deadline, 
+               s.priority, s.assigned_to, s.budget, s.time_spent, u.username
+        FROM subtasks s
+        LEFT JOIN users u ON s.assigned_to = u.id
+        WHERE s.task_id=?
+        ORDER BY s.id
+    """, (task_id,))
+
+    if subtasks:
+        st.write("### Current Subtasks")
+
+        # Create a DataFrame with proper assignment display
+        subtasks_df = pd.DataFrame(subtasks, columns=[
+            "ID", "Title", "Description", "Status", "Start Date", "Deadline",
+            "Priority", "Assigned To ID", "Budget", "Time Spent", "Assigned To"
+        ])
+
+        # Replace None with "Unassigned" for display
+        subtasks_df["Assigned To"] = subtasks_df["Assigned To"].fillna("Unassigned")
+
+        # Display the subtasks table
+        st.dataframe(
+            subtasks_df[["ID", "Title", "Status", "Priority", "Assigned To", 
+                        "Start Date", "Deadline", "Budget", "Time Spent"]],
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "Start Date": st.column_config.DateColumn("Start Date"),
+                "Deadline": st.column_config.DateColumn("Deadline"),
+                "Budget": st.column_config.NumberColumn("Budget", format="$%.2f"),
+                "Time Spent": st.column_config.NumberColumn("Time Spent (hrs)")
+            }
+        )
+
+        # Subtask management form with reliable assignment handling
+        st.markdown("---")
+        st.subheader("Manage Subtask")
+
+        if subtasks:
+            selected_subtask = st.selectbox(
+                "Select Subtask to Manage",
+                [f"{subtask[0]}: {subtask[1]}" for subtask in subtasks],
+                index=0,
+                key="subtask_selector"
+            )
+
+            if selected_subtask:
+                subtask_id = int(selected_subtask.split(":")[0])
+                subtask = next((s for s in subtasks if s[0] == subtask_id), None)
+
+                if subtask:
+                    with st.form(key=f"manage_subtask_{subtask_id}"):
+                        col1, col2 = st.columns(2)
+
+                        with col1:
+                            subtask_title = st.text_input("Title", value=subtask[1])
+                            subtask_description = st.text_area(
+                                "Description", 
+                                value=subtask[2] or ""
+                            )
+
+                            status_col, priority_col = st.columns(2)
+                            with status_col:
+                                subtask_status = st.selectbox(
+                                    "Status", 
+                                    ["Pending", "In Progress", "Completed"], 
+                                    index=["Pending", "In Progress", "Completed"].index(subtask[3])
+                                )
+                            with priority_col:
+                                subtask_priority = st.selectbox(
+                                    "Priority", 
+                                    ["High", "Medium", "Low"], 
+                                    index=["High", "Medium", "Low"].index(subtask[6])
+                                )
+
+                        with col2:
+                            date_col1, date_col2 = st.columns(2)
+                            with date_col1:
+                                subtask_start_date = st.date_input(
+                                    "Start Date", 
+                                    value=datetime.strptime(subtask[4], "%Y-%m-%d").date() if subtask[4] else start_date
+                                )
+                            with date_col2:
+                                subtask_deadline = st.date_input(
+                                    "Deadline", 
+                                    value=datetime.strptime(subtask[5], "%Y-%m-%d").date() if subtask[5] else deadline
+                                )
+
+                            subtask_budget = st.number_input(
+                                "Budget ($)", 
+                                min_value=0.0, 
+                                value=float(subtask[8] or 0), 
+                                step=0.01
+                            )
+
+                            # Get all available users
+                            team_members = query_db("SELECT id, username FROM users ORDER BY username")
+                            assignee_options = ["Unassigned"] + [member[1] for member in team_members]
+
+                            # Find current assignee
+                            current_assignee = "Unassigned"
+                            if subtask[7]:  # If there's an assigned_to value
+                                current_assignee = subtask[10] if subtask[10] else "Unassigned"
+
+                            subtask_assigned_to = st.selectbox(
+                                "Assign To", 
+                                assignee_options,
+                                index=assignee_options.index(current_assignee) if current_assignee in assignee_options else 0
+                            )
+
+                        col1, col2, col3 = st.columns([1,1,2])
+                        with col1:
+                            if st.form_submit_button("Update Subtask"):
+                                try:
+                                    # Handle assignment
+                                    assigned_to_id = None
+                                    if subtask_assigned_to != "Unassigned":
+                                        assigned_to_id = query_db(
+                                            "SELECT id FROM users WHERE username = ?", 
+                                            (subtask_assigned_to,), 
+                                            one=True
+                                        )[0]
+
+                                    query_db("""
+                                        UPDATE subtasks 
+                                        SET title=?, description=?, status=?, start_date=?, deadline=?, 
+                                        priority=?, assigned_to=?, budget=?
+                                        WHERE id=?
+                                    """, (
+                                        subtask_title, subtask_description, subtask_status, 
+                                        subtask_start_date, subtask_deadline, subtask_priority, 
+                                        assigned_to_id, subtask_budget, subtask_id
+                                    ))
+                                    st.success("Subtask updated!")
+                                    st.rerun()  # Force complete refresh
+                                except Exception as e:
+                                    st.error(f"Error updating subtask: {str(e)}")
+                        with col2:
+                            if st.form_submit_button("Delete"):
+                                query_db("DELETE FROM subtasks WHERE id=?", (subtask_id,))
+                                st.success("Subtask deleted!")
+                                st.rerun()  # Force complete refresh
+
+    # Add new subtask form with reliable assignment handling
+    st.markdown("---")
+    st.subheader("Create New Subtask")
+    with st.form(key=f"add_subtask_form_{task_id}", clear_on_submit=True):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            new_subtask_title = st.text_input("Title*", placeholder="Enter subtask name")
+            new_subtask_description = st.text_area("Description", placeholder="Enter subtask description")
+
+            status_col, priority_col = st.columns(2)
+            with status_col:
+                new_subtask_status = st.selectbox("Status", ["Pending", "In Progress", "Completed"])
+            with priority_col:
+                new_subtask_priority = st.selectbox("Priority", ["High", "Medium", "Low"])
+
+        with col2:
+            date_col1, date_col2 = st.columns(2)
+            with date_col1:
+                new_subtask_start_date = st.date_input("Start Date", value=start_date)
+            with date_col2:
+                new_subtask_deadline = st.date_input("Deadline", value=deadline)
+
+            new_subtask_budget = st.number_input("Budget ($)", min_value=0.0, value=0.0, step=0.01)
+
+            team_members = query_db("SELECT id, username FROM users ORDER BY username")
+            new_subtask_assigned_to = st.selectbox(
+                "Assign To", 
+                ["Unassigned"] + [member[1] for member in team_members]
+            )
+
+        submit_col1, submit_col2 = st.columns(2)
+        with submit_col1:
+            if st.form_submit_button("Create Subtask"):
+                if not new_subtask_title.strip():
+                    st.error("Subtask title is required")
+                elif new_subtask_deadline < new_subtask_start_date:
+                    st.error("Deadline must be on or after the start date")
+                else:
+                    assigned_to_id = None
+                    if new_subtask_assigned_to != "Unassigned":
+                        assigned_to_id = query_db(
+                            "SELECT id FROM users WHERE username = ?", 
+                            (new_subtask_assigned_to,), 
+                            one=True
+                        )[0]
+
+                    query_db("""
+                        INSERT INTO subtasks 
+                        (task_id, title, description, status, start_date, deadline, 
+                         priority, assigned_to, budget)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        task_id, new_subtask_title.strip(), new_subtask_description, 
+                        new_subtask_status, new_subtask_start_date, new_subtask_deadline,
+                        new_subtask_priority, assigned_to_id, new_subtask_budget
+                    ))
+                    st.success("Subtask created successfully!")
+                    st.rerun()  # Force complete refresh
+        with submit_col2:
+            if st.form_submit_button("Cancel"):
+                st.rerun()
+
+    return False
+
+
+# Update the plot_subtask_analytics function with filters and budget column
+@timed_chart
+def plot_subtask_analytics(filters):
+    if count_tasks(filters):
+        # Try to get extended subtask info first
+        try:
+            subtasks = query_db("""
+                SELECT 
+                    p.name as project_name,
+                    t.id as task_id, 
+                    t.title as task_title,
+                    s.id as subtask_id, 
+                    s.title as subtask_title, 
+                    s.description,
+                    s.status,
+                    s.start_date,
+                    s.deadline,
+                    s.priority,
+                    u.username as assigned_to
+                FROM subtasks s
+                JOIN tasks t ON s.task_id = t.id
+                JOIN projects p ON t.project_id = p.id
+                LEFT JOIN users u ON s.assigned_to = u.id
+                ORDER BY p.name, t.id, s.id
+            """)
+
+            if subtasks:
+                # Create DataFrame with project as first column
+                subtasks_df = pd.DataFrame(subtasks, columns=[
+                    "Project", "Task ID", "Task Title", "Subtask ID", 
+                    "Subtask Title", "Description", "Status", "Start Date",
+                    "Deadline", "Priority", "Assigned To"
+                ])
+
+                # Add filter controls with unique keys
+                st.subheader("Filters")
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    project_filter = st.selectbox(
+                        "Filter by Project",
+                        ["All Projects"] + sorted(subtasks_df['Project'].unique().tolist()),
+                        key="subtask_project_filter"
+                    )
+                with col2:
+                    status_filter = st.selectbox(
+                        "Filter by Status",
+                        ["All Statuses"] + sorted(subtasks_df['Status'].unique().tolist()),
+                        key="subtask_status_filter"
+                    )
+                with col3:
+                    priority_filter = st.selectbox(
+                        "Filter by Priority",
+                        ["All Priorities"] + sorted(subtasks_df['Priority'].unique().tolist()),
+                        key="subtask_priority_filter"
+                    )
+
+                # Apply filters
+                if project_filter != "All Projects":
+                    subtasks_df = subtasks_df[subtasks_df['Project'] == project_filter]
+                if status_filter != "All Statuses":
+                    subtasks_df = subtasks_df[subtasks_df['Status'] == status_filter]
+                if priority_filter != "All Priorities":
+                    subtasks_df = subtasks_df[subtasks_df['Priority'] == priority_filter]
+
+                # Display the full subtasks table with Project first
+                st.subheader("Subtasks Overview")
+                st.dataframe(
+                    subtasks_df,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_order=["Project", "Task ID", "Task Title", "Subtask ID", 
+                                 "Subtask Title", "Status", "Priority", "Assigned To",
+                                 "Start Date", "Deadline", "Description"],
+                    key="subtasks_dataframe"  # Unique key for the dataframe
+                )
+
+                # Completion analysis
+                st.subheader("Completion Analysis")
+                col1, col2 = st.columns(2)
+                with col1:
+                    status_counts = subtasks_df['Status'].value_counts()
+                    fig = px.pie(
+                        status_counts, 
+                        values=status_counts.values, 
+                        names=status_counts.index,
+                        title="Subtask Status Distribution"
+                    )
+                    plotly_chart(fig, use_container_width=True, key="status_pie_chart")
+
+                with col2:
+                    completion_rate = (len(subtasks_df[subtasks_df['Status'] == 'Completed']) / len(subtasks_df)) * 100
+                    fig = go.Figure(go.Indicator(
+                        mode="gauge+number",
+                        value=completion_rate,
+                        title={'text': "Overall Completion Rate"},
+                        gauge={'axis': {'range': [0, 100]}}
+                    ))
+                    plotly_chart(fig, use_container_width=True, key="completion_gauge")
+
+                # Timeline analysis by project
+                st.subheader("Timeline Analysis by Project")
+                if 'Start Date' in subtasks_df.columns and 'Deadline' in subtasks_df.columns:
+                    subtasks_df['Duration'] = (pd.to_datetime(subtasks_df['Deadline']) - 
+                                             pd.to_datetime(subtasks_df['Start Date'])).dt.days
+                    fig = px.bar(
+                        subtasks_df,
+                        x='Subtask Title',
+                        y='Duration',
+                        color='Project',
+                        title="Subtask Durations by Project",
+                        hover_data=['Task Title', 'Priority', 'Assigned To']
+                    )
+                    plotly_chart(fig, use_container_width=True, key="duration_bar_chart")
+            else:
+                st.warning("No subtasks found in the database")
+        except sqlite3.OperationalError as e:
+            st.error(f"Database error: {str(e)}")
+            # Fallback to basic subtask info with project
+            subtasks = query_db("""
+                SELECT 
+                    p.name as project_name,
+                    t.id as task_id, 
+                    t.title as task_title,
+                    s.id as subtask_id, 
+                    s.title as subtask_title, 
+                    s.status
+                FROM subtasks s
+                JOIN tasks t ON s.task_id = t.id
+                JOIN projects p ON t.project_id = p.id
+                ORDER BY p.name, t.id, s.id
+            """)
+
+            if subtasks:
+                subtasks_df = pd.DataFrame(subtasks, columns=[
+                    "Project", "Task ID", "Task Title", "Subtask ID", "Subtask Title", "Status"
+                ])
+
+                st.subheader("Subtasks Overview")
+                st.dataframe(
+                    subtasks_df,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_order=["Project", "Task ID", "Task Title", "Subtask ID", "Subtask Title", "Status"],
+                    key="basic_subtasks_dataframe"
+                )
+
+                st.subheader("Completion Analysis")
+                status_counts = subtasks_df['Status'].value_counts()
+                fig = px.pie(
+                    status_counts, 
+                    values=status_counts.values, 
+                    names=status_counts.index,
+                    title="Subtask Status Distribution",
+                    key="basic_status_pie"
+                )
+                plotly_chart(fig, use_container_width=True)
+            else:
+                st.warning("No subtasks found in the database")
+    else:
+        st.warning("No tasks available for subtask analysis")
+
+
+# Helper function for task status distribution (Pie Chart)
+@timed_chart
+def plot_task_status_distribution(tasks_df):
+    """
+        Create a pie chart showing the distribution of tasks by status.
+        """
+    if tasks_df.empty:
+        st.warning("No tasks found for visualization.")
+        return
+
+    # Count tasks by status
+    status_counts = tasks_df["Status"].value_counts().reset_index()
+    status_counts.columns = ["Status", "Count"]
+
+    # Create pie chart
+    fig = px.pie(
+        status_counts,
+        names="Status",
+        values="Count",
+        title="Task Status Distribution",
+        color_discrete_sequence=px.colors.qualitative.Pastel,
+    )
+    plotly_chart(fig)
+
+
+# Helper function for task priority distribution (Bar Chart)
+@timed_chart
+def plot_task_priority_distribution(filters):
+    """Professional priority distribution visualization with enhanced insights"""
+    priority_stats = pd.DataFrame(summarize_tasks(filters, ('priority',)),
+                                  columns=['Priority'] + SUMMARY_COLUMNS)
+    if priority_stats.empty:
+        st.warning("No tasks found for visualization.")
+        return
+
+    # Define professional color scheme
+    priority_colors = {
+        "High": "#E74C3C",  # Vibrant red
+        "Medium": "#F39C12",  # Orange
+        "Low": "#2ECC71"  # Green
+    }
+
+    # Tasks per priority, most common first
+    priority_stats = priority_stats.rename(columns={"Tasks": "Count"}).sort_values("Count", ascending=False)
+    priority_counts = priority_stats[["Priority", "Count"]].copy()
+
+    # Calculate percentages
+    total_tasks = priority_counts["Count"].sum()
+    priority_counts["Percentage"] = (priority_counts["Count"] / total_tasks * 100).round(1)
+
+    # Create a 2-column layout for metrics and chart
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        # Display key metrics in cards
+        st.markdown("### Priority Metrics")
+
+        # Completion rate by priority
+        priority_stats["Percentage"] = priority_counts["Percentage"]
+        priority_stats["Completion Rate"] = (priority_stats["Completed"] / priority_stats["Count"] * 100).round(1)
+
+        # Display metrics cards
+        for _, row in priority_stats.iterrows():
+            with st.container():
+                st.markdown(f"""
+                    <div style="
+                        border-left: 4px solid {priority_colors[row['Priority']]};
+                        padding: 12px;
+                        margin-bottom: 12px;
+                        background: #FFFFFF;
+                        border-radius: 4px;
+                        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
+                    ">
+                        <h4 style="margin:0;color:#2C3E50;">{row['Priority']}</h4>
+                        <p style="margin:4px 0;font-size:0.9rem;">
+                            <strong>Count:</strong> {row['Count']} ({row['Percentage']}%)<br>
+                            <strong>Completion:</strong> {row['Completion Rate'] if row['Completion Rate'] != 'N/A' else 'N/A'}{'%' if row['Completion Rate'] != 'N/A' else ''}
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+    with col2:
+        # Create donut chart with Plotly
+        fig = go.Figure()
+
+        fig.add_trace(go.Pie(
+            labels=priority_counts["Priority"],
+            values=priority_counts["Count"],
+            hole=0.5,
+            marker_colors=[priority_colors[p] for p in priority_counts["Priority"]],
+            textinfo='label+percent',
+            textposition='inside',
+            insidetextorientation='radial',
+            hovertemplate="<b>%{label}</b><br>Count: %{value}<br>%{percent}<extra></extra>",
+            sort=False
+        ))
+
+        # Update layout for professional appearance
+        fig.update_layout(
+            title='<b>Task Priority Distribution</b>',
+            title_font_size=18,
+            title_x=0.5,
+            showlegend=False,
+            margin=dict(t=50, b=20, l=20, r=20),
+            hoverlabel=dict(
+                bgcolor="white",
+                font_size=12,
+                font_family="Arial"
+            ),
+            annotations=[dict(
+                text=f"Total<br>{total_tasks}",
+                x=0.5, y=0.5,
+                font_size=16,
+                showarrow=False
+            )]
+        )
+
+        plotly_chart(fig, use_container_width=True)
+
+    # Add trend analysis section
+    st.markdown("---")
+    st.markdown("### Priority Trends Over Time")
+
+    try:
+        # Tasks per month of their planned start and priority, counted in SQL
+        monthly = pd.DataFrame(summarize_tasks(filters, ('start_month', 'priority')),
+                               columns=['Month', 'Priority'] + SUMMARY_COLUMNS)
+        if monthly.empty:
+            st.info("Add date information to tasks to enable priority trend analysis")
+        else:
+            trend_data = monthly.pivot(index='Month', columns='Priority', values='Tasks').fillna(0)
+
+            # Create area chart
+            fig_trend = go.Figure()
+
+            for priority in ["High", "Medium", "Low"]:
+                if priority in trend_data.columns:
+                    fig_trend.add_trace(go.Scatter(
+                        x=trend_data.index,
+                        y=trend_data[priority],
+                        name=priority,
+                        stackgroup='one',
+                        mode='lines',
+                        line=dict(width=0.5, color=priority_colors[priority]),
+                        fillcolor=priority_colors[priority],
+                        hovertemplate=f"<b>{priority}</b><br>Month: %{{x}}<br>Tasks: %{{y}}<extra></extra>",
+                        opacity=0.8
+                    ))
+
+            fig_trend.update_layout(
+                title='<b>Monthly Priority Distribution</b>',
+                xaxis_title='Month',
+                yaxis_title='Number of Tasks',
+                hovermode="x unified",
+                plot_bgcolor='rgba(245,245,245,1)',
+                paper_bgcolor='rgba(255,255,255,1)',
+                margin=dict(t=50, b=50, l=50, r=50)
+            )
+
+            plotly_chart(fig_trend, use_container_width=True)
+
+    except Exception as e:
+        st.warning(f"Could not generate trends: {str(e)}")
+
+    # Add export options
+    with st.expander("📤 Export Data", expanded=False):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.download_button(
+                label="Download Priority Data (CSV)",
+                data=priority_counts.to_csv(index=False),
+                file_name="task_priority_distribution.csv",
+                mime="text/csv"
+            )
+
+        with col2:
+            png_download_button(fig, "Download Chart (PNG)", "priority_distribution.png", width=800)
+
+
+# Helper function for task progress over time (Line Chart)
+# Replace the existing plot_task_progress_over_time function with this new version
+@timed_chart
+def plot_task_progress_over_time(filters):
+    """Enhanced professional visualization of task completion trends over time"""
+    total_tasks = count_tasks(filters)
+    if not total_tasks:
+        st.warning("No tasks found for visualization.")
+        return
+
+    # Completed tasks per week of their planned start, counted in SQL
+    weekly = pd.DataFrame(summarize_tasks(filters, ('start_week',)),
+                          columns=['Planned Start Date'] + SUMMARY_COLUMNS)
+    weekly = weekly[weekly['Completed'] > 0]
+
+    if weekly.empty:
+        st.warning("No completed tasks with valid dates found.")
+        return
+
+    # Weeks without completions count as zero
+    progress_data = (
+        weekly.set_index(pd.to_datetime(weekly['Planned Start Date']))['Completed']
+        .asfreq('W-MON', fill_value=0)
+        .rename_axis('Planned Start Date')
+        .reset_index(name='Completed Tasks')
+    )
+
+    # Calculate 4-week moving average
+    progress_data['4-Week Avg'] = progress_data['Completed Tasks'].rolling(4).mean()
+
+    # Create figure with secondary y-axis
+    fig = go.Figure()
+
+    # Add bar chart for weekly completions
+    fig.add_trace(go.Bar(
+        x=progress_data['Planned Start Date'],
+        y=progress_data['Completed Tasks'],
+        name='Weekly Completed',
+        marker_color='#4E8BF5',  # Primary blue
+        opacity=0.7,
+        hovertemplate='<b>Week of %{x|%b %d}</b><br>Tasks: %{y}<extra></extra>'
+    ))
+
+    # Add line chart for moving average
+    fig.add_trace(go.Scatter(
+        x=progress_data['Planned Start Date'],
+        y=progress_data['4-Week Avg'],
+        name='4-Week Average',
+        line=dict(color='#FFA500', width=3),
+        mode='lines',
+        hovertemplate='<b>4-Week Avg</b>: %{y:.1f} tasks<extra></extra>'
+    ))
+
+    # Add target line (average completion rate)
+    avg_completion = progress_data['Completed Tasks'].mean()
+    fig.add_hline(
+        y=avg_completion,
+        line_dash="dot",
+        line_color="#32CD32",
+        annotation_text=f"Average: {avg_completion:.1f} tasks/week",
+        annotation_position="top right"
+    )
+
+    # Calculate and display key metrics
+    total_completed = int(weekly['Completed'].sum())
+    completion_rate = total_completed / total_tasks * 100
+    current_week = datetime.now().isocalendar()[1]
+    current_week_completed = progress_data[progress_data['Planned Start Date'].dt.isocalendar().week == current_week]['Completed Tasks'].sum()
+
+    # Display metrics in columns
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Completed Tasks", total_completed)
+    with col2:
+        st.metric("Overall Completion Rate", f"{completion_rate:.1f}%")
+    with col3:
+        st.metric("This Week's Completions", current_week_completed if not pd.isna(current_week_completed) else 0)
+
+    # Update layout for professional appearance
+    fig.update_layout(
+        title='<b>Task Completion Trends</b>',
+        title_font_size=20,
+        xaxis_title='Week Starting',
+        yaxis_title='Tasks Completed',
+        hovermode='x unified',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        plot_bgcolor='rgba(245,245,245,1)',
+        paper_bgcolor='rgba(255,255,255,1)',
+        margin=dict(l=50, r=50, b=100, t=100, pad=10),
+        xaxis=dict(
+            showgrid=True,
+            gridcolor='rgba(200,200,200,0.2)',
+            tickformat='%b %d<br>%Y'
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='rgba(200,200,200,0.2)',
+            rangemode='tozero'
+        ),
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=12,
+            font_family="Arial"
+        )
+    )
+
+    # Display the chart
+    plotly_chart(fig, use_container_width=True)
+
+    # Add detailed data table
+    with st.expander("📊 View Detailed Data", expanded=False):
+        # Format dates for display
+        display_df = progress_data.copy()
+        display_df['Week Starting'] = display_df['Planned Start Date'].dt.strftime('%b %d, %Y')
+        display_df = display_df[['Week Starting', 'Completed Tasks', '4-Week Avg']]
+        display_df['4-Week Avg'] = display_df['4-Week Avg'].round(1)
+
+        st.dataframe(
+            display_df,
+            column_config={
+                "Week Starting": "Week Starting",
+                "Completed Tasks": st.column_config.NumberColumn("Tasks Completed", format="%d"),
+                "4-Week Avg": st.column_config.NumberColumn("4-Week Average", format="%.1f")
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+
+        # Export options
+        st.download_button(
+            label="📥 Download Data as CSV",
+            data=display_df.to_csv(index=False),
+            file_name="task_completion_trends.csv",
+            mime="text/csv"
+        )
+
+
+# Helper function for upcoming vs overdue tasks (Bar Chart)
+@timed_chart
+def plot_upcoming_vs_overdue_tasks(tasks_df):
+    """
+        Create a bar chart comparing the number of upcoming and overdue tasks.
+        """
+    if tasks_df.empty:
+        st.warning("No tasks found for visualization.")
+        return
+
+    # Get today's date
+    today = datetime.today().date()
+
+    # Convert "Deadline" to datetime and extract the date part
+    tasks_df["Deadline"] = pd.to_datetime(tasks_df["Deadline"]).dt.date
+
+    # Categorize tasks as upcoming or overdue
+    tasks_df["Status Category"] = tasks_df.apply(
+        lambda row: "Overdue" if row["Deadline"] < today else "Upcoming",
+        axis=1
+    )
+
+    # Count tasks by status category
+    status_counts = tasks_df["Status Category"].value_counts().reset_index()
+    status_counts.columns = ["Status Category", "Count"]
+
+    # Create bar chart
+    fig = px.bar(
+        status_counts,
+        x="Status Category",
+        y="Count",
+        title="Upcoming vs Overdue Tasks",
+        labels={"Status Category": "Task Status", "Count": "Number of Tasks"},
+        color="Status Category",
+        color_discrete_map={
+            "Upcoming": "#00BFFF",  # Blue
+            "Overdue": "#FF4500",   # Red
+        },
+    )
+    plotly_chart(fig)
+
+
+# Helper function to track budget tracking visualization
+@timed_chart
+def plot_budget_tracking(filters):
+    """Professional budget tracking dashboard with variance analysis"""
+    if not count_tasks(filters):
+        st.warning("No tasks found for visualization.")
+        return
+
+    # Totals over the tasks that have both a budget and an actual cost, summed in SQL
+    budgeted_tasks, _, total_budget, total_actual = summarize_tasks(filters, budgeted=True)[0]
+
+    if not budgeted_tasks:
+        st.warning("No valid budget data available")
+        return
+
+    # Professional color scheme
+    color_under = "#2ECC71"  # Green for under budget
+    color_over = "#E74C3C"   # Red for over budget
+    color_planned = "#3498DB" # Blue for planned
+
+    # Calculate aggregate metrics
+    total_variance = total_budget - total_actual
+    variance_pct = (total_variance / total_budget * 100) if total_budget > 0 else 0
+
+    # Create dashboard layout
+    st.markdown("## Budget Performance Dashboard")
+
+    # Top KPI metrics
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Budget", f"${total_budget:,.2f}")
+    with col2:
+        st.metric("Actual Spend", 
+                f"${total_actual:,.2f}",
+                delta=f"{variance_pct:.1f}% {'under' if total_variance >=0 else 'over'} budget",
+                delta_color="inverse")
+    with col3:
+        st.metric("Variance", 
+                f"${abs(total_variance):,.2f}",
+                help="Positive = under budget, Negative = over budget")
+
+    st.markdown("---")
+
+    # Main visualization section
+    tab1, tab2, tab3 = st.tabs(["Project Breakdown", "Variance Analysis", "Trend Analysis"])
+
+    with tab1:
+        # Project-level budget comparison
+        st.markdown("### Budget vs Actual by Project")
+
+        # Aggregate by project
+        project_data = pd.DataFrame(summarize_tasks(filters, ('project',), budgeted=True),
+                                    columns=['Project'] + SUMMARY_COLUMNS)[['Project', 'Budget', 'Actual Cost']]
+
+        # Calculate variance and sort
+        project_data['Variance'] = (project_data['Budget'] - project_data['Actual Cost']).round(2)
+        project_data['Variance Pct'] = (project_data['Variance'] / project_data['Budget'] * 100)
+        project_data = project_data.sort_values('Budget', ascending=False)
+
+        # Create waterfall chart
+        fig = go.Figure()
+
+        # Add budget bars
+        fig.add_trace(go.Bar(
+            x=project_data['Project'],
+            y=project_data['Budget'],
+            name='Planned Budget',
+            marker_color=color_planned,
+            opacity=0.7,
+            hovertemplate="<b>%{x}</b><br>Budget: $%{y:,.2f}<extra></extra>"
+        ))
+
+        # Add actual cost bars
+        fig.add_trace(go.Bar(
+            x=project_data['Project'],
+            y=project_data['Actual Cost'],
+            name='Actual Cost',
+            marker_color=np.where(project_data['Variance'] >= 0, color_under, color_over),
+            hovertemplate="<b>%{x}</b><br>Actual: $%{y:,.2f}<br>Variance: $%{text:,.2f}<extra></extra>",
+            text=project_data['Variance']
+        ))
+
+        # Add variance indicators
+        for i, row in project_data.iterrows():
+            fig.add_shape(
+                type="line",
+                x0=i-0.4, x1=i+0.4,
+                y0=row['Budget'], y1=row['Budget'],
+                line=dict(color="#7F8C8D", width=2, dash="dot"),
+                opacity=0.5
+            )
+
+        # Update layout
+        fig.update_layout(
+            barmode='group',
+            plot_bgcolor='rgba(245,245,245,1)',
+            paper_bgcolor='rgba(255,255,255,1)',
+            hovermode="x unified",
+            xaxis_title="Project",
+            yaxis_title="Amount ($)",
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1
+            ),
+            margin=dict(t=50, b=100, l=50, r=50),
+            height=500
+        )
+
+        plotly_chart(fig, use_container_width=True)
+
+        # Project variance table
+        with st.expander("View Detailed Project Data", expanded=False):
+            display_df = project_data.copy()
+            display_df['Budget'] = display_df['Budget'].apply(lambda x: f"${x:,.2f}")
+            display_df['Actual Cost'] = display_df['Actual Cost'].apply(lambda x: f"${x:,.2f}")
+            display_df['Variance'] = display_df['Variance'].apply(lambda x: f"${x:,.2f}")
+            display_df['Variance Pct'] = display_df['Variance Pct'].apply(lambda x: f"{x:.1f}%")
+
+            st.dataframe(
+                display_df,
+                column_config={
+                    "Project": "Project",
+                    "Budget": st.column_config.NumberColumn("Budget", format="$%.2f"),
+                    "Actual Cost": st.column_config.NumberColumn("Actual Cost", format="$%.2f"),
+                    "Variance": st.column_config.NumberColumn("Variance", format="$%.2f"),
+                    "Variance Pct": "Variance %"
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+
+    with tab2:
+        # Variance analysis
+        st.markdown("### Budget Variance Analysis")
+
+        # Create scatter plot of variance vs budget
+        fig = px.scatter(
+            project_data,
+            x='Budget',
+            y='Variance Pct',
+            color='Variance',
+            color_continuous_scale=[color_over, color_under],
+            size='Budget',
+            hover_name='Project',
+            labels={
+                'Budget': 'Project Budget ($)',
+                'Variance Pct': 'Variance Percentage',
+                'Variance': 'Variance ($)'
+            },
+            trendline="lowess",
+            trendline_color_override="#7F8C8D"
+        )
+
+        # Add reference lines
+        fig.update_layout(
+            shapes=[
+                # Zero variance line
+                dict(
+                    type="line",
+                    x0=0, x1=project_data['Budget'].max()*1.1,
+                    y0=0, y1=0,
+                    line=dict(color="#7F8C8D", width=2)
+                ),
+                # 10% variance threshold
+                dict(
+                    type="line",
+                    x0=0, x1=project_data['Budget'].max()*1.1,
+                    y0=10, y1=10,
+                    line=dict(color="#E74C3C", width=1, dash="dot")
+                ),
+                dict(
+                    type="line",
+                    x0=0, x1=project_data['Budget'].max()*1.1,
+                    y0=-10, y1=-10,
+                    line=dict(color="#E74C3C", width=1, dash="dot")
+                )
+            ],
+            annotations=[
+                dict(
+                    x=project_data['Budget'].max()*0.8,
+                    y=11,
+                    text="10% Variance Threshold",
+                    showarrow=False,
+                    font=dict(color="#E74C3C")
+                )
+            ],
+            plot_bgcolor='rgba(245,245,245,1)',
+            height=500
+        )
+
+        plotly_chart(fig, use_container_width=True)
+
+        # Variance insights
+        over_budget = project_data[project_data['Variance'] < 0]
+        under_budget = project_data[project_data['Variance'] > 0]
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("#### Over Budget Projects")
+            if not over_budget.empty:
+                over_budget = over_budget.sort_values('Variance Pct')
+                for _, row in over_budget.iterrows():
+                    st.metric(
+                        row['Project'],
+                        f"${abs(row['Variance']):,.2f}",
+                        delta=f"{row['Variance Pct']:.1f}% over",
+                        delta_color="inverse"
+                    )
+            else:
+                st.success("No projects over budget")
+
+        with col2:
+            st.markdown("#### Under Budget Projects")
+            if not under_budget.empty:
+                under_budget = under_budget.sort_values('Variance Pct', ascending=False)
+                for _, row in under_budget.iterrows():
+                    st.metric(
+                        row['Project'],
+                        f"${row['Variance']:,.2f}",
+                        delta=f"{row['Variance Pct']:.1f}% under"
+                    )
+            else:
+                st.info("No projects under budget")
+
+    with tab3:
+        # Time-based trend analysis (if date available)
+        trend_data = pd.DataFrame(summarize_tasks(filters, ('start_month',), budgeted=True),
+                                  columns=['Month'] + SUMMARY_COLUMNS)[['Month', 'Budget', 'Actual Cost']]
+        if not trend_data.empty:
+            try:
+                st.markdown("### Budget Performance Over Time")
+
+                trend_data['Variance'] = trend_data['Budget'] - trend_data['Actual Cost']
+
+                # Create time series chart
+                fig = go.Figure()
+
+                fig.add_trace(go.Scatter(
+                    x=trend_data['Month'],
+                    y=trend_data['Budget'],
+                    name='Planned Budget',
+                    line=dict(color=color_planned, width=3),
+                    mode='lines+markers',
+                    hovertemplate="<b>%{x}</b><br>Budget: $%{y:,.2f}<extra></extra>"
+                ))
+
+                fig.add_trace(go.Scatter(
+                    x=trend_data['Month'],
+                    y=trend_data['Actual Cost'],
+                    name='Actual Cost',
+                    line=dict(color=color_over, width=3),
+                    mode='lines+markers',
+                    hovertemplate="<b>%{x}</b><br>Actual: $%{y:,.2f}<br>Variance: $%{text:,.2f}<extra></extra>",
+                    text=trend_data['Variance']
+                ))
+
+                # Add variance area
+                fig.add_trace(go.Scatter(
+                    x=trend_data['Month'],
+                    y=trend_data['Budget'],
+                    fill='tonexty',
+                    fillcolor='rgba(46, 204, 113, 0.2)',
+                    line=dict(width=0),
+                    showlegend=False,
+                    hoverinfo='skip'
+                ))
+
+                fig.update_layout(
+                    plot_bgcolor='rgba(245,245,245,1)',
+                    xaxis_title="Month",
+                    yaxis_title="Amount ($)",
+                    hovermode="x unified",
+                    height=500
+                )
+
+                plotly_chart(fig, use_container_width=True)
+
+                # Monthly variance table
+                with st.expander("View Monthly Variance Data", expanded=False):
+                    display_df = trend_data.copy()
+                    display_df['Budget'] = display_df['Budget'].apply(lambda x: f"${x:,.2f}")
+                    display_df['Actual Cost'] = display_df['Actual Cost'].apply(lambda x: f"${x:,.2f}")
+                    display_df['Variance'] = display_df['Variance'].apply(lambda x: f"${x:,.2f}")
+
+                    st.dataframe(
+                        display_df,
+                        column_config={
+                            "Month": "Month",
+                            "Budget": st.column_config.NumberColumn("Budget", format="$%.2f"),
+                            "Actual Cost": st.column_config.NumberColumn("Actual Cost", format="$%.2f"),
+                            "Variance": st.column_config.NumberColumn("Variance", format="$%.2f")
+                        },
+                        hide_index=True,
+                        use_container_width=True
+                    )
+
+            except Exception as e:
+                st.warning(f"Could not generate trend analysis: {str(e)}")
+        else:
+            st.info("Date information not available for trend analysis")
+
+    # Export options
+    st.markdown("---")
+    with st.expander("📤 Export Budget Data", expanded=False):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.download_button(
+                label="Download Project Budget Data (CSV)",
+                data=project_data.to_csv(index=False),
+                file_name="project_budget_data.csv",
+                mime="text/csv"
+            )
+
+        with col2:
+            if 'fig' in locals():
+                png_download_button(fig, "Download Budget Chart (PNG)", "budget_analysis.png", width=1000)
+
+
+# Helper function to visualize task timeline (Gantt chart)
+@timed_chart
+def plot_task_timeline(filters):
+    """Enhanced professional timeline visualization for tasks"""
+    if not count_tasks(filters):
+        st.warning("No tasks found for visualization.")
+        return
+
+    total = count_tasks(filters, dated=True)
+    if not total:
+        st.warning("No valid tasks with complete date information found.")
+        return
+
+    # Very long task lists are drawn a window at a time; only that window is fetched
+    offset, limit = gantt_page(total, key="task_timeline_window")
+    timeline_df = pd.DataFrame(fetch_task_timeline(filters, offset, limit), columns=TASK_COLUMNS)
+    timeline_df['Planned Start Date'] = pd.to_datetime(timeline_df['Planned Start Date'], errors='coerce')
+    timeline_df['Planned Deadline'] = pd.to_datetime(timeline_df['Planned Deadline'], errors='coerce')
+
+    # Calculate duration in milliseconds for Plotly
+    timeline_df['Planned Duration'] = (
+        timeline_df['Planned Deadline'] - timeline_df['Planned Start Date']
+    ).dt.total_seconds() * 1000  # Convert to milliseconds
+
+    # Handle actual dates if available
+    has_actual_dates = False
+    if 'Actual Start Date' in timeline_df.columns and 'Actual Deadline' in timeline_df.columns:
+        timeline_df['Actual Start Date'] = pd.to_datetime(timeline_df['Actual Start Date'], errors='coerce')
+        timeline_df['Actual Deadline'] = pd.to_datetime(timeline_df['Actual Deadline'], errors='coerce')
+
+        # Only consider actual dates if both are present
+        actual_dates_mask = timeline_df['Actual Start Date'].notna() & timeline_df['Actual Deadline'].notna()
+        if actual_dates_mask.any():
+            has_actual_dates = True
+            timeline_df.loc[actual_dates_mask, 'Actual Duration'] = (
+                timeline_df.loc[actual_dates_mask, 'Actual Deadline'] - 
+                timeline_df.loc[actual_dates_mask, 'Actual Start Date']
+            ).dt.total_seconds() * 1000  # Convert to milliseconds
+
+    # Build the hover text column-wise rather than with a per-row apply()
+    ms_per_day = 1000 * 60 * 60 * 24
+    timeline_df['Hover Text'] = (
+        "<b>" + timeline_df['Task'].astype(str) + "</b><br>"
+        + "<b>Project:</b> " + timeline_df['Project'].astype(str) + "<br>"
+        + "<b>Status:</b> " + timeline_df['Status'].astype(str) + "<br>"
+        + "<b>Priority:</b> " + timeline_df['Priority'].astype(str) + "<br>"
+        + "<b>Assignee:</b> " + timeline_df['Assignee'].astype(str) + "<br>"
+        + "<b>Planned:</b> " + format_dates(timeline_df['Planned Start Date'])
+        + " - " + format_dates(timeline_df['Planned Deadline']) + "<br>"
+        + "<b>Duration:</b> " + (timeline_df['Planned Duration'] / ms_per_day).map('{:.1f}'.format) + " days"
+    )
+
+    if has_actual_dates:
+        timeline_df.loc[actual_dates_mask, 'Hover Text'] += (
+            "<br><b>Actual:</b> " + format_dates(timeline_df.loc[actual_dates_mask, 'Actual Start Date'])
+            + " - " + format_dates(timeline_df.loc[actual_dates_mask, 'Actual Deadline']) + "<br>"
+            + "<b>Actual Duration:</b> "
+            + (timeline_df.loc[actual_dates_mask, 'Actual Duration'] / ms_per_day).map('{:.1f}'.format) + " days"
+        )
+
+    # Create figure
+    fig = go.Figure()
+
+    # Add planned timeline bars
+    fig.add_trace(go.Bar(
+        y=timeline_df['Task'],
+        x=timeline_df['Planned Duration'].astype(float),  # Ensure numeric
+        base=timeline_df['Planned Start Date'].astype('int64') // 10**6,  # Convert to milliseconds
+        orientation='h',
+        name='Planned',
+        marker_color='rgba(78, 139, 245, 0.6)',  # Semi-transparent blue
+        marker_line_color='rgba(78, 139, 245, 1.0)',
+        marker_line_width=1,
+        hoverinfo='text',
+        hovertext=timeline_df['Hover Text'],
+        customdata=timeline_df[['Status', 'Priority']]
+    ))
+
+    # Add actual timeline bars if available
+    if has_actual_dates:
+        fig.add_trace(go.Bar(
+            y=timeline_df.loc[actual_dates_mask, 'Task'],
+            x=timeline_df.loc[actual_dates_mask, 'Actual Duration'].astype(float),  # Ensure numeric
+            base=timeline_df.loc[actual_dates_mask, 'Actual Start Date'].astype('int64') // 10**6,  # Convert to milliseconds
+            orientation='h',
+            name='Actual',
+            marker_color='rgba(50, 205, 50, 0.6)',  # Semi-transparent green
+            marker_line_color='rgba(50, 205, 50, 1.0)',
+            marker_line_width=1,
+            hoverinfo='text',
+            hovertext=timeline_df.loc[actual_dates_mask, 'Hover Text']
+        ))
+
+    # Add today's line - convert datetime to milliseconds since epoch
+    today = datetime.now()
+    today_ms = today.timestamp() * 1000  # Convert to milliseconds
+
+    fig.add_vline(
+        x=today_ms,
+        line_width=2,
+        line_dash="dash",
+        line_color="red",
+        annotation_text=f"Today: {today.strftime('%b %d, %Y')}",
+        annotation_position="top right",
+        annotation_font_size=12,
+        annotation_font_color="red"
+    )
+
+    # Update layout for professional appearance
+    fig.update_layout(
+        title='<b>Task Timeline Comparison</b>',
+        title_font_size=20,
+        title_x=0.05,
+        title_y=0.95,
+        barmode='overlay',
+        height=max(600, len(timeline_df) * 30),  # Dynamic height based on number of tasks
+        hovermode='closest',
+        xaxis_title='Timeline',
+        yaxis_title='Tasks',
+        yaxis=dict(
+            autorange=True,
+            showgrid=True,
+            zeroline=True,
+            gridcolor='rgba(0, 0, 0, 0.05)'
+        ),
+        xaxis=dict(
+            type='date',  # Tell Plotly this is a date axis
+            showgrid=True,
+            zeroline=True,
+            gridcolor='rgba(0, 0, 0, 0.05)',
+            tickformat='%b %d, %Y'  # Format dates nicely
+        ),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        margin=dict(l=100, r=50, b=100, t=100, pad=10),
+        plot_bgcolor='rgba(255, 255, 255, 0.9)',
+        paper_bgcolor='rgba(255, 255, 255, 0.9)',
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=12,
+            font_family="Arial"
+        )
+    )
+
+    # Add status-based color coding
+    for status, color in status_colors.items():
+        status_tasks = timeline_df[timeline_df['Status'] == status]
+        if not status_tasks.empty:
+            fig.add_trace(go.Scatter(
+                x=[None],  # These won't be visible
+                y=[None],
+                mode='markers',
+                marker=dict(size=10, color=color),
+                name=status,
+                hoverinfo='none',
+                showlegend=True
+            ))
+
+    # Display the figure
+    plotly_chart(fig, use_container_width=True)
+
+    # Add download button
+    with st.expander("📥 Export Options", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="Download Data as CSV",
+                data=timeline_df.to_csv(index=False),
+                file_name="task_timeline_data.csv",
+                mime="text/csv"
+            )
+        with col2:
+            png_download_button(fig, "Download Chart as PNG", "task_timeline.png")
+
+
+#helper function to visualize assignee workload (Sunburst chart)
+@timed_chart
+def plot_assignee_workload(filters):
+    """Professional workload visualization with capacity analysis"""
+    # Tasks per assignee and status, counted in SQL
+    workload_counts = pd.DataFrame(summarize_tasks(filters, ('assignee', 'status')),
+                                   columns=['Assignee', 'Status'] + SUMMARY_COLUMNS)
+    if workload_counts.empty:
+        st.warning("No tasks found for visualization.")
+        return
+
+    # Professional color palette
+    status_colors = {
+        "Completed": "#2ECC71",  # Green
+        "In Progress": "#3498DB",  # Blue
+        "Pending": "#F39C12",  # Orange
+        "Overdue": "#E74C3C"  # Red
+    }
+
+    # Calculate workload metrics
+    workload_data = workload_counts.pivot(index='Assignee', columns='Status', values='Tasks').fillna(0)
+
+    # Calculate totals and percentages
+    workload_data['Total Tasks'] = workload_data.sum(axis=1)
+    workload_data = workload_data.sort_values('Total Tasks', ascending=False)
+
+    # Convert to long format for visualization
+    workload_long = workload_data.drop(columns=['Total Tasks']).reset_index().melt(
+        id_vars='Assignee', 
+        var_name='Status', 
+        value_name='Count'
+    )
+
+    # Create a 2-column layout
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        # Workload metrics summary
+        st.markdown("### Workload Summary")
+
+        # Calculate capacity metrics
+        avg_tasks = workload_data['Total Tasks'].mean()
+        max_tasks = workload_data['Total Tasks'].max()
+        min_tasks = workload_data['Total Tasks'].min()
+
+        st.metric("Average Tasks per Assignee", round(avg_tasks, 1))
+        st.metric("Most Loaded Assignee", 
+                f"{workload_data['Total Tasks'].idxmax()} ({max_tasks})",
+                help="Assignee with highest task count")
+        st.metric("Least Loaded Assignee", 
+                f"{workload_data['Total Tasks'].idxmin()} ({min_tasks})",
+                help="Assignee with lowest task count")
+
+        # Workload distribution stats
+        st.markdown("#### Distribution")
+        st.write(f"**Std Dev:** {workload_data['Total Tasks'].std():.1f}")
+        st.write(f"**25th Percentile:** {workload_data['Total Tasks'].quantile(0.25):.1f}")
+        st.write(f"**75th Percentile:** {workload_data['Total Tasks'].quantile(0.75):.1f}")
+
+        # Export raw data
+        with st.expander("📤 Export Data", expanded=False):
+            st.download_button(
+                label="Download Workload Data",
+                data=workload_data.reset_index().to_csv(index=False),
+                file_name="workload_analysis.csv",
+                mime="text/csv"
+            )
+
+    with col2:
+        # Interactive stacked bar chart
+        fig = px.bar(
+            workload_long,
+            x='Assignee',
+            y='Count',
+            color='Status',
+            color_discrete_map=status_colors,
+            title='<b>Task Distribution by Assignee</b>',
+            labels={'Count': 'Number of Tasks'},
+            hover_data=['Status', 'Count'],
+            category_orders={"Status": ["Completed", "In Progress", "Pending", "Overdue"]}
+        )
+
+        # Add reference line for average workload
+        fig.add_hline(
+            y=avg_tasks,
+            line_dash="dot",
+            line_color="#7F8C8D",
+            annotation_text=f"Average: {avg_tasks:.1f}",
+            annotation_position="top right"
+        )
+
+        # Professional styling
+        fig.update_layout(
+            plot_bgcolor='rgba(245,245,245,1)',
+            paper_bgcolor='rgba(255,255,255,1)',
+            margin=dict(t=50, b=100, l=50, r=50),
+            hovermode="x unified",
+            xaxis_title=None,
+            yaxis_title="Number of Tasks",
+            legend_title="Task Status",
+            uniformtext_minsize=8,
+            uniformtext_mode='hide',
+            bargap=0.2,
+            height=600
+        )
+
+        # Rotate x-axis labels for better readability
+        fig.update_xaxes(tickangle=45)
+
+        plotly_chart(fig, use_container_width=True)
+
+    # Workload balance analysis
+    st.markdown("---")
+    st.markdown("### Workload Balance Analysis")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Workload distribution pie chart
+        fig_pie = px.pie(
+            workload_data.reset_index(),
+            names='Assignee',
+            values='Total Tasks',
+            title='<b>Workload Distribution</b>',
+            hover_data=['Total Tasks'],
+            color_discrete_sequence=px.colors.qualitative.Pastel
+        )
+
+        fig_pie.update_traces(
+            textposition='inside',
+            textinfo='percent+label',
+            hovertemplate="<b>%{label}</b><br>%{value} tasks (%{percent})<extra></extra>"
+        )
+
+        fig_pie.update_layout(
+            showlegend=False,
+            margin=dict(t=50, b=50, l=50, r=50),
+            height=400
+        )
+
+        plotly_chart(fig_pie, use_container_width=True)
+
+    with col2:
+        # Completion rate analysis
+        completion_rates = workload_counts.groupby('Assignee')[['Tasks', 'Completed']].sum()
+        completion_rates = (completion_rates['Completed'] / completion_rates['Tasks'] * 100
+                            ).reset_index(name='Completion Rate')
+
+        fig_completion = px.bar(
+            completion_rates.sort_values('Completion Rate'),
+            x='Completion Rate',
+            y='Assignee',
+            orientation='h',
+            title='<b>Completion Rates by Assignee</b>',
+            labels={'Completion Rate': 'Completion Rate (%)'},
+            color='Completion Rate',
+            color_continuous_scale='Blues'
+        )
+
+        fig_completion.update_layout(
+            plot_bgcolor='rgba(245,245,245,1)',
+            yaxis_title=None,
+            xaxis_title="Completion Rate (%)",
+            height=400,
+            margin=dict(t=50, b=50, l=50, r=50)
+        )
+
+        plotly_chart(fig_completion, use_container_width=True)
+
+    # Capacity planning section
+    st.markdown("---")
+    st.markdown("### Capacity Planning Insights")
+
+    # Calculate workload balance score (Gini coefficient)
+    def gini_coefficient(x):
+        x = sorted(x)
+        n = len(x)
+        s = sum(x)
+        if s == 0:
+            return 0
+        r = range(1, n+1)
+        num = 2 * sum(i*j for i,j in zip(r, x))
+        den = n * sum(x)
+        return (num / den) - (n + 1) / n
+
+    gini = gini_coefficient(workload_data['Total Tasks'])
+
+    cols = st.columns(3)
+    with cols[0]:
+        st.metric("Workload Balance Score", 
+                f"{gini:.2f}",
+                help="0 = perfect balance, 1 = maximum imbalance")
+    with cols[1]:
+        overload_threshold = avg_tasks * 1.5
+        overloaded = sum(workload_data['Total Tasks'] > overload_threshold)
+        st.metric("Overloaded Assignees", 
+                f"{overloaded}",
+                help=f"> {overload_threshold:.1f} tasks (1.5x avg)")
+    with cols[2]:
+        underload_threshold = avg_tasks * 0.5
+        underloaded = sum(workload_data['Total Tasks'] < underload_threshold)
+        st.metric("Underloaded Assignees", 
+                f"{underloaded}",
+                help=f"< {underload_threshold:.1f} tasks (0.5x avg)")
+
+    # Recommendations
+    if gini > 0.3:
+        st.warning("⚠️ Significant workload imbalance detected. Consider redistributing tasks.")
+    elif gini > 0.15:
+        st.info("ℹ️ Moderate workload imbalance. Monitor for potential bottlenecks.")
+    else:
+        st.success("✓ Workload is well balanced across team members")
+
+
+# Helper function to visualize budget variance (Waterfall chart)
+@timed_chart
+def plot_budget_variance(filters):
+    """Plot budget variance with proper null handling"""
+    if not count_tasks(filters):
+        st.warning("No budget variance data available")
+        return
+
+    # Only tasks with both a budget and an actual cost have a variance
+    total = summarize_tasks(filters, budgeted=True)[0][0]
+    if not total:
+        st.warning("No tasks with complete budget data available")
+        return
+
+    # One bar per task, so large selections are drawn a window at a time
+    offset, limit = gantt_page(total, key="budget_variance_window")
+    variance_df = pd.DataFrame(fetch_budget_variances(filters, offset, limit),
+                               columns=['Task', 'Project', 'Budget Variance'])
+
+    # Create waterfall chart
+    fig = go.Figure(go.Waterfall(
+        name="Budget Variance",
+        orientation="v",
+        measure=["relative"] * len(variance_df),
+        x=variance_df['Task'] + "<br>(" + variance_df['Project'] + ")",
+        textposition="outside",
+        text=[f"${x:,.2f}" for x in variance_df['Budget Variance']],
+        y=variance_df['Budget Variance'],
+        connector={"line":{"color":"rgb(63, 63, 63)"}},
+        increasing={"marker":{"color":"#00CC96"}},  # Green for positive variance
+        decreasing={"marker":{"color":"#EF553B"}},  # Red for negative variance
+    ))
+
+    fig.update_layout(
+        title="Task Budget Variance (Budget - Actual Cost)",
+        yaxis_title="Amount ($)",
+        showlegend=False,
+        height=600
+    )
+
+    plotly_chart(fig, use_container_width=True)
+
+
+def show_tasks_page():
+    """Render the Tasks page"""
+    st.markdown("---")
+
+    # Custom CSS for enhanced styling
+    st.markdown("""
+        <style>
+            .doc-header {
+                background: linear-gradient(135deg, #6e48aa 0%, #9d50bb 100%);
+                color: white;
+                padding: 2rem;
+                border-radius: 10px;
+                margin-bottom: 2rem;
+                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+            }
+            
+            .task-grid-container {
+                position: relative;
+                margin-bottom: 20px;
+            }
+            
+            .task-grid {
+                display: flex;
+                flex-wrap: wrap;
+                gap: 0;
+            }
+            
+            .task-column {
+                flex: 1;
+                min-width: 0;
+                padding: 0 15px;
+                position: relative;
+            }
+            
+            .task-column:not(:last-child)::after {
+                content: "";
+                position: absolute;
+                right: 0;
+                top: 0;
+                bottom: 0;
+                width: 1px;
+                background: linear-gradient(to bottom, 
+                    rgba(0,0,0,0) 0%, 
+                    rgba(224,224,224,1) 10%, 
+                    rgba(224,224,224,1) 90%, 
+                    rgba(0,0,0,0) 100%);
+            }
+            
+            .task-card {
+                border: 1px solid #e0e0e0;
+                border-radius: 8px;
+                padding: 16px;
+                background: white;
+                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+                transition: transform 0.2s, box-shadow 0.2s;
+                height: 100%;
+                margin-bottom: 20px;
+            }
+            
+            .task-card:hover {
+                transform: translateY(-2px);
+                box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+            }
+            
+            .task-card-overdue {
+                border-left: 4px solid #ff4d4d;
+                background: #fff5f5;
+            }
+            
+            .task-card-content {
+                height: 100%;
+                display: flex;
+                flex-direction: column;
+            }
+            
+            .task-card-buttons {
+                margin-top: auto;
+                padding-top: 10px;
+                display: flex;
+                justify-content: space-between;
+            }
+            
+            @media (max-width: 900px) {
+                .task-column {
+                    flex: 100%;
+                    padding: 0;
+                    margin-bottom: 20px;
+                }
+                
+                .task-column:not(:last-child) {
+                    padding-bottom: 20px;
+                    border-bottom: 1px solid #e0e0e0;
+                }
+                
+                .task-column:not(:last-child)::after {
+                    display: none;
+                }
+            }
+        </style>
+        """, unsafe_allow_html=True)
+
+
+    # Header Section with Gradient
+    st.markdown("""
+        <div class="doc-header">
+            <h1 style="color: white; margin-bottom: 0.5rem;">✅ Task Management</h1>
+            <p style="font-size: 1.1rem; opacity: 0.9;"></p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # ======= Section Divider =======
+    st.markdown("---")
+    st.header("📂 Create New Tasks")
+
+    # Get all projects for admin, or only owned projects for non-admin
+    if st.session_state.user_role == "Admin":
+        projects = query_db("SELECT id, name, user_id FROM projects ORDER BY name")
+    else:
+        projects = query_db("SELECT id, name, user_id FROM projects WHERE user_id = ? ORDER BY name", 
+                        (st.session_state.user_id,))
+
+    # Only show the task creation form if user is admin or has owned projects
+    if st.session_state.user_role == "Admin" or projects:
+        with st.expander("➕ Create New Task", expanded=False):
+            with st.form(key="create_task_form", clear_on_submit=True):
+                # Create project dropdown options
+                if st.session_state.user_role == "Admin":
+                    project_options = [project[1] for project in projects]  # All projects for admin
+                else:
+                    project_options = [project[1] for project in projects]  # Only owned projects
+
+                selected_project = st.selectbox("Project*", project_options)
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    title = st.text_input("Task Title*", placeholder="Enter task name")
+                    start_date = st.date_input("Start Date*")
+                with col2:
+                    priority = st.selectbox("Priority*", ["High", "Medium", "Low"])
+                    deadline = st.date_input("Deadline*")
+                    budget = st.number_input("Budget ($)", min_value=0.0, value=0.0, step=0.01)
+
+                description = st.text_area("Description", placeholder="Enter detailed task description")
+
+                spent_time = st.number_input("Time Spent (hours)", min_value=0.0, value=0.0, step=0.5)
+
+                # Get all users for assignment dropdown
+                team_members = query_db("SELECT id, username FROM users ORDER BY username")
+                assigned_to = st.selectbox("Assign To*", [member[1] for member in team_members])
+
+                submitted = st.form_submit_button("Create Task")
+
+                if submitted:
+                    # Validate all required fields
+                    if not title.strip():
+                        st.error("Task title is required")
+                    elif deadline < start_date:
+                        st.error("Deadline must be on or after the start date")
+                    else:
+                        project_id = query_db("SELECT id FROM projects WHERE name = ?", (selected_project,), one=True)[0]
+                        assigned_to_id = query_db("SELECT id FROM users WHERE username = ?", (assigned_to,), one=True)[0]
+
+                        query_db("""
+                                INSERT INTO tasks 
+                                (project_id, title, description, start_date, deadline, priority, 
+                                assigned_to, budget, time_spent)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            """, (
+                            project_id, title.strip(), description, start_date, deadline, 
+                            priority, assigned_to_id, budget, spent_time
+                        ))
+
+                        # Show both toast and success message for reliability
+                        try:
+                            st.toast("✅ Task created successfully!", icon="✅")
+                        except:
+                            pass  # Fallback if toast isn't available
+
+                        st.success("Task created successfully!")
+
+                        # Add slight delay before refresh to ensure message is seen
+                        time.sleep(1.5)
+                        st.rerun()
+    else:
+        st.warning("⛔ You don't have permission to create tasks. Only project owners can create tasks for their projects.")
+
+    # ======= Section Divider =======
+
+    # ======= Project Tasks Section =======
+
+    # Display Project Tasks Section
+    # Display Project Tasks Section
+    st.markdown("---")
+    st.header("📋 Project Tasks")
+
+    projects = get_projects()
+
+    if not projects:
+        st.warning("No projects found in the database.")
+    else:
+        # Create dropdown for project selection
+        project_options = ["Select a project..."] + [project[2] for project in projects]
+        selected_project = st.selectbox("Select Project to View Tasks", project_options)
+
+        if selected_project != "Select a project...":
+            project_id = query_db("SELECT id FROM projects WHERE name=?", (selected_project,), one=True)[0]
+            tasks = query_db("SELECT * FROM tasks WHERE project_id=?", (project_id,))
+
+            st.write(f"### Tasks for: {selected_project}")
+
+            can_bulk_edit = st.session_state.user_role == "Admin" or query_db(
+                "SELECT 1 FROM projects WHERE id=? AND user_id=?", (project_id, st.session_state.user_id), one=True
+            )
+            if tasks and can_bulk_edit:
+                with st.expander("🧰 Bulk Actions", expanded=False):
+                    task_titles = {task[0]: task[2] for task in tasks}
+                    selected_ids = st.multiselect(
+                        "Tasks", options=list(task_titles), format_func=lambda x: task_titles[x],
+                        key="bulk_task_ids"
+                    )
+                    action = st.selectbox("Action", ["Change status", "Reassign", "Shift dates", "Delete"],
+                                          key="bulk_action")
+                    if action == "Change status":
+                        new_status = st.selectbox("New status", ["Pending", "In Progress", "Completed"],
+                                                  key="bulk_status")
+                    elif action == "Reassign":
+                        directory = get_user_directory()
+                        assignee_ids = [None] + sorted(directory, key=lambda uid: directory[uid][0])
+                        new_assignee = st.selectbox(
+                            "Assign to", assignee_ids,
+                            format_func=lambda uid: "Unassigned" if uid is None else directory[uid][0],
+                            key="bulk_assignee"
+                        )
+                    elif action == "Shift dates":
+                        shift_days = st.number_input("Shift by (days)", value=7, step=1, key="bulk_shift_days")
+                    else:
+                        confirm_bulk_delete = st.checkbox(
+                            "Delete the selected tasks with their subtasks, comments and files", key="bulk_confirm_delete"
+                        )
+
+                    if st.button("Apply to selected tasks", key="bulk_apply", disabled=not selected_ids):
+                        # Each action is one transaction, whatever the number of tasks
+                        blocked = []
+                        if action == "Change status":
+                            changed, blocked = set_task_status(selected_ids, new_status)
+                        elif action == "Reassign":
+                            changed = reassign_tasks(selected_ids, new_assignee,
+                                                     assigned_by=st.session_state.user_id)
+                        elif action == "Shift dates":
+                            changed = shift_task_dates(selected_ids, shift_days)
+                        elif confirm_bulk_delete:
+                            changed = delete_tasks(selected_ids)
+                        else:
+                            changed = None
+                            st.warning("Tick the confirmation box to delete tasks.")
+                        if blocked:
+                            st.error("Not completed - open subtasks or dependencies: "
+                                     + ", ".join(task_titles[task_id] for task_id in blocked))
+                        if changed:
+                            st.success(f"Updated {changed} task(s).")
+                            del st.session_state.bulk_task_ids
+                            time.sleep(0.5 if not blocked else 2)
+                            st.rerun()
+
+            if not tasks:
+                st.warning("No tasks found for this project.")
+            else:
+                # Custom CSS for visible dividers
+                st.markdown("""
+                    <style>
+                        .task-column {
+                            position: relative;
+                            padding: 0 15px;
+                        }
+                        .task-column:not(:last-child)::after {
+                            content: "";
+                            position: absolute;
+                            right: 0;
+                            top: 10%;
+                            bottom: 10%;
+                            width: 1px;
+                            background-color: #e0e0e0;
+                        }
+                        .task-card {
+                            border: 1px solid #e0e0e0;
+                            border-radius: 8px;
+                            padding: 16px;
+                            margin-bottom: 20px;
+                            background: white;
+                            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+                        }
+                    </style>
+                    """, unsafe_allow_html=True)
+
+                # Create columns for the grid
+                cols = st.columns(3)
+
+                for i, task in enumerate(tasks):
+                    task_id = task[0]
+                    is_overdue = classify_deadline(task[6], task[4]) == OVERDUE
+
+                    # Get assigned user's name
+                    assigned_to_id = task[10]
+                    assigned_to_name = lookup_username(assigned_to_id, default="Unassigned")
+
+                    # Get the current column (0, 1, or 2)
+                    col = cols[i % 3]
+
+                    with col:
+                        # Task card with conditional overdue styling
+                        card_border = "4px solid #ff4d4d" if is_overdue else "1px solid #e0e0e0"
+                        card_bg = "#fff5f5" if is_overdue else "white"
+
+                        st.markdown(
+                            f'<div style="border-left:{card_border}; border-radius:8px; padding:16px; '
+                            f'margin-bottom:20px; background:{card_bg}; box-shadow:0 2px 8px rgba(0,0,0,0.1)">'
+                            f'<h3 style="margin-top:0;color:#2c3e50;">{task[2]}</h3>'
+                            f'<p><strong>Status:</strong> {task[4]} {"⚠️ OVERDUE" if is_overdue else ""}</p>'
+                            f'<p><strong>Priority:</strong> <span style="color:{priority_colors.get(task[8], "#000000")}">{task[8]}</span></p>'
+                            f'<p><strong>Deadline:</strong> {task[6]}</p>'
+                            f'<p><strong>Budget:</strong> ${task[12]}</p>'
+                            f'<p><strong>Assigned to: </strong>{assigned_to_name}</p>'
+                            f'<div style="display:flex; justify-content:space-between; margin-top:15px;">',
+                            unsafe_allow_html=True
+                        )
+
+                        # Determine button visibility
+                        is_admin = st.session_state.user_role == "Admin"
+                        is_project_owner = query_db(
+                            "SELECT user_id FROM projects WHERE id=?", 
+                            (task[1],), one=True
+                        )[0] == st.session_state.user_id
+                        is_task_assignee = task[10] == st.session_state.user_id
+
+                        # Edit button
+                        if is_admin or is_project_owner or is_task_assignee:
+                            if st.button("✏️ Edit", key=f"edit_{task_id}"):
+                                st.session_state.editing_task_id = task_id
+                                st.session_state.editing_task_project = task[1]
+                                st.rerun()
+
+                        # Delete button
+                        if is_admin or is_project_owner:
+                            if st.button("🗑️ Delete", key=f"delete_{task_id}"):
+                                st.session_state.deleting_task_id = task_id
+                                st.rerun()
+
+                        st.markdown('</div></div>', unsafe_allow_html=True)
+
+                # Close the grid containers
+                st.markdown('</div>', unsafe_allow_html=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+
+                # Edit Task Form (shown after all cards if editing)
+                if 'editing_task_id' in st.session_state:
+                    task_id = st.session_state.editing_task_id
+                    project_id = st.session_state.editing_task_project
+                    task = query_db("SELECT * FROM tasks WHERE id=?", (task_id,), one=True)
+
+                    if task:
+                        project_owner = query_db(
+                            "SELECT user_id FROM projects WHERE id=?",
+                            (project_id,), one=True
+                        )
+                        is_project_owner = (project_owner and project_owner[0] == st.session_state.user_id) or st.session_state.user_role == "Admin"
+                        is_task_assignee = task[10] == st.session_state.user_id
+
+                        if is_admin or is_project_owner or is_task_assignee:
+                            with st.expander(f"✏️ Editing Task: {task[2]}", expanded=True):
+                                if edit_task_form(task_id, project_id):
+                                    del st.session_state.editing_task_id
+                                    st.rerun()
+                                elif st.button("Close Without Saving"):
+                                    del st.session_state.editing_task_id
+                                    st.rerun()
+
+                # Delete Confirmation (shown after all cards if deleting)
+                if 'deleting_task_id' in st.session_state:
+                    task_id = st.session_state.deleting_task_id
+                    task = query_db("SELECT * FROM tasks WHERE id=?", (task_id,), one=True)
+
+                    if task:
+                        is_admin = st.session_state.user_role == "Admin"
+                        is_project_owner = query_db(
+                            "SELECT user_id FROM projects WHERE id=?", 
+                            (task[1],), one=True
+                        )[0] == st.session_state.user_id
+
+                        if is_admin or is_project_owner:
+                            with st.container():
+                                st.warning(f"⚠️ Are you sure you want to delete task: {task[2]}?")
+                                st.error("This action cannot be undone and will delete all associated data!")
+
+                                col1, col2 = st.columns(2)
+                                with col1:
+                                    if st.button("✅ Confirm Delete", key=f"confirm_delete_{task_id}", type="primary"):
+                                        delete_tasks([task_id])
+                                        st.success("Task deleted successfully!")
+                                        del st.session_state.deleting_task_id
+                                        st.rerun()
+                                with col2:
+                                    if st.button("❌ Cancel", key=f"cancel_delete_{task_id}"):
+                                        del st.session_state.deleting_task_id
+                                        st.rerun()
+
+
+    # ======= Section Divider =======
+    st.markdown("---")
+    st.header("📊 Task Analytics")
+
+    task_filters = display_task_table()
+
+    # Simplified tabs without project filter
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
+    "Timeline", "Progress", "Priority Breakdown", 
+    "Budget Tracking", "Budget Variance", "Workload", 
+    "Subtask Analytics"
+    ])
+
+    with tab1:
+        st.markdown("""
+            <style>
+                .stPlotlyChart {
+                    border: 1px solid #e0e0e0;
+                    border-radius: 8px;
+                    padding: 10px;
+                    background: white;
+                    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+                }
+                .stDownloadButton>button {
+                    width: 100% !important;
+                }
+            </style>
+            """, unsafe_allow_html=True)
+
+        plot_task_timeline(task_filters)
+
+    with tab2:
+        plot_task_progress_over_time(task_filters)
+
+    with tab3:
+        plot_task_priority_distribution(task_filters)
+
+    with tab4:
+        plot_budget_tracking(task_filters)
+
+    with tab5:
+        plot_budget_variance(task_filters)        
+
+    with tab6:
+        plot_assignee_workload(task_filters)
+
+    with tab7:
+        plot_subtask_analytics(task_filters)
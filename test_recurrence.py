@@ -0,0 +1,34 @@
+# test_recurrence.py
+"""Month-end behaviour of the recurrence patterns (run with `python -m pytest`)."""
+from datetime import date
+
+from recurrence import occurrences, parse_rule
+
+
+def dates(pattern, start, end):
+    return list(occurrences(parse_rule(pattern), start, end))
+
+
+def test_legacy_monthly_clamps_to_the_last_day_of_shorter_months():
+    assert dates("monthly", date(2025, 1, 31), date(2025, 6, 30)) == [
+        date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31),
+        date(2025, 4, 30), date(2025, 5, 31), date(2025, 6, 30),
+    ]
+
+
+def test_legacy_monthly_keeps_the_template_day_after_a_short_month():
+    assert dates("monthly", date(2024, 1, 30), date(2024, 4, 30)) == [
+        date(2024, 1, 30), date(2024, 2, 29), date(2024, 3, 30), date(2024, 4, 30),
+    ]
+
+
+def test_rrule_monthly_skips_months_without_the_day():
+    assert dates("FREQ=MONTHLY", date(2025, 1, 31), date(2025, 6, 30)) == [
+        date(2025, 1, 31), date(2025, 3, 31), date(2025, 5, 31),
+    ]
+
+
+def test_rrule_last_day_of_month():
+    assert dates("FREQ=MONTHLY;BYMONTHDAY=-1;COUNT=3", date(2025, 1, 31), date(2025, 12, 31)) == [
+        date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31),
+    ]
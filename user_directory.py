@@ -0,0 +1,53 @@
+# user_directory.py
+"""Batched user lookups.
+
+Card grids used to resolve each assignee with its own `SELECT username FROM users
+WHERE id=?`. The directory loads id -> (username, email) for every user in one query
+and keeps the map until a write to the users table (Admin edits, profile updates,
+registration) bumps the table's generation in the query cache.
+"""
+import threading
+import time
+
+from database import run_query
+from query_cache import get_cache
+
+_lock = threading.Lock()
+_snapshot = None    # (users generation, loaded_at, {id: (username, email)})
+
+
+def get_user_directory():
+    """Return {user_id: (username, email)} for every user"""
+    global _snapshot
+    cache = get_cache()
+    generation = cache.generation('users')
+    snapshot = _snapshot
+    if snapshot is None or snapshot[0] != generation or time.monotonic() - snapshot[1] > cache.ttl:
+        with _lock:
+            snapshot = _snapshot
+            if snapshot is None or snapshot[0] != generation or time.monotonic() - snapshot[1] > cache.ttl:
+                rows = run_query("SELECT id, username, email FROM users")
+                snapshot = (generation, time.monotonic(), {row[0]: (row[1], row[2]) for row in rows})
+                _snapshot = snapshot
+    return snapshot[2]
+
+
+def get_username(user_id, default="Unknown"):
+    entry = get_user_directory().get(user_id)
+    return entry[0] if entry else default
+
+
+def get_email(user_id, default=None):
+    entry = get_user_directory().get(user_id)
+    return entry[1] if entry else default
+
+
+def get_usernames(user_ids, default="Unknown"):
+    """Map each id to a username with a single directory lookup"""
+    directory = get_user_directory()
+    return {user_id: directory[user_id][0] if user_id in directory else default for user_id in user_ids}
+
+
+def invalidate_user_directory():
+    """Force the next lookup to reload - for user writes made outside query_db"""
+    get_cache().invalidate_tables('users')
@@ -5,8 +5,47 @@ import plotly.graph_objects as go
 import datetime as dt
 from datetime import datetime
 import logging
+import time
+from chart_export import cached_png, figure_key, get_png
+from instrumentation import active_trace, timed_chart
 
 
+def _figure_name(fig):
+    try:
+        return fig.layout.title.text or "figure"
+    except AttributeError:
+        return "figure"
+
+
+def plotly_chart(fig, **kwargs):
+    """st.plotly_chart, recorded as the figure's serialize time when instrumentation is on"""
+    trace = active_trace()
+    if trace is None:
+        return st.plotly_chart(fig, **kwargs)
+    started = time.perf_counter()
+    try:
+        return st.plotly_chart(fig, **kwargs)
+    finally:
+        trace.figure_serialized(_figure_name(fig), started, time.perf_counter() - started)
+
+
+def png_download_button(fig, label, file_name, width=None, key=None):
+    """PNG download that renders the chart only when asked, then serves it from the export cache"""
+    trace = active_trace()
+    started = time.perf_counter()
+    fig_key = figure_key(fig, width)
+    if trace is not None:
+        trace.figure_serialized(f"{_figure_name(fig)} (export key)", started, time.perf_counter() - started)
+    key = key or f"png_{file_name}_{fig_key[:12]}"
+    png = cached_png(fig_key)
+    if png is None and st.button(label, key=f"prep_{key}", help="Render the chart as PNG"):
+        with st.spinner("Rendering chart..."):
+            png = get_png(fig, width)
+    if png is not None:
+        st.download_button(label=label, data=png, file_name=file_name, mime="image/png", key=key)
+
+
+@timed_chart
 def plot_project_timeline(project_df):
     """Create a Gantt chart visualization of project timelines"""
     if project_df.empty:
@@ -66,7 +105,7 @@ def plot_project_timeline(project_df):
             hovermode="closest"
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart(fig, use_container_width=True)
         
     except Exception as e:
         st.error(f"Error generating project timeline: {str(e)}")
@@ -74,13 +113,9 @@ def plot_project_timeline(project_df):
     
     # Add download button
     with st.expander("Export Options"):
-        st.download_button(
-            label="Download Timeline as PNG",
-            data=fig.to_image(format="png"),
-            file_name="project_timeline.png",
-            mime="image/png"
-        )
+        png_download_button(fig, "Download Timeline as PNG", "project_timeline.png")
 
+@timed_chart
 def plot_budget_comparison(project_df):
     """Compare budget vs actual costs across projects"""
     fig = px.bar(
@@ -91,17 +126,13 @@ def plot_budget_comparison(project_df):
         title="Budget vs Actual Cost Comparison",
         labels={"value": "Amount ($)"}
     )
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(fig, use_container_width=True)
     
     # Add download button
     with st.expander("Export Options"):
-        st.download_button(
-            label="Download Budget Comparison as PNG",
-            data=fig.to_image(format="png"),
-            file_name="budget_comparison.png",
-            mime="image/png"
-        )
+        png_download_button(fig, "Download Budget Comparison as PNG", "budget_comparison.png")
 
+@timed_chart
 def plot_completion_heatmap(project_df):
     """Create a heatmap of project completion percentages with project names"""
     if project_df.empty:
@@ -136,21 +167,17 @@ def plot_completion_heatmap(project_df):
         # Rotate project names for better readability
         fig.update_xaxes(tickangle=0)
         
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart(fig, use_container_width=True)
         
     except Exception as e:
         st.error(f"Error generating completion heatmap: {str(e)}")
 
     # Add download button
     with st.expander("Export Options"):
-            st.download_button(
-                label="Download Heatmap as PNG",
-                data=fig.to_image(format="png"),
-                file_name="completion_heatmap.png",
-                mime="image/png"
-            )          
+            png_download_button(fig, "Download Heatmap as PNG", "completion_heatmap.png")          
 
 
+@timed_chart
 def plot_duration_variance(project_df):
     """Show variance between planned and actual durations with 2 decimal places"""
     if project_df.empty:
@@ -194,22 +221,18 @@ def plot_duration_variance(project_df):
         )
         fig.update_xaxes(tickangle=45)
         
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart(fig, use_container_width=True)
         
     except Exception as e:
         st.error(f"Error generating duration variance visualization: {str(e)}")
 
         # Add download button
         with st.expander("Export Options"):
-                st.download_button(
-                    label="Download Duration Variance as PNG",
-                    data=fig.to_image(format="png"),
-                    file_name="duration_variance.png",
-                    mime="image/png"
-                )          
+                png_download_button(fig, "Download Duration Variance as PNG", "duration_variance.png")          
 
 
 
+@timed_chart
 def plot_project_health(project_df):
     """Quadrant analysis of project health"""
     fig = px.scatter(
@@ -227,12 +250,53 @@ def plot_project_health(project_df):
     )
     fig.add_hline(y=0, line_dash="dash")
     fig.add_vline(x=50, line_dash="dash")
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(fig, use_container_width=True)
+
+
+# Above this many rows the Gantt charts show a scrollable window instead of every bar
+GANTT_MAX_ROWS = 250
+
+
+def format_dates(dates, default="Not set"):
+    """Vectorized strftime for hover text; missing dates become `default`"""
+    return pd.to_datetime(dates, errors='coerce').dt.strftime('%b %d, %Y').fillna(default)
 
 
-def plot_plan_vs_actual_gantt(project_df):
+def format_days(days, default="N/A"):
+    """Vectorized "N days" for hover text; missing values become `default`"""
+    return (days.astype('Int64').astype('string') + " days").fillna(default)
+
+
+def gantt_page(total, max_rows=GANTT_MAX_ROWS, key="gantt_window"):
+    """(offset, row count) of the window of `total` rows to draw, chosen with a slider.
+
+    Browsers struggle with thousands of bars, so very large portfolios are shown a
+    page at a time. The last page ends at the last row, so every row can be reached.
+    Pass max_rows=None to always draw everything. Charts that query their rows page by
+    page call this directly; gantt_window() slices a frame that is already loaded.
+    """
+    if not max_rows or total <= max_rows:
+        return 0, total
+    pages = -(-total // max_rows)
+    page = st.slider(
+        "Page", 1, pages, 1, key=key,
+        help=f"Only {max_rows} of {total} rows are drawn at a time"
+    )
+    start = min((page - 1) * max_rows, total - max_rows)
+    st.caption(f"Showing rows {start + 1}-{start + max_rows} of {total}")
+    return start, max_rows
+
+
+def gantt_window(df, max_rows=GANTT_MAX_ROWS, key="gantt_window"):
+    """Limit a Gantt frame to a window of rows chosen with a slider (see gantt_page)"""
+    start, count = gantt_page(len(df), max_rows, key)
+    return df.iloc[start:start + count]
+
+
+@timed_chart
+def plot_plan_vs_actual_gantt(project_df, max_rows=GANTT_MAX_ROWS):
     # Prepare data with proper datetime handling
-    gantt_data = project_df.copy()
+    gantt_data = gantt_window(project_df, max_rows, key="plan_vs_actual_window").copy()
     
     # Convert to datetime objects
     gantt_data['Planned Start'] = pd.to_datetime(gantt_data['Start Date'])
@@ -244,40 +308,44 @@ def plot_plan_vs_actual_gantt(project_df):
     else:
         gantt_data['Actual End'] = pd.to_datetime(gantt_data['Actual End'])
     
+    planned_days = (gantt_data['Planned End'] - gantt_data['Planned Start']).dt.days
+    variance_days = (gantt_data['Actual End'] - gantt_data['Planned End']).dt.days
+    project = "<b>" + gantt_data['Project'].astype(str) + "</b><br>"
+    
     # Create figure using plotly.graph_objects
     fig = go.Figure()
     
-    # Add planned duration bars
-    for _, row in gantt_data.iterrows():
-        fig.add_trace(go.Bar(
-            y=[row['Project']],
-            x=[(row['Planned End'] - row['Planned Start']).days],
-            base=row['Planned Start'],
-            name='Planned',
-            orientation='h',
-            marker_color='#636EFA',
-            hoverinfo='text',
-            hovertext=f"<b>{row['Project']}</b><br>"
-                     f"Planned: {row['Planned Start'].strftime('%b %d, %Y')} - {row['Planned End'].strftime('%b %d, %Y')}<br>"
-                     f"Duration: {(row['Planned End'] - row['Planned Start']).days} days"
-        ))
-        
-        # Add actual duration indicator
-        fig.add_trace(go.Scatter(
-            x=[row['Actual End']],
-            y=[row['Project']],
-            mode='markers',
-            marker=dict(
-                color='#EF553B',
-                size=12,
-                symbol='diamond'
-            ),
-            name='Actual End',
-            hoverinfo='text',
-            hovertext=f"<b>{row['Project']}</b><br>"
-                     f"Actual End: {row['Actual End'].strftime('%b %d, %Y')}<br>"
-                     f"Variance: {(row['Actual End'] - row['Planned End']).days} days"
-        ))
+    # One bar trace for every planned span; on a date axis the length is in milliseconds
+    fig.add_trace(go.Bar(
+        y=gantt_data['Project'],
+        x=(gantt_data['Planned End'] - gantt_data['Planned Start']).dt.total_seconds() * 1000,
+        base=gantt_data['Planned Start'],
+        name='Planned',
+        orientation='h',
+        marker_color='#636EFA',
+        hoverinfo='text',
+        hovertext=(project
+                   + "Planned: " + format_dates(gantt_data['Planned Start'])
+                   + " - " + format_dates(gantt_data['Planned End'])
+                   + "<br>Duration: " + format_days(planned_days))
+    ))
+    
+    # One marker trace for every actual end date
+    fig.add_trace(go.Scatter(
+        x=gantt_data['Actual End'],
+        y=gantt_data['Project'],
+        mode='markers',
+        marker=dict(
+            color='#EF553B',
+            size=12,
+            symbol='diamond'
+        ),
+        name='Actual End',
+        hoverinfo='text',
+        hovertext=(project
+                   + "Actual End: " + format_dates(gantt_data['Actual End'], default="N/A")
+                   + "<br>Variance: " + format_days(variance_days))
+    ))
     
     # Add today's line using a shape instead of vline
     today = datetime.now().date()
@@ -320,9 +388,10 @@ def plot_plan_vs_actual_gantt(project_df):
         )
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(fig, use_container_width=True)
 
 
+@timed_chart
 def plot_duration_variance(project_df):
     variance_df = project_df.copy()
     variance_df['Duration Variance'] = variance_df['Actual Duration (days)'] - variance_df['Planned Duration (days)']
@@ -347,18 +416,14 @@ def plot_duration_variance(project_df):
         plot_bgcolor='rgba(0,0,0,0)'
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(fig, use_container_width=True)
 
     # Add download button
     with st.expander("Export Options"):
-            st.download_button(
-                label="Download Duration Variance as PNG",
-                data=fig.to_image(format="png"),
-                file_name="duration_variance.png",
-                mime="image/png"
-            )        
+            png_download_button(fig, "Download Duration Variance as PNG", "duration_variance.png")        
 
 
+@timed_chart
 def plot_duration_comparison(project_df):
     """Compare planned vs actual durations"""
     if 'Planned Duration (days)' in project_df.columns and 'Actual Duration (days)' in project_df.columns:
@@ -383,7 +448,7 @@ def plot_duration_comparison(project_df):
                 "Actual Duration (days)": "#EF553B"
             }
         )
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart(fig, use_container_width=True)
         
         # Add analysis metrics
         project_df['Duration Variance'] = (
@@ -397,9 +462,4 @@ def plot_duration_comparison(project_df):
 
         # Add download button
         with st.expander("Export Options"):
-                st.download_button(
-                    label="Download Duration Comparison as PNG",
-                    data=fig.to_image(format="png"),
-                    file_name="duration_comparison.png",
-                    mime="image/png"
-                )        
\ No newline at end of file
+                png_download_button(fig, "Download Duration Comparison as PNG", "duration_comparison.png")        
\ No newline at end of file
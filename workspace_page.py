@@ -1,13 +1,20 @@
 from datetime import datetime, timedelta
+import logging
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st 
 import sqlite3 
 import time 
-import smtplib 
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart 
+from attachments import add_attachment, delete_attachment, format_file_size, read_attachment
+from database import run_many, run_query, transaction
+from discussions import fetch_messages, fetch_topics, format_message_time, rendered_message
+from email_outbox import enqueue_email
+from search_index import search_discussions
+from task_graph import load_task_graph
+from task_operations import delete_project, delete_tasks
+from task_rollups import recompute_task_rollups, update_parent_status
+from user_directory import get_username
 from visualizations import ( 
     plot_project_timeline, 
     plot_budget_comparison, 
@@ -16,25 +23,33 @@ from visualizations import (
     plot_project_health,
     plot_plan_vs_actual_gantt, 
     plot_duration_variance, 
-    plot_duration_comparison  
+    plot_duration_comparison,
+    plotly_chart
 )
 
- 
-# Database connection function 
-def get_db_connection():
-    conn = sqlite3.connect('project_management.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+logger = logging.getLogger(__name__)
 
-# Database query function
+ 
+# Database query function - runs on the shared connection pool
 def query_db(query, args=(), one=False):
-    conn = get_db_connection() 
-    cur = conn.cursor()
-    cur.execute(query, args) 
-    rv = cur.fetchall()
-    conn.commit()
-    conn.close()
-    return (rv[0] if rv else None) if one else rv
+    return run_query(query, args, one, row_factory=sqlite3.Row)
+
+
+def render_attachment_download(file_id, file_name, key):
+    """Download control that reads the file's bytes only after the user asks for them"""
+    pending = st.session_state.setdefault('pending_downloads', set())
+    if file_id in pending:
+        st.download_button(
+            "💾",
+            data=read_attachment(file_id),
+            file_name=file_name,
+            key=key,
+            help="Save file",
+            on_click=lambda: pending.discard(file_id)
+        )
+    elif st.button("↓", key=f"prep_{key}", help="Download file"):
+        pending.add(file_id)
+        st.rerun()
 
 
 
@@ -333,30 +348,11 @@ def send_task_assignment_email(assignee_email, task_title, project_name, deadlin
     Send email notification to assignee when a new task is assigned.
     """
     try:
-        # Debug print (remove after testing)
-        print(f"Attempting to send email to: {assignee_email}")
-        
-
-
-        # Email Configuration (using Streamlit secrets)
-        SMTP_SERVER = st.secrets.get("email", {}).get("server", "smtp.gmail.com")
-        SMTP_PORT = st.secrets.get("email", {}).get("port", 587)
-        SENDER_EMAIL = st.secrets.get("email", {}).get("user", "your.email@gmail.com")
-        SENDER_PASSWORD = st.secrets.get("email", {}).get("password", "your-app-password")
-
-        
-        # Validate email
         # Validate email
         if not assignee_email or "@" not in assignee_email:
-            print("Invalid recipient email address")
+            logger.warning("Not queueing assignment email to invalid address %r", assignee_email)
             return False
 
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = SENDER_EMAIL
-        msg['To'] = assignee_email
-        msg['Subject'] = f"New Assignment: {task_title}"
-        
         # Email body with conditional parent task info
         parent_info = f"<p><strong>Parent Task:</strong> {parent_task}</p>" if parent_task else ""
         
@@ -375,23 +371,15 @@ def send_task_assignment_email(assignee_email, task_title, project_name, deadlin
         </html>
         """
         
-        msg.attach(MIMEText(body, 'html'))
-        
-        # Send email
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            print("TLS started")
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
-            print("Logged in to SMTP server")
-            server.send_message(msg)
-            print("Email sent successfully")
-            st.toast(f"Notification sent to {assignee_email}")
+        # Queue for the background sender so the save returns immediately
+        enqueue_email(assignee_email, f"New Assignment: {task_title}", body)
+        st.toast(f"Notification queued for {assignee_email}")
             
         return True
         
     except Exception as e:
-        print(f"Email sending failed: {str(e)}")
-        st.error(f"Failed to send email notification: {str(e)}")
+        logger.exception("Email queueing failed")
+        st.error(f"Failed to queue email notification: {str(e)}")
         return False
 
 
@@ -399,25 +387,6 @@ def send_subtask_assignment_email(assignee_email, subtask_title, project_name,
                                 deadline, assigner_name, parent_task, subtask_url):
     """Send email notification for new subtask assignment"""
     try:
-        # # Email configuration - REPLACE WITH YOUR ACTUAL CREDENTIALS
-        # SMTP_SERVER = "smtp.gmail.com"
-        # SMTP_PORT = 587
-        # SMTP_USERNAME = "your_email@gmail.com"
-        # SMTP_PASSWORD = "your_app_password"
-        # SENDER_EMAIL = "your_email@gmail.com"
-
-        # Email Configuration (using Streamlit secrets)
-        SMTP_SERVER = st.secrets.get("email", {}).get("server", "smtp.gmail.com")
-        SMTP_PORT = st.secrets.get("email", {}).get("port", 587)
-        SENDER_EMAIL = st.secrets.get("email", {}).get("user", "your.email@gmail.com")
-        SENDER_PASSWORD = st.secrets.get("email", {}).get("password", "your-app-password")
-        
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = SENDER_EMAIL
-        msg['To'] = assignee_email
-        msg['Subject'] = f"New Subtask Assigned: {subtask_title}"
-        
         # Email body with direct link
         body = f"""
         <html>
@@ -445,32 +414,15 @@ def send_subtask_assignment_email(assignee_email, subtask_title, project_name,
         </html>
         """
         
-        msg.attach(MIMEText(body, 'html'))
-        
-        # # Send email
-        # with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-        #     server.starttls()
-        #     server.login(SMTP_USERNAME, SMTP_PASSWORD)
-        #     server.send_message(msg)
-
-
-        # Send email
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            print("TLS started")
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
-            print("Logged in to SMTP server")
-            server.send_message(msg)
-            print("Email sent successfully")
-            st.toast(f"Notification sent to {assignee_email}")
-
-
+        # Queue for the background sender so the save returns immediately
+        enqueue_email(assignee_email, f"New Subtask Assigned: {subtask_title}", body)
+        st.toast(f"Notification queued for {assignee_email}")
             
         return True
         
     except Exception as e:
-        print(f"Email sending failed: {str(e)}")
-        st.error(f"Failed to send subtask assignment notification: {str(e)}")
+        logger.exception("Email queueing failed")
+        st.error(f"Failed to queue subtask assignment notification: {str(e)}")
         return False
 
 
@@ -481,22 +433,6 @@ def send_subtask_reassignment_email(new_assignee_email, previous_assignee_email,
     Send email notification about subtask reassignment.
     """
     try:
-
-
-        # Email Configuration (using Streamlit secrets)
-        SMTP_SERVER = st.secrets.get("email", {}).get("server", "smtp.gmail.com")
-        SMTP_PORT = st.secrets.get("email", {}).get("port", 587)
-        SENDER_EMAIL = st.secrets.get("email", {}).get("user", "your.email@gmail.com")
-        SENDER_PASSWORD = st.secrets.get("email", {}).get("password", "your-app-password")
-        
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = SENDER_EMAIL
-        msg['To'] = new_assignee_email
-        if previous_assignee_email:
-            msg['Cc'] = previous_assignee_email
-        msg['Subject'] = f"Subtask Assigned to You: {subtask_title}"
-        
         # Email body
         body = f"""
         <html>
@@ -525,25 +461,16 @@ def send_subtask_reassignment_email(new_assignee_email, previous_assignee_email,
         </html>
         """
         
-        msg.attach(MIMEText(body, 'html'))
-        
-
-
-        # Send email
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            print("TLS started")
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
-            print("Logged in to SMTP server")
-            server.send_message(msg)
-            print("Email sent successfully")
-            st.toast(f"Notification sent to {new_assignee_email}")
+        # Queue for the background sender so the save returns immediately
+        enqueue_email(new_assignee_email, f"Subtask Assigned to You: {subtask_title}", body,
+                      cc=previous_assignee_email)
+        st.toast(f"Notification queued for {new_assignee_email}")
             
         return True
         
     except Exception as e:
-        print(f"Email sending failed: {str(e)}")
-        st.error(f"Failed to send reassignment notification: {str(e)}")
+        logger.exception("Email queueing failed")
+        st.error(f"Failed to queue reassignment notification: {str(e)}")
         return False
 
 
@@ -553,25 +480,6 @@ def send_task_reassignment_email(new_assignee_email, previous_assignee_email, ta
     Send email notification about task reassignment.
     """
     try:
-
-
-        # Email Configuration (using Streamlit secrets)
-        SMTP_SERVER = st.secrets.get("email", {}).get("server", "smtp.gmail.com")
-        SMTP_PORT = st.secrets.get("email", {}).get("port", 587)
-        SENDER_EMAIL = st.secrets.get("email", {}).get("user", "your.email@gmail.com")
-        SENDER_PASSWORD = st.secrets.get("email", {}).get("password", "your-app-password")
-
-
-        
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = SENDER_EMAIL
-        msg['To'] = new_assignee_email
-        if previous_assignee_email:
-            msg['Cc'] = previous_assignee_email
-        msg['Subject'] = f"Task Assigned to You: {task_title}"
-        
-        # Email body
         # Email body with direct link
         body = f"""
         <html>
@@ -599,25 +507,16 @@ def send_task_reassignment_email(new_assignee_email, previous_assignee_email, ta
         </html>
         """
         
-        msg.attach(MIMEText(body, 'html'))
-        
-
-        # Send email
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            print("TLS started")
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
-            print("Logged in to SMTP server")
-            server.send_message(msg)
-            print("Email sent successfully")
-            st.toast(f"Notification sent to {new_assignee_email}")
-
+        # Queue for the background sender so the save returns immediately
+        enqueue_email(new_assignee_email, f"Task Assigned to You: {task_title}", body,
+                      cc=previous_assignee_email)
+        st.toast(f"Notification queued for {new_assignee_email}")
             
         return True
         
     except Exception as e:
-        print(f"Email sending failed: {str(e)}")
-        st.error(f"Failed to send reassignment notification: {str(e)}")
+        logger.exception("Email queueing failed")
+        st.error(f"Failed to queue reassignment notification: {str(e)}")
         return False
 
 
@@ -635,7 +534,7 @@ def send_project_notification(project_id, action, previous_owner_id=None):
         """, (project_id,), one=True)
         
         if not project:
-            print("Project not found")
+            logger.warning("Project %s not found for notification", project_id)
             return False
 
         # Get previous owner details if changed
@@ -671,24 +570,10 @@ def send_project_notification(project_id, action, previous_owner_id=None):
                 st.toast(f"📬 CC notification sent to previous owner: {prev_owner_name}", icon="ℹ️")
         
         
-        # Email configuration
-        SMTP_SERVER = st.secrets.get("email", {}).get("server", "smtp.gmail.com")
-        SMTP_PORT = st.secrets.get("email", {}).get("port", 587)
-        SENDER_EMAIL = st.secrets.get("email", {}).get("user", "your.email@gmail.com")
-        SENDER_PASSWORD = st.secrets.get("email", {}).get("password", "your-app-password")
-
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = SENDER_EMAIL
-        msg['To'] = project[5]  # owner_email
-        
-        if previous_owner_email:
-            msg['Cc'] = previous_owner_email
-        
         if action == "create":
-            msg['Subject'] = f"New Project Created: {project[0]}"
+            subject = f"New Project Created: {project[0]}"
         else:
-            msg['Subject'] = f"Project Updated: {project[0]}"
+            subject = f"Project Updated: {project[0]}"
 
         # Format dates
         start_date = datetime.strptime(project[2], "%Y-%m-%d").strftime("%b %d, %Y") if project[2] else "Not specified"
@@ -714,20 +599,15 @@ def send_project_notification(project_id, action, previous_owner_id=None):
         </html>
         """
         
-        msg.attach(MIMEText(body, 'html'))
-        
-        # Send email
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
-            server.send_message(msg)
-            print("Project notification email sent successfully")
+        # Queue for the background sender (project[5] is the owner's email)
+        enqueue_email(project[5], subject, body, cc=previous_owner_email)
+        logger.info("Project notification email queued for project %s", project_id)
             
         return True
         
     except Exception as e:
-        print(f"Failed to send project notification: {str(e)}")
-        st.error(f"Failed to send notification email: {str(e)}")
+        logger.exception("Failed to queue project notification")
+        st.error(f"Failed to queue notification email: {str(e)}")
         return False
 
 
@@ -760,134 +640,23 @@ def sort_tasks(tasks):
 
 
 def update_parent_task_status(task_id):
-    """Update parent task status based on subtasks' statuses"""
-    subtasks = query_db("""
-        SELECT status FROM subtasks 
-        WHERE task_id = ?
-    """, (task_id,))
-    
-    if not subtasks:
-        return False  # No subtasks to check
-        
-    # Get current parent task status
-    parent_task = query_db("SELECT status FROM tasks WHERE id = ?", (task_id,), one=True)
-    current_status = parent_task[0] if parent_task else None
-    
-    # Check if all subtasks are completed
-    all_completed = all(st[0] == "Completed" for st in subtasks)
-    
-    if all_completed:
-        new_status = "Completed"
-    else:
-        # Get the most relevant incomplete status
-        incomplete_statuses = [st[0] for st in subtasks if st[0] != "Completed"]
-        # Priority: In Progress > Pending
-        new_status = "In Progress" if "In Progress" in incomplete_statuses else "Pending"
-    
-    # Only update if status actually changed
-    if new_status != current_status:
-        query_db("""
-            UPDATE tasks 
-            SET status = ?
-            WHERE id = ?
-        """, (new_status, task_id))
-        return True
-        
-    return False
+    """Update parent task status based on subtasks' statuses.
+
+    Reads the trigger-maintained subtask counts (see task_rollups) rather than every
+    subtask. Returns True if the status changed.
+    """
+    return update_parent_status(task_id)
 
 
 
 #
 def update_task_dates_based_on_subtasks(task_id):
-    """Update task dates, time, and budget based on subtask data"""
-    # Get all subtasks for this task
-    subtasks = query_db("""
-        SELECT start_date, deadline, actual_start_date, actual_deadline,
-               time_spent, actual_time_spent, budget, actual_cost 
-        FROM subtasks 
-        WHERE task_id = ?
-    """, (task_id,))
-    
-    if not subtasks:
-        return None
-    
-    # Get current task data
-    task = query_db("""
-        SELECT start_date, deadline, actual_start_date, actual_deadline,
-               time_spent, actual_time_spent, budget, actual_cost 
-        FROM tasks 
-        WHERE id = ?
-    """, (task_id,), one=True)
-    
-    if not task:
-        return None
-    
-    # Parse dates, times, and budgets
-    task_start = pd.to_datetime(task[0]) if task[0] else None
-    task_end = pd.to_datetime(task[1]) if task[1] else None
-    task_actual_start = pd.to_datetime(task[2]) if task[2] else None
-    task_actual_end = pd.to_datetime(task[3]) if task[3] else None
-    task_time_spent = float(task[4]) if task[4] is not None else 0.0
-    task_actual_time = float(task[5]) if task[5] is not None else 0.0
-    task_budget = float(task[6]) if task[6] is not None else 0.0
-    task_actual_cost = float(task[7]) if task[7] is not None else 0.0
-    
-    # Find min/max dates and sum times/budgets from subtasks
-    subtask_starts = [pd.to_datetime(s[0]) for s in subtasks if s[0]]
-    subtask_ends = [pd.to_datetime(s[1]) for s in subtasks if s[1]]
-    subtask_actual_starts = [pd.to_datetime(s[2]) for s in subtasks if s[2]]
-    subtask_actual_ends = [pd.to_datetime(s[3]) for s in subtasks if s[3]]
-    subtask_times = [float(s[4]) for s in subtasks if s[4] is not None]
-    subtask_actual_times = [float(s[5]) for s in subtasks if s[5] is not None]
-    subtask_budgets = [float(s[6]) for s in subtasks if s[6] is not None]
-    subtask_actual_costs = [float(s[7]) for s in subtasks if s[7] is not None]
-    
-    # Determine new dates
-    new_start = min(subtask_starts) if subtask_starts and (task_start is None or min(subtask_starts) < task_start) else task_start
-    new_end = max(subtask_ends) if subtask_ends and (task_end is None or max(subtask_ends) > task_end) else task_end
-    new_actual_start = min(subtask_actual_starts) if subtask_actual_starts and (task_actual_start is None or min(subtask_actual_starts) < task_actual_start) else task_actual_start
-    new_actual_end = max(subtask_actual_ends) if subtask_actual_ends and (task_actual_end is None or max(subtask_actual_ends) > task_actual_end) else task_actual_end
-    
-    # Calculate totals from subtasks
-    total_subtask_time = sum(subtask_times) if subtask_times else 0.0
-    total_subtask_actual_time = sum(subtask_actual_times) if subtask_actual_times else 0.0
-    total_subtask_budget = sum(subtask_budgets) if subtask_budgets else 0.0
-    total_subtask_actual_cost = sum(subtask_actual_costs) if subtask_actual_costs else 0.0
-    
-    # Calculate budget variance
-    budget_variance = total_subtask_budget - total_subtask_actual_cost
-    
-    # Update task in database if any values changed
-    if (new_start != task_start or new_end != task_end or 
-        new_actual_start != task_actual_start or new_actual_end != task_actual_end or
-        total_subtask_time != task_time_spent or total_subtask_actual_time != task_actual_time or
-        total_subtask_budget != task_budget or total_subtask_actual_cost != task_actual_cost):
-        
-        query_db("""
-            UPDATE tasks 
-            SET start_date = ?, deadline = ?,
-                actual_start_date = ?, actual_deadline = ?,
-                time_spent = ?, actual_time_spent = ?,
-                budget = ?, actual_cost = ?,
-                budget_variance = ?
-            WHERE id = ?
-        """, (
-            new_start.strftime('%Y-%m-%d') if new_start else None,
-            new_end.strftime('%Y-%m-%d') if new_end else None,
-            new_actual_start.strftime('%Y-%m-%d') if new_actual_start else None,
-            new_actual_end.strftime('%Y-%m-%d') if new_actual_end else None,
-            total_subtask_time,
-            total_subtask_actual_time,
-            total_subtask_budget,
-            total_subtask_actual_cost,
-            budget_variance,
-            task_id
-        ))
-        
-        return (new_start, new_end, new_actual_start, new_actual_end, 
-                total_subtask_time, total_subtask_actual_time,
-                total_subtask_budget, total_subtask_actual_cost, budget_variance)
-    return None
+    """Update task dates, time, and budget based on subtask data.
+
+    Returns True if the task changed. The rollup is a single SQL aggregate (see
+    task_rollups.py) instead of loading and parsing every subtask row here.
+    """
+    return bool(recompute_task_rollups([task_id]))
  
 
 
@@ -1151,15 +920,18 @@ def edit_task_in_workspace(task_id, project_id=None):
             ))
 
             # ▼▼▼ DEPENDENCY UPDATE CODE ▼▼▼
-            # First clear existing dependencies
-            query_db("DELETE FROM task_dependencies WHERE task_id = ?", (task_id,))
-            
-            # Add new dependencies
-            for dep_id in selected_dependencies:
-                query_db("""
-                    INSERT INTO task_dependencies (task_id, depends_on_task_id)
-                    VALUES (?, ?)
-                """, (task_id, dep_id))
+            if project_id and load_task_graph(project_id).creates_cycle(task_id, selected_dependencies):
+                st.warning("Dependencies not saved: they would make this task depend on itself.")
+            else:
+                with transaction():
+                    # First clear existing dependencies
+                    query_db("DELETE FROM task_dependencies WHERE task_id = ?", (task_id,))
+
+                    # Add new dependencies
+                    run_many("""
+                        INSERT INTO task_dependencies (task_id, depends_on_task_id)
+                        VALUES (?, ?)
+                    """, [(task_id, dep_id) for dep_id in selected_dependencies])
             # ▲▲▲ END DEPENDENCY CODE ▲▲▲
             
             # Send notifications if enabled and assignee changed
@@ -1406,9 +1178,10 @@ def edit_task_in_workspace(task_id, project_id=None):
                     confirm_cols = st.columns(2)
                     with confirm_cols[0]:
                         if st.button("✅ Confirm Delete", key="confirm_subtask_delete"):
-                            query_db("DELETE FROM subtasks WHERE id=?", (subtask_id,))
+                            with transaction():
+                                query_db("DELETE FROM subtasks WHERE id=?", (subtask_id,))
+                                update_task_dates_based_on_subtasks(task_id)
                             st.success("Subtask deleted successfully!")
-                            update_task_dates_based_on_subtasks(task_id)
                             del st.session_state.subtask_to_delete
                             time.sleep(0.5)
                             st.rerun()
@@ -1611,102 +1384,104 @@ def edit_task_in_workspace(task_id, project_id=None):
                             # Generate subtask URL
                             subtask_url = f"https://project-app-2025.streamlit.app/{task_id}/subtask/{st.session_state.subtask_form_mode if is_edit_mode else 'new'}"
                             
-                            if is_edit_mode:
-                                # Check if assignee was changed
-                                assignee_changed = (assigned_to_id != previous_assignee_id)
+                            # Subtask write and parent rollup commit together
+                            with transaction():
+                                if is_edit_mode:
+                                    # Check if assignee was changed
+                                    assignee_changed = (assigned_to_id != previous_assignee_id)
                                 
-                                query_db("""
-                                    UPDATE subtasks SET
-                                        title=?, description=?, status=?, 
-                                        start_date=?, deadline=?, priority=?,
-                                        assigned_to=?, budget=?, time_spent=?,
-                                        actual_start_date=?, actual_deadline=?,
-                                        actual_cost=?, actual_time_spent=?
-                                    WHERE id=?
-                                """, (
-                                    subtask_title.strip(), subtask_description, status,
-                                    start_date, deadline, priority,
-                                    assigned_to_id, budget, time_spent,
-                                    actual_start, actual_deadline,
-                                    actual_cost, actual_time,
-                                    st.session_state.subtask_form_mode
-                                ))
+                                    query_db("""
+                                        UPDATE subtasks SET
+                                            title=?, description=?, status=?, 
+                                            start_date=?, deadline=?, priority=?,
+                                            assigned_to=?, budget=?, time_spent=?,
+                                            actual_start_date=?, actual_deadline=?,
+                                            actual_cost=?, actual_time_spent=?
+                                        WHERE id=?
+                                    """, (
+                                        subtask_title.strip(), subtask_description, status,
+                                        start_date, deadline, priority,
+                                        assigned_to_id, budget, time_spent,
+                                        actual_start, actual_deadline,
+                                        actual_cost, actual_time,
+                                        st.session_state.subtask_form_mode
+                                    ))
                                 
-                                # Send notification if assignee changed
-                                if send_notification and assignee_changed and assigned_to_id:
-                                    parent_task = query_db("""
-                                        SELECT t.title, p.name, u.username 
-                                        FROM tasks t
-                                        JOIN projects p ON t.project_id = p.id
-                                        LEFT JOIN users u ON p.user_id = u.id
-                                        WHERE t.id = ?
-                                    """, (task_id,), one=True)
-                                    
-                                    new_assignee_info = query_db(
-                                        "SELECT email, username FROM users WHERE id = ?", 
-                                        (assigned_to_id,), 
-                                        one=True
-                                    )
+                                    # Send notification if assignee changed
+                                    if send_notification and assignee_changed and assigned_to_id:
+                                        parent_task = query_db("""
+                                            SELECT t.title, p.name, u.username 
+                                            FROM tasks t
+                                            JOIN projects p ON t.project_id = p.id
+                                            LEFT JOIN users u ON p.user_id = u.id
+                                            WHERE t.id = ?
+                                        """, (task_id,), one=True)
                                     
-                                    if new_assignee_info:
-                                        send_subtask_reassignment_email(
-                                            new_assignee_email=new_assignee_info[0],
-                                            previous_assignee_email=previous_assignee_info[0] if previous_assignee_info else None,
-                                            subtask_title=subtask_title.strip(),
-                                            project_name=parent_task[1] if parent_task else "Unknown Project",
-                                            deadline=deadline.strftime('%Y-%m-%d') if deadline else "Not specified",
-                                            assigner_name=st.session_state.get('username', 'System'),
-                                            parent_task=parent_task[0] if parent_task else "Unknown Task",
-                                            subtask_url=subtask_url
+                                        new_assignee_info = query_db(
+                                            "SELECT email, username FROM users WHERE id = ?", 
+                                            (assigned_to_id,), 
+                                            one=True
                                         )
+                                    
+                                        if new_assignee_info:
+                                            send_subtask_reassignment_email(
+                                                new_assignee_email=new_assignee_info[0],
+                                                previous_assignee_email=previous_assignee_info[0] if previous_assignee_info else None,
+                                                subtask_title=subtask_title.strip(),
+                                                project_name=parent_task[1] if parent_task else "Unknown Project",
+                                                deadline=deadline.strftime('%Y-%m-%d') if deadline else "Not specified",
+                                                assigner_name=st.session_state.get('username', 'System'),
+                                                parent_task=parent_task[0] if parent_task else "Unknown Task",
+                                                subtask_url=subtask_url
+                                            )
                                 
-                                st.success("Subtask updated successfully!")
-                            else:
-                                # For new subtasks, always send notification if assigned
-                                query_db("""
-                                    INSERT INTO subtasks (
-                                        task_id, title, description, status,
-                                        start_date, deadline, priority, assigned_to,
-                                        budget, time_spent, actual_start_date,
-                                        actual_deadline, actual_cost, actual_time_spent
-                                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                                """, (
-                                    task_id, subtask_title.strip(), subtask_description, status,
-                                    start_date, deadline, priority, assigned_to_id,
-                                    budget, time_spent, actual_start,
-                                    actual_deadline, actual_cost, actual_time
-                                ))
+                                    st.success("Subtask updated successfully!")
+                                else:
+                                    # For new subtasks, always send notification if assigned
+                                    query_db("""
+                                        INSERT INTO subtasks (
+                                            task_id, title, description, status,
+                                            start_date, deadline, priority, assigned_to,
+                                            budget, time_spent, actual_start_date,
+                                            actual_deadline, actual_cost, actual_time_spent
+                                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                    """, (
+                                        task_id, subtask_title.strip(), subtask_description, status,
+                                        start_date, deadline, priority, assigned_to_id,
+                                        budget, time_spent, actual_start,
+                                        actual_deadline, actual_cost, actual_time
+                                    ))
                                 
-                                # Send notification for new subtask if assigned
-                                if send_notification and assigned_to_id:
-                                    parent_task = query_db("""
-                                        SELECT t.title, p.name, u.username 
-                                        FROM tasks t
-                                        JOIN projects p ON t.project_id = p.id
-                                        LEFT JOIN users u ON p.user_id = u.id
-                                        WHERE t.id = ?
-                                    """, (task_id,), one=True)
+                                    # Send notification for new subtask if assigned
+                                    if send_notification and assigned_to_id:
+                                        parent_task = query_db("""
+                                            SELECT t.title, p.name, u.username 
+                                            FROM tasks t
+                                            JOIN projects p ON t.project_id = p.id
+                                            LEFT JOIN users u ON p.user_id = u.id
+                                            WHERE t.id = ?
+                                        """, (task_id,), one=True)
                                     
-                                    new_assignee_info = query_db(
-                                        "SELECT email, username FROM users WHERE id = ?", 
-                                        (assigned_to_id,), 
-                                        one=True
-                                    )
-                                    
-                                    if new_assignee_info:
-                                        send_subtask_assignment_email(
-                                            assignee_email=new_assignee_info[0],
-                                            subtask_title=subtask_title.strip(),
-                                            project_name=parent_task[1] if parent_task else "Unknown Project",
-                                            deadline=deadline.strftime('%Y-%m-%d') if deadline else "Not specified",
-                                            assigner_name=st.session_state.get('username', 'System'),
-                                            parent_task=parent_task[0] if parent_task else "Unknown Task",
-                                            subtask_url=subtask_url
+                                        new_assignee_info = query_db(
+                                            "SELECT email, username FROM users WHERE id = ?", 
+                                            (assigned_to_id,), 
+                                            one=True
                                         )
+                                    
+                                        if new_assignee_info:
+                                            send_subtask_assignment_email(
+                                                assignee_email=new_assignee_info[0],
+                                                subtask_title=subtask_title.strip(),
+                                                project_name=parent_task[1] if parent_task else "Unknown Project",
+                                                deadline=deadline.strftime('%Y-%m-%d') if deadline else "Not specified",
+                                                assigner_name=st.session_state.get('username', 'System'),
+                                                parent_task=parent_task[0] if parent_task else "Unknown Task",
+                                                subtask_url=subtask_url
+                                            )
                                 
-                                st.success("Subtask created successfully!")
+                                    st.success("Subtask created successfully!")
                             
-                            update_task_dates_based_on_subtasks(task_id)
+                                update_task_dates_based_on_subtasks(task_id)
                             st.session_state.subtask_form_mode = None
                             time.sleep(0.5)
                             st.rerun()
@@ -1965,7 +1740,16 @@ def render_task_form(edit_mode=False, project_id=None):
 
 
 def workspace_page():
-    
+    st.markdown("---")
+
+    # Header Section with Gradient
+    st.markdown("""
+    <div class="doc-header">
+        <h1 style="color: white; margin-bottom: 0.5rem;">🖥️ Project Workspace</h1>
+        <p style="font-size: 1.1rem; opacity: 0.9;"></p>
+    </div>
+    """, unsafe_allow_html=True)
+
     # Add Project Management section (only visible to admins/managers)
     # ======= Project Management Section =======
     st.markdown("---")
@@ -2012,9 +1796,7 @@ def workspace_page():
             confirm_cols = st.columns([1,1,2])
             with confirm_cols[0]:
                 if st.button("✅ Confirm", type="primary", use_container_width=True):
-                    query_db("DELETE FROM tasks WHERE project_id=?", (st.session_state.project_to_delete,))
-                    query_db("DELETE FROM project_team WHERE project_id=?", (st.session_state.project_to_delete,))
-                    query_db("DELETE FROM projects WHERE id=?", (st.session_state.project_to_delete,))
+                    delete_project(st.session_state.project_to_delete)
                     st.success("Project deleted successfully!")
                     del st.session_state.project_to_delete
                     time.sleep(0.5)
@@ -2342,7 +2124,7 @@ def workspace_page():
                                             <div style="margin-bottom: 4px;">📅 <strong>Start:</strong> {start_date if start_date else 'Not set'}</div>
                                             <div style="margin-bottom: 4px;">⏱️ <strong>Deadline:</strong> {deadline if deadline else 'Not set'}</div>
                                             <div style="margin-bottom: 4px;">⏳ <strong>Status:</strong> {status}</div>
-                                            <div>👤 <strong>Assigned:</strong> {query_db('SELECT username FROM users WHERE id=?', (assigned_to,), one=True)[0] if assigned_to else 'Unassigned'}</div>
+                                            <div>👤 <strong>Assigned:</strong> {get_username(assigned_to) if assigned_to else 'Unassigned'}</div>
                                         </div>
                                     </div>
                                     """,
@@ -2374,7 +2156,7 @@ def workspace_page():
                                         confirm_col1, confirm_col2 = st.columns(2)
                                         with confirm_col1:
                                             if st.button("Yes", key=f"confirm_{task_id}", use_container_width=True):
-                                                query_db("DELETE FROM tasks WHERE id=?", (task_id,))
+                                                delete_tasks([task_id])
                                                 st.success("Task deleted!")
                                                 del st.session_state.task_to_delete
                                                 st.rerun()
@@ -2847,14 +2629,9 @@ def workspace_page():
                         s.id
                 """, (selected_project_id,))
                 
-                # Get all task dependencies
-                dependencies = query_db("""
-                    SELECT task_id, depends_on_task_id 
-                    FROM task_dependencies
-                    WHERE task_id IN (
-                        SELECT id FROM tasks WHERE project_id = ?
-                    )
-                """, (selected_project_id,)) or []
+                # Dependency graph of the project (edges plus critical-path schedule)
+                task_graph = load_task_graph(selected_project_id)
+                dependencies = task_graph.edges
 
                 if tasks_data or subtasks_data:
                     gantt_data = []
@@ -3044,13 +2821,16 @@ def workspace_page():
                                 
                                 # Calculate midpoint for L-shape corner
                                 mid_x = x_start + (x_end - x_start)/2
+
+                                # Dependencies on the critical path are drawn in red
+                                arrow_color = "#D62728" if task_graph.is_critical_edge(successor_id, predecessor_id) else "#202121 "
                                 
                                 # Add the horizontal part of the L (from predecessor to midpoint)
                                 fig.add_shape(
                                     type="line",
                                     x0=x_start, y0=y_start,
                                     x1=mid_x, y1=y_start,
-                                    line=dict(color="#202121 ", width=2),
+                                    line=dict(color=arrow_color, width=2),
                                     layer='above'
                                 )
                                 
@@ -3059,7 +2839,7 @@ def workspace_page():
                                     type="line",
                                     x0=mid_x, y0=y_start,
                                     x1=mid_x, y1=y_end,
-                                    line=dict(color="#202121 ", width=2),
+                                    line=dict(color=arrow_color, width=2),
                                     layer='above'
                                 )
                                 
@@ -3077,7 +2857,7 @@ def workspace_page():
                                     arrowhead=3,
                                     arrowsize=1.5,
                                     arrowwidth=2,
-                                    arrowcolor="#202121 "
+                                    arrowcolor=arrow_color
                                 )
 
                         # Add today's line
@@ -3155,7 +2935,7 @@ def workspace_page():
                             font=dict(color="red")
                         )
                         
-                        st.plotly_chart(fig, use_container_width=True)
+                        plotly_chart(fig, use_container_width=True)
 
                         # Add legend explanation
                         with st.expander("Chart Legend", expanded=True):
@@ -3167,6 +2947,7 @@ def workspace_page():
                                 - <span style='color:#FFD166;'>Yellow</span> - Medium priority
                                 - <span style='color:#06D6A0;'>Green</span> - Low priority
                             - **Black arrows** - Task dependencies (task A must complete before task B can start)
+                            - **Red arrows** - Dependencies on the critical path (any delay there delays the project)
                             - **Dotted red line** - Today's date
                             """, unsafe_allow_html=True)
                     else:
@@ -3338,22 +3119,13 @@ def workspace_page():
                             
                             username = uploader[0] if uploader else "Unknown"
                             
-                            query_db("""
-                                INSERT INTO attachments (
-                                    file_name, 
-                                    file_data, 
-                                    task_id, 
-                                    project_id,
-                                    uploaded_by,
-                                    uploaded_at
-                                ) VALUES (?, ?, ?, ?, ?, datetime('now'))
-                            """, (
+                            add_attachment(
                                 uploaded_file.name,
-                                uploaded_file.read(),
+                                uploaded_file.getvalue(),
                                 task_id if file_type == "Task" else None,
                                 selected_project_id,
                                 st.session_state.user_id
-                            ))
+                            )
                             
                             st.success("File uploaded successfully!")
                             st.session_state.file_uploaded = True
@@ -3365,7 +3137,8 @@ def workspace_page():
 
         st.markdown("### Project Files")
         project_files = query_db("""
-            SELECT a.id, a.file_name, a.uploaded_at, u.username
+            SELECT a.id, a.file_name, a.uploaded_at, u.username,
+                   COALESCE(a.file_size, length(a.file_data))
             FROM attachments a
             JOIN users u ON a.uploaded_by = u.id
             WHERE a.project_id = ? AND a.task_id IS NULL
@@ -3374,7 +3147,7 @@ def workspace_page():
         
         if project_files:
             for file in project_files:
-                file_id, file_name, uploaded_at, username = file
+                file_id, file_name, uploaded_at, username, file_size = file
                 with st.container():
                     col1, col2, col3 = st.columns([6, 1, 1])
                     with col1:
@@ -3382,22 +3155,15 @@ def workspace_page():
                             <div class="file-card">
                                 <div class="file-name">{file_name}</div>
                                 <div class="file-meta">
-                                    Uploaded by {username} • {uploaded_at}
+                                    Uploaded by {username} • {uploaded_at} • {format_file_size(file_size)}
                                 </div>
                             </div>
                         """, unsafe_allow_html=True)
                     with col2:
-                        file_data = query_db("SELECT file_data FROM attachments WHERE id=?", (file_id,), one=True)
-                        st.download_button(
-                            "↓",
-                            data=file_data[0] if file_data else b'',
-                            file_name=file_name,
-                            key=f"dl_{file_id}",
-                            help="Download file"
-                        )
+                        render_attachment_download(file_id, file_name, key=f"dl_{file_id}")
                     with col3:
                         if st.button("🗑️", key=f"del_{file_id}", help="Delete file"):
-                            query_db("DELETE FROM attachments WHERE id=?", (file_id,))
+                            delete_attachment(file_id)
                             st.success("File deleted!")
                             st.rerun()
         else:
@@ -3406,7 +3172,8 @@ def workspace_page():
         st.markdown("---")
         st.markdown("### Task Files")
         task_files = query_db("""
-            SELECT a.id, a.file_name, a.uploaded_at, u.username, t.title
+            SELECT a.id, a.file_name, a.uploaded_at, u.username, t.title,
+                   COALESCE(a.file_size, length(a.file_data))
             FROM attachments a
             JOIN users u ON a.uploaded_by = u.id
             JOIN tasks t ON a.task_id = t.id
@@ -3417,7 +3184,7 @@ def workspace_page():
         if task_files:
             current_task = None
             for file in task_files:
-                file_id, file_name, uploaded_at, username, task_title = file
+                file_id, file_name, uploaded_at, username, task_title, file_size = file
                 
                 if task_title != current_task:
                     st.markdown(f"**Task:** {task_title}")
@@ -3430,22 +3197,15 @@ def workspace_page():
                             <div class="file-card">
                                 <div class="file-name">{file_name}</div>
                                 <div class="file-meta">
-                                    Uploaded by {username} • {uploaded_at}
+                                    Uploaded by {username} • {uploaded_at} • {format_file_size(file_size)}
                                 </div>
                             </div>
                         """, unsafe_allow_html=True)
                     with col2:
-                        file_data = query_db("SELECT file_data FROM attachments WHERE id=?", (file_id,), one=True)
-                        st.download_button(
-                            "↓",
-                            data=file_data[0] if file_data else b'',
-                            file_name=file_name,
-                            key=f"t_dl_{file_id}",
-                            help="Download file"
-                        )
+                        render_attachment_download(file_id, file_name, key=f"t_dl_{file_id}")
                     with col3:
                         if st.button("🗑️", key=f"t_del_{file_id}", help="Delete file"):
-                            query_db("DELETE FROM attachments WHERE id=?", (file_id,))
+                            delete_attachment(file_id)
                             st.success("File deleted!")
                             st.rerun()
         else:
@@ -3480,6 +3240,8 @@ def workspace_page():
             st.session_state.msg_to_delete = None
         if 'expanded_topics' not in st.session_state:
             st.session_state.expanded_topics = {}
+        if 'thread_pages' not in st.session_state:
+            st.session_state.thread_pages = {}  # topic id -> message pages loaded
 
         st.markdown("""
         <style>
@@ -3556,7 +3318,7 @@ def workspace_page():
             st.session_state.expanded_topics[topic_id] = not st.session_state.expanded_topics.get(topic_id, False)
 
         def render_topic(topic, is_topic_match, search_query, is_last_topic=False):
-            topic_id, topic_title, creator, created_at, is_archived, message_count = topic
+            topic_id, topic_title, creator, created_at, is_archived, message_count, last_activity = topic
             
             try:
                 timestamp = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S").strftime("%b %d, %Y")
@@ -3643,36 +3405,43 @@ def workspace_page():
                             st.rerun()
             
             if st.session_state.expanded_topics.get(topic_id, False):
-                messages = query_db("""
-                    SELECT m.id, m.message, u.username, m.created_at
-                    FROM discussion_messages m
-                    JOIN users u ON m.user_id = u.id
-                    WHERE m.topic_id = ?
-                    ORDER BY m.created_at ASC
-                """, (topic_id,))
-                
+                # Newest page first; each "Load older" adds one keyset page before it
+                pages_loaded = st.session_state.thread_pages.get(topic_id, 1)
+                messages, older_cursor = [], None
+                for page in range(pages_loaded):
+                    if page and older_cursor is None:
+                        break
+                    page_rows, older_cursor = fetch_messages(topic_id, before=older_cursor)
+                    messages = page_rows + messages
+
+                if older_cursor is not None:
+                    if st.button(f"⬆️ Load older messages ({len(messages)} of {message_count} shown)",
+                                 key=f"load_older_{topic_id}"):
+                        st.session_state.thread_pages[topic_id] = pages_loaded + 1
+                        st.rerun()
+
+                highlight_query = search_query if search_query and not is_topic_match else None
                 for msg in messages:
-                    msg_id, msg_content, author, msg_time = msg
-                    try:
-                        msg_time = datetime.strptime(msg_time, "%Y-%m-%d %H:%M:%S").strftime("%b %d, %Y at %I:%M %p")
-                    except:
-                        pass
-                    
-                    display_msg = highlight_search_terms(msg_content, search_query) if search_query and not is_topic_match else msg_content
-                    
-                    with st.container():
-                        st.markdown(
-                            f"""
+                    msg_id, msg_content, author, msg_time, msg_version = msg
+
+                    def render_message():
+                        display_msg = highlight_search_terms(msg_content, highlight_query) if highlight_query else msg_content
+                        return f"""
                             <div class="discussion-container {'archived-topic' if is_archived else ''}">
                                 <div class="discussion-header">
                                     <div class="discussion-user">
                                         <span style="font-size:1.1em;">👤</span> {author}
                                     </div>
-                                    <div class="discussion-time">{msg_time}</div>
+                                    <div class="discussion-time">{format_message_time(msg_time)}</div>
                                 </div>
                                 <div class="discussion-message">{display_msg}</div>
                             </div>
-                            """,
+                            """
+
+                    with st.container():
+                        st.markdown(
+                            rendered_message((msg_id, msg_version, author, bool(is_archived), highlight_query),
+                                             render_message),
                             unsafe_allow_html=True
                         )
                         
@@ -3786,34 +3555,15 @@ def workspace_page():
                         st.session_state.show_new_topic = False
                         st.rerun()
 
-        topics = query_db("""
-            SELECT t.id, t.topic, u.username, t.created_at, t.is_archived,
-                (SELECT COUNT(*) FROM discussion_messages WHERE topic_id = t.id) as message_count
-            FROM discussion_topics t
-            JOIN users u ON t.user_id = u.id
-            WHERE t.project_id = ?
-            ORDER BY t.is_archived ASC, t.created_at DESC
-        """, (selected_project_id,))
+        # Counts and last activity are maintained by triggers (see discussions.py)
+        topics = fetch_topics(selected_project_id)
         
         if topics:
             filtered_topics = []
             if search_query:
-                search_lower = search_query.lower()
-                for topic in topics:
-                    if topic[4]:
-                        continue
-                    
-                    if search_lower in topic[1].lower():
-                        filtered_topics.append((topic, True))
-                        continue
-                    
-                    messages = query_db("""
-                        SELECT message FROM discussion_messages
-                        WHERE topic_id = ? AND LOWER(message) LIKE ?
-                        LIMIT 1
-                    """, (topic[0], f"%{search_lower}%"))
-                    if messages:
-                        filtered_topics.append((topic, False))
+                # One full-text query finds every active topic whose title or messages match
+                matches = search_discussions(selected_project_id, search_query)
+                filtered_topics = [(topic, matches[topic[0]]) for topic in topics if topic[0] in matches]
             else:
                 filtered_topics = [(topic, False) for topic in topics if not topic[4]]
             
@@ -4058,7 +3808,7 @@ def workspace_page():
                     )
                 )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                plotly_chart(fig, use_container_width=True)
             else:
                 st.info("No tasks with valid dates to display")
         else:
@@ -4085,7 +3835,7 @@ def workspace_page():
                 values=[tasks[1], tasks[0] - tasks[1]],
                 hole=0.4
             ))
-            st.plotly_chart(fig, use_container_width=True)
+            plotly_chart(fig, use_container_width=True)
         else:
             st.info("No tasks found for progress tracking")
     